@@ -0,0 +1,48 @@
+"""Weekly workload materialized view
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Both event tables feed the view: course_events (published from syllabi)
+    # and the legacy events table (manual CRUD in routers/events.py).
+    # Categories are lower-cased so "Exam" and "exam" land in the same bucket.
+    op.execute("""
+        CREATE MATERIALIZED VIEW course_event_weekly_counts AS
+        SELECT
+            src.course_id,
+            src.category,
+            date_trunc('week', src.start_ts AT TIME ZONE 'UTC')::date AS week_start,
+            extract(isoyear FROM src.start_ts AT TIME ZONE 'UTC')::int AS iso_year,
+            extract(week FROM src.start_ts AT TIME ZONE 'UTC')::int AS iso_week,
+            count(*)::int AS event_count
+        FROM (
+            SELECT course_id, lower(category) AS category, start_ts
+            FROM course_events
+            UNION ALL
+            SELECT course_id, lower(coalesce(category::text, 'other')) AS category, dt_start AS start_ts
+            FROM events
+        ) AS src
+        GROUP BY 1, 2, 3, 4, 5
+        WITH DATA
+    """)
+    # REFRESH ... CONCURRENTLY requires a unique index on the view
+    op.execute("""
+        CREATE UNIQUE INDEX ux_course_event_weekly_counts
+        ON course_event_weekly_counts (course_id, category, week_start)
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS course_event_weekly_counts")
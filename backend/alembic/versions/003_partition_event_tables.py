@@ -0,0 +1,125 @@
+"""Partition course_events and events by term
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from datetime import datetime, timezone
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+PARTITIONED_TABLES = {"course_events": "start_ts", "events": "dt_start"}
+
+# The term calendar as of this revision (app/services/partitioning.py owns
+# the live one); terms are numbered year * 4 + position in the year
+TERM_STARTS = (("WI", 1, 1), ("SP", 1, 15), ("SU", 6, 1), ("FA", 8, 15))
+TERMS_AHEAD = 2
+
+# Same definition as revision 002; the view has to be rebuilt because it
+# depends on the tables being swapped out
+WORKLOAD_VIEW = """
+    CREATE MATERIALIZED VIEW course_event_weekly_counts AS
+    SELECT
+        src.course_id,
+        src.category,
+        date_trunc('week', src.start_ts AT TIME ZONE 'UTC')::date AS week_start,
+        extract(isoyear FROM src.start_ts AT TIME ZONE 'UTC')::int AS iso_year,
+        extract(week FROM src.start_ts AT TIME ZONE 'UTC')::int AS iso_week,
+        count(*)::int AS event_count
+    FROM (
+        SELECT course_id, lower(category) AS category, start_ts
+        FROM course_events
+        UNION ALL
+        SELECT course_id, lower(coalesce(category::text, 'other')) AS category, dt_start AS start_ts
+        FROM events
+    ) AS src
+    GROUP BY 1, 2, 3, 4, 5
+    WITH DATA
+"""
+WORKLOAD_VIEW_INDEX = """
+    CREATE UNIQUE INDEX ux_course_event_weekly_counts
+    ON course_event_weekly_counts (course_id, category, week_start)
+"""
+
+
+def _term_number(moment: datetime) -> int:
+    day = moment.astimezone(timezone.utc)
+    position = max(i for i, (_, month, start) in enumerate(TERM_STARTS) if (day.month, day.day) >= (month, start))
+    return day.year * len(TERM_STARTS) + position
+
+
+def _term_start(number: int) -> datetime:
+    year, position = divmod(number, len(TERM_STARTS))
+    _, month, day = TERM_STARTS[position]
+    return datetime(year, month, day, tzinfo=timezone.utc)
+
+
+def _create_term_partitions(table: str, column: str) -> None:
+    """One partition per term holding rows, plus the current and upcoming terms."""
+    current = _term_number(datetime.now(timezone.utc))
+    wanted = set(range(current, current + TERMS_AHEAD + 1))
+    low, high = op.get_bind().execute(sa.text(f"SELECT min({column}), max({column}) FROM {table}_unpartitioned")).one()
+    if low is not None:
+        wanted.update(range(_term_number(low), _term_number(high) + 1))
+    for number in sorted(wanted):
+        year, position = divmod(number, len(TERM_STARTS))
+        name = f"{table}_{year}{TERM_STARTS[position][0].lower()}"
+        op.execute(
+            f"CREATE TABLE {name} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{_term_start(number).isoformat()}') TO ('{_term_start(number + 1).isoformat()}')"
+        )
+
+
+def upgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS course_event_weekly_counts")
+
+    for table, column in PARTITIONED_TABLES.items():
+        # Move the old table aside (index names are schema-wide, so rename those too)
+        op.execute(f"ALTER TABLE {table} RENAME TO {table}_unpartitioned")
+        op.execute(f"ALTER INDEX IF EXISTS {table}_pkey RENAME TO {table}_unpartitioned_pkey")
+        op.execute(f"ALTER INDEX IF EXISTS ix_{table}_id RENAME TO ix_{table}_unpartitioned_id")
+
+        # Same columns in the same order, so INSERT ... SELECT * lines up
+        op.execute(f"""
+            CREATE TABLE {table} (LIKE {table}_unpartitioned INCLUDING DEFAULTS)
+            PARTITION BY RANGE ({column})
+        """)
+        op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id, {column})")
+        # Named explicitly: the old table still holds the default name, and 004 drops it by name
+        op.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {table}_course_id_fkey "
+            f"FOREIGN KEY (course_id) REFERENCES courses (id)"
+        )
+        op.execute(f"CREATE INDEX ix_{table}_course_id_{column} ON {table} (course_id, {column})")
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+        _create_term_partitions(table, column)
+
+        op.execute(f"INSERT INTO {table} SELECT * FROM {table}_unpartitioned")
+        op.execute(f"DROP TABLE {table}_unpartitioned")
+
+    op.execute(WORKLOAD_VIEW)
+    op.execute(WORKLOAD_VIEW_INDEX)
+
+
+def downgrade() -> None:
+    # Partitions already detached into the archive schema are left there
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS course_event_weekly_counts")
+
+    for table in PARTITIONED_TABLES:
+        op.execute(f"CREATE TABLE {table}_unpartitioned (LIKE {table} INCLUDING DEFAULTS)")
+        op.execute(f"INSERT INTO {table}_unpartitioned SELECT * FROM {table}")
+        op.execute(f"DROP TABLE {table}")  # drops every attached partition with it
+        op.execute(f"ALTER TABLE {table}_unpartitioned RENAME TO {table}")
+        op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id)")
+        op.execute(f"ALTER TABLE {table} ADD FOREIGN KEY (course_id) REFERENCES courses (id)")
+
+    op.execute(WORKLOAD_VIEW)
+    op.execute(WORKLOAD_VIEW_INDEX)
@@ -0,0 +1,41 @@
+"""ON DELETE CASCADE for everything hanging off courses
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+# Tables with a course_id -> courses.id foreign key (Postgres default FK names)
+CHILD_TABLES = ['course_events', 'events', 'syllabi', 'enrollments', 'student_course_links']
+
+# The cascade looks children up by course_id; these tables had no index
+# leading with it (their unique keys start with the user/student id)
+COURSE_ID_INDEXES = ['syllabi', 'enrollments', 'student_course_links']
+
+
+def _replace_fk(table: str, ondelete) -> None:
+    name = f'{table}_course_id_fkey'
+    op.drop_constraint(name, table, type_='foreignkey')
+    op.create_foreign_key(name, table, 'courses', ['course_id'], ['id'], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    for table in COURSE_ID_INDEXES:
+        op.create_index(f'ix_{table}_course_id', table, ['course_id'])
+    for table in CHILD_TABLES:
+        _replace_fk(table, 'CASCADE')
+
+
+def downgrade() -> None:
+    for table in CHILD_TABLES:
+        _replace_fk(table, None)
+    for table in COURSE_ID_INDEXES:
+        op.drop_index(f'ix_{table}_course_id', table_name=table)
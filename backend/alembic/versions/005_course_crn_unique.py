@@ -0,0 +1,51 @@
+"""Unique (school_id, crn, semester) on courses for bulk import upserts
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+DUPLICATES_QUERY = """
+    SELECT s.name AS school, c.crn, c.semester, array_agg(c.id::text ORDER BY c.created_at) AS course_ids
+    FROM courses c
+    LEFT JOIN schools s ON s.id = c.school_id
+    WHERE c.school_id IS NOT NULL AND c.crn IS NOT NULL AND c.semester IS NOT NULL
+    GROUP BY s.name, c.crn, c.semester
+    HAVING count(*) > 1
+    ORDER BY s.name, c.crn, c.semester
+"""
+
+
+def upgrade() -> None:
+    # create_course_mvp already refuses duplicates, so existing data should
+    # satisfy this; the index also closes its check-then-insert race.
+    # Legacy courses without school/CRN have NULLs and never conflict.
+    # Older rows may predate that check: list them rather than fail on an
+    # opaque index error. Which copy to keep is the school's call (the
+    # courses have their own enrollments and events), so nothing is merged.
+    duplicates = op.get_bind().execute(sa.text(DUPLICATES_QUERY)).all()
+    if duplicates:
+        lines = [
+            f"  {row.school} CRN {row.crn} {row.semester}: {', '.join(row.course_ids)}"
+            for row in duplicates
+        ]
+        raise RuntimeError(
+            f"{len(duplicates)} (school, crn, semester) key(s) are used by more than one course; "
+            "delete or re-key all but one of each, then re-run this migration:\n" + "\n".join(lines)
+        )
+    op.create_index(
+        'ux_courses_school_crn_semester', 'courses', ['school_id', 'crn', 'semester'], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ux_courses_school_crn_semester', table_name='courses')
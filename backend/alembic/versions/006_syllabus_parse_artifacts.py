@@ -0,0 +1,33 @@
+"""Store syllabus text and parse artifacts for re-extraction
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('syllabi', sa.Column('document_hash', sa.String(length=64), nullable=True))
+    op.add_column('syllabi', sa.Column('text_compressed', sa.LargeBinary(), nullable=True))
+    op.add_column('syllabi', sa.Column('raw_llm_output', sa.Text(), nullable=True))
+    op.add_column('syllabi', sa.Column('prompt_version', sa.String(), nullable=True))
+    op.add_column('syllabi', sa.Column('extracted_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index('ix_syllabi_course_id_document_hash', 'syllabi', ['course_id', 'document_hash'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_syllabi_course_id_document_hash', table_name='syllabi')
+    op.drop_column('syllabi', 'extracted_at')
+    op.drop_column('syllabi', 'prompt_version')
+    op.drop_column('syllabi', 'raw_llm_output')
+    op.drop_column('syllabi', 'text_compressed')
+    op.drop_column('syllabi', 'document_hash')
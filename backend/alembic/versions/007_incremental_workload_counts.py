@@ -0,0 +1,119 @@
+"""Weekly workload counts as a trigger-maintained table
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+# The same functions and triggers as app/models/workload.py at this revision
+WEEKLY_COUNT_FUNCTIONS = """
+CREATE OR REPLACE FUNCTION bump_weekly_count(p_course_id uuid, p_category text, p_start timestamptz, p_delta int)
+RETURNS void LANGUAGE plpgsql AS $$
+DECLARE
+    p_week date := date_trunc('week', p_start AT TIME ZONE 'UTC')::date;
+BEGIN
+    INSERT INTO course_event_weekly_counts AS w (course_id, category, week_start, iso_year, iso_week, event_count)
+    VALUES (
+        p_course_id, p_category, p_week,
+        extract(isoyear FROM p_start AT TIME ZONE 'UTC')::int,
+        extract(week FROM p_start AT TIME ZONE 'UTC')::int,
+        p_delta
+    )
+    ON CONFLICT (course_id, category, week_start) DO UPDATE SET event_count = w.event_count + EXCLUDED.event_count;
+    IF p_delta < 0 THEN
+        DELETE FROM course_event_weekly_counts
+        WHERE course_id = p_course_id AND category = p_category AND week_start = p_week AND event_count <= 0;
+    END IF;
+END $$;
+
+CREATE OR REPLACE FUNCTION course_events_weekly_count() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP <> 'INSERT' THEN
+        PERFORM bump_weekly_count(OLD.course_id, lower(OLD.category), OLD.start_ts, -1);
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        PERFORM bump_weekly_count(NEW.course_id, lower(NEW.category), NEW.start_ts, 1);
+    END IF;
+    RETURN NULL;
+END $$;
+
+CREATE OR REPLACE FUNCTION events_weekly_count() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP <> 'INSERT' THEN
+        PERFORM bump_weekly_count(OLD.course_id, lower(coalesce(OLD.category::text, 'other')), OLD.dt_start, -1);
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        PERFORM bump_weekly_count(NEW.course_id, lower(coalesce(NEW.category::text, 'other')), NEW.dt_start, 1);
+    END IF;
+    RETURN NULL;
+END $$;
+"""
+WEEKLY_COUNT_TRIGGERS = """
+CREATE OR REPLACE TRIGGER course_events_weekly_count
+AFTER INSERT OR DELETE OR UPDATE OF course_id, category, start_ts ON course_events
+FOR EACH ROW EXECUTE FUNCTION course_events_weekly_count();
+
+CREATE OR REPLACE TRIGGER events_weekly_count
+AFTER INSERT OR DELETE OR UPDATE OF course_id, category, dt_start ON events
+FOR EACH ROW EXECUTE FUNCTION events_weekly_count();
+"""
+
+WEEKLY_COUNTS_QUERY = """
+    SELECT
+        src.course_id,
+        src.category,
+        date_trunc('week', src.start_ts AT TIME ZONE 'UTC')::date AS week_start,
+        extract(isoyear FROM src.start_ts AT TIME ZONE 'UTC')::int AS iso_year,
+        extract(week FROM src.start_ts AT TIME ZONE 'UTC')::int AS iso_week,
+        count(*)::int AS event_count
+    FROM (
+        SELECT course_id, lower(category) AS category, start_ts
+        FROM course_events
+        UNION ALL
+        SELECT course_id, lower(coalesce(category::text, 'other')) AS category, dt_start AS start_ts
+        FROM events
+    ) AS src
+    GROUP BY 1, 2, 3, 4, 5
+"""
+
+
+def upgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS course_event_weekly_counts")
+    op.create_table('course_event_weekly_counts',
+    sa.Column('course_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('category', sa.String(), nullable=False),
+    sa.Column('week_start', sa.Date(), nullable=False),
+    sa.Column('iso_year', sa.Integer(), nullable=False),
+    sa.Column('iso_week', sa.Integer(), nullable=False),
+    sa.Column('event_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('course_id', 'category', 'week_start')
+    )
+    # Keep writers out between the backfill and the triggers going live
+    op.execute("LOCK TABLE course_events, events IN SHARE MODE")
+    op.execute(f"INSERT INTO course_event_weekly_counts {WEEKLY_COUNTS_QUERY}")
+    op.execute(WEEKLY_COUNT_FUNCTIONS)
+    op.execute(WEEKLY_COUNT_TRIGGERS)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS course_events_weekly_count ON course_events")
+    op.execute("DROP TRIGGER IF EXISTS events_weekly_count ON events")
+    op.execute("DROP FUNCTION IF EXISTS course_events_weekly_count()")
+    op.execute("DROP FUNCTION IF EXISTS events_weekly_count()")
+    op.execute("DROP FUNCTION IF EXISTS bump_weekly_count(uuid, text, timestamptz, int)")
+    op.drop_table('course_event_weekly_counts')
+    op.execute(f"CREATE MATERIALIZED VIEW course_event_weekly_counts AS {WEEKLY_COUNTS_QUERY} WITH DATA")
+    op.execute("""
+        CREATE UNIQUE INDEX ux_course_event_weekly_counts
+        ON course_event_weekly_counts (course_id, category, week_start)
+    """)
@@ -8,8 +8,18 @@ class Settings(BaseSettings):
     app_name: str = "SyllaAI API"
     debug: bool = False
     
+    # Logging
+    log_level: str = "INFO"
+    log_json: bool = True
+    log_debug_sample_rate: float = 0.1  # fraction of DEBUG records kept
+    
     # Database
     database_url: str = Field(..., env="DATABASE_URL")
+    database_replica_url: Optional[str] = Field(default=None, env="DATABASE_REPLICA_URL")  # read-only endpoints
+    replica_sticky_seconds: float = 5.0  # reads go to the primary this long after a user's write
+    partition_terms_ahead: int = 2  # event-table partitions created ahead of the current term
+    partition_keep_terms: int = 6  # older terms are detached into the archive schema
+    slow_query_ms: float = 200.0  # statements slower than this are logged
     
     # Security
     secret_key: str = Field(..., env="SECRET_KEY")
@@ -21,8 +31,67 @@ class Settings(BaseSettings):
     google_client_id: str = Field(..., env="GOOGLE_CLIENT_ID")
     google_client_secret: str = Field(..., env="GOOGLE_CLIENT_SECRET")
     
+    # OpenAI client (one pooled client per process)
+    openai_base_url: Optional[str] = None  # point at a local fake server in tests
+    openai_model: str = "gpt-4o-mini"
+    llm_input_budget_chars: int = 6000  # syllabus text sent per prompt, after compaction
+    openai_timeout_seconds: float = 30.0  # per attempt
+    openai_deadline_seconds: float = 60.0  # whole call, retries included
+    openai_max_retries: int = 3
+    openai_max_connections: int = 20
+    openai_breaker_failure_threshold: int = 5
+    openai_breaker_reset_seconds: float = 30.0
+    
+    # LLM record/replay for offline benchmarks: "off", "record" or "replay"
+    llm_replay_mode: str = "off"
+    llm_fixtures_dir: str = "benchmarks/fixtures/llm"
+    llm_replay_latency_seconds: float = 0.0  # simulated per-call latency in replay mode
+    
+    # Coalescing of identical concurrent syllabus parses
+    singleflight_lock_ttl_seconds: float = 120.0
+    singleflight_result_ttl_seconds: int = 300
+    singleflight_poll_seconds: float = 0.2
+    
     # Redis (for background jobs)
     redis_url: str = Field(default="redis://localhost:6379", env="REDIS_URL")
+    redis_socket_timeout_seconds: float = 2.0  # per command: a hung Redis fails the call, not the request
+    redis_connect_timeout_seconds: float = 1.0
+    
+    # Deadline reminders (Redis sorted-set scheduler)
+    reminders_enabled: bool = False
+    reminder_offsets_minutes: list[int] = [1440, 60]  # 24h and 1h before start
+    reminder_poll_seconds: float = 5.0
+    reminder_batch_size: int = 100
+    reminder_leader_ttl_seconds: int = 15
+    reminder_webhook_url: Optional[str] = None  # None = log delivery only
+    reminder_max_attempts: int = 5  # failed deliveries before a reminder is dead-lettered
+    
+    # Server-sent change notifications
+    sse_max_connections_per_worker: int = 500
+    sse_heartbeat_seconds: float = 15.0
+    sse_queue_size: int = 64  # per connection; overflow sends a "resync" event
+    sse_token_ttl_seconds: int = 60  # one-time stream tokens (POST /stream/token)
+    
+    # Admission control (per worker process; see middleware/admission.py)
+    admission_enabled: bool = True
+    admission_expensive_routes: list[str] = [  # regexes on the path, non-GET requests only
+        r"/syllabus(/[^/]+/reextract)?$",
+        r"/student-syllabus(/stream)?$",
+        r"^/api/admin/(import|syllabi)/",
+    ]
+    admission_expensive_limit: int = 4
+    admission_expensive_queue: int = 16
+    admission_expensive_queue_timeout_seconds: float = 15.0
+    admission_cheap_limit: int = 100
+    admission_cheap_queue: int = 500
+    admission_cheap_queue_timeout_seconds: float = 5.0
+    
+    # Per-user rate limits and daily LLM quotas (services/rate_limit.py)
+    rate_limit_enabled: bool = True
+    rate_limit_syllabus_per_minute: float = 6  # syllabus uploads / re-extractions per user
+    rate_limit_syllabus_burst: int = 5
+    llm_daily_quota_per_user: int = 50  # real LLM calls per UTC day
+    llm_daily_quota_per_school: int = 2000  # school = the user's email domain
     
     # CORS
     cors_origins: list[str] = ["http://localhost:3000", "http://localhost:8080"]
@@ -31,6 +100,22 @@ class Settings(BaseSettings):
     max_file_size_mb: int = 10
     allowed_file_types: list[str] = ["application/pdf", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"]
     
+    # Uploaded file storage (content-addressed; see services/file_store.py)
+    file_store_backend: str = "local"  # "local" or "s3"
+    file_store_root: str = "storage/files"
+    file_store_chunk_bytes: int = 1024 * 1024
+    s3_bucket: Optional[str] = Field(default=None, env="S3_BUCKET")
+    s3_endpoint_url: Optional[str] = Field(default=None, env="S3_ENDPOINT_URL")  # MinIO, R2, ...
+    s3_prefix: str = "syllabi/"
+    s3_presign_seconds: int = 300
+    
+    # Admin bulk import, exports and batch syllabus uploads
+    bulk_import_max_mb: int = 50
+    bulk_import_copy_chunk_bytes: int = 1024 * 1024  # upload bytes per COPY write
+    bulk_import_max_errors: int = 1000  # per-row errors listed in the report (all are counted)
+    export_batch_size: int = 2000  # rows per server-side cursor fetch when streaming exports
+    syllabus_batch_concurrency: int = 4  # concurrent LLM extractions per batch upload
+    
     class Config:
         env_file = ".env"
 
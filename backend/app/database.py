@@ -1,15 +1,168 @@
 # ===== BEGIN app/database.py =====
+import asyncio
 import time
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
 from sqlalchemy.exc import OperationalError
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
 
-engine = create_engine(settings.database_url)
+logger = logging.getLogger("syllaai.db")
+
+# ------------------------------------------------------------------ #
+#  Query instrumentation
+# ------------------------------------------------------------------ #
+class QueryStats:
+    """Query count and DB time accumulated for one request (or test block)."""
+    __slots__ = ("count", "total_ms")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+
+# Sync dependencies run in a threadpool with a *copy* of the context, which
+# still points at the same QueryStats object, so their queries are counted too.
+_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+def _params_shape(params, executemany: bool):
+    """Describe parameters by type only, so slow-query logs never carry user data."""
+    if executemany and params:
+        return f"{len(params)} x {_params_shape(params[0], False)}"
+    if isinstance(params, dict):
+        return {key: type(value).__name__ for key, value in params.items()}
+    if isinstance(params, (list, tuple)):
+        return [type(value).__name__ for value in params]
+    return type(params).__name__
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_start = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - context._query_start) * 1000
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.total_ms += elapsed_ms
+    if elapsed_ms >= settings.slow_query_ms:
+        logger.warning(
+            "Slow query (%.1f ms): %s params=%s",
+            elapsed_ms, " ".join(statement.split()), _params_shape(parameters, executemany),
+        )
+
+def instrument_engine(target):
+    event.listen(target, "before_cursor_execute", _before_cursor_execute)
+    event.listen(target, "after_cursor_execute", _after_cursor_execute)
+    return target
+
+@contextmanager
+def track_queries():
+    """Count queries issued inside the block: `with track_queries() as stats: ...`"""
+    parent = _query_stats.get()
+    stats = QueryStats()
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+        if parent is not None:
+            # Nested blocks (a request inside a test's block) count toward both
+            parent.count += stats.count
+            parent.total_ms += stats.total_ms
+
+engine = instrument_engine(create_engine(settings.database_url))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# ------------------------------------------------------------------ #
+#  Read replica
+# ------------------------------------------------------------------ #
+# Read-only endpoints use ReplicaSessionLocal (the primary when no replica
+# is configured). A user who has just committed a write reads from the
+# primary for replica_sticky_seconds so they see their own changes
+# despite replication lag, e.g. get_courses right after join_course.
+replica_engine = (
+    instrument_engine(create_engine(settings.database_replica_url))
+    if settings.database_replica_url else None
+)
+ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine or engine)
+
+# Local copy of recent writers (user id -> monotonic deadline), checked
+# before Redis. Every entry gets the same lifetime, so keeping it in
+# insertion order keeps the expired entries at the front to prune.
+_recent_writes: "OrderedDict[str, float]" = OrderedDict()
+_recent_writes_lock = threading.Lock()
+
+def _sticky_key(user_id) -> str:
+    return f"replica-sticky:{user_id}"
+
+def _remember_write(key: str) -> None:
+    now = time.monotonic()
+    with _recent_writes_lock:
+        _recent_writes[key] = now + settings.replica_sticky_seconds
+        _recent_writes.move_to_end(key)
+        while _recent_writes:
+            oldest, deadline = next(iter(_recent_writes.items()))
+            if deadline > now:
+                break
+            del _recent_writes[oldest]
+
+def _set_sticky(user_id) -> None:
+    try:
+        from .services.redis_client import get_redis
+        get_redis().set(_sticky_key(user_id), 1, px=int(settings.replica_sticky_seconds * 1000))
+    except Exception as e:
+        logger.warning("Failed to record replica stickiness for %s: %s", user_id, e)
+
+def mark_recent_write(user_id) -> None:
+    _remember_write(str(user_id))
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        _set_sticky(user_id)  # a worker thread: blocking is fine
+    else:
+        # Commits in async endpoints run on the event loop; don't wait on Redis there
+        loop.run_in_executor(None, _set_sticky, user_id)
+
+def recently_wrote(user_id) -> bool:
+    deadline = _recent_writes.get(str(user_id))
+    if deadline is not None and time.monotonic() < deadline:
+        return True
+    try:
+        from .services.redis_client import get_redis
+        return bool(get_redis().exists(_sticky_key(user_id)))
+    except Exception as e:
+        # Can't tell: the primary is always consistent
+        logger.warning("Replica stickiness lookup failed, reading from primary: %s", e)
+        return True
+
+@event.listens_for(SessionLocal, "after_flush")
+def _flag_flush(session, flush_context):
+    session.info["wrote"] = True
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _flag_bulk_write(orm_execute_state):
+    # query.delete()/update() bypass the flush
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+@event.listens_for(SessionLocal, "after_commit")
+def _after_commit(session):
+    # session.info["user_id"] is set by get_current_user for the request's session
+    if session.info.pop("wrote", False) and replica_engine is not None:
+        user_id = session.info.get("user_id")
+        if user_id is not None:
+            mark_recent_write(user_id)
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _after_rollback(session):
+    session.info.pop("wrote", None)
+
 def get_db():
     db = SessionLocal()
     try:
@@ -17,6 +170,25 @@ def get_db():
     finally:
         db.close()
 
+def read_session(user_id=None):
+    """Session for read-only work: the replica unless `user_id` wrote recently."""
+    if replica_engine is not None and (user_id is None or not recently_wrote(user_id)):
+        return ReplicaSessionLocal()
+    return SessionLocal()
+
+def replica_get(model, ident):
+    """
+    One row by primary key from the replica, detached. Falls back to the
+    primary when the replica has not seen the row yet (e.g. a user who
+    signed up a moment ago).
+    """
+    with ReplicaSessionLocal() as session:
+        row = session.get(model, ident)
+    if row is None and replica_engine is not None:
+        with SessionLocal() as session:
+            row = session.get(model, ident)
+    return row
+
 def create_tables(retries: int = 10, delay: float = 1.0):
     """
     Try to create tables, retrying if the DB isn't up yet.
@@ -30,7 +202,7 @@ def create_tables(retries: int = 10, delay: float = 1.0):
         except OperationalError as e:
             if attempt == retries:
                 raise  # Give up
-            print(f"[database] attempt {attempt}/{retries} failed, retrying in {delay}s…")
+            logger.warning("Database not ready (attempt %d/%d), retrying in %ss", attempt, retries, delay)
             time.sleep(delay)
 
 # ===== END app/database.py =====
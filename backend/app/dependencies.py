@@ -1,5 +1,5 @@
 # ===== BEGIN app/dependencies.py =====
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
@@ -7,12 +7,14 @@ from typing import Optional
 from uuid import UUID
 from sqlalchemy.orm import Session
 
-from .database import get_db
+from .database import get_db, read_session, replica_get
 from .config import settings
 from .models.user import User, UserRole
 from .schemas.user import TokenData
+from .services import rate_limit
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -20,10 +22,10 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
 
-def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
+def decode_access_token(token: str) -> TokenData:
     exc = HTTPException(status_code= status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials")
     try:
-        payload = jwt.decode(credentials.credentials, settings.secret_key, algorithms=[settings.algorithm])
+        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
         user_id: str = payload.get("sub")
         if not user_id:
             raise exc
@@ -31,20 +33,82 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
     except (JWTError, ValueError):
         raise exc
 
+def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    return decode_access_token(credentials.credentials)
+
 def get_current_user(token_data: TokenData = Depends(verify_token), db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.id == token_data.user_id).first()
+    # The user row comes from the replica: read-only endpoints then never
+    # touch the primary (the request's primary session stays unconnected)
+    user = replica_get(User, token_data.user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    # Writes committed on this session make the user's next reads go to the primary
+    db.info["user_id"] = user.id
     return user
 
+def get_read_db(credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)):
+    """
+    Session for read-only endpoints: the read replica, unless the caller
+    committed a write within the last replica_sticky_seconds.
+    """
+    user_id = None
+    if credentials:
+        try:
+            user_id = decode_access_token(credentials.credentials).user_id
+        except HTTPException:
+            pass  # auth (if the endpoint needs it) is enforced by get_current_user
+    db = read_session(user_id)
+    try:
+        yield db
+    finally:
+        db.close()
+
 def get_current_professor(current_user: User = Depends(get_current_user)):
     if current_user.role != UserRole.PROFESSOR:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only professors can access")
     return current_user
 
+def get_current_admin(current_user: User = Depends(get_current_user)):
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admins can access")
+    return current_user
+
 def get_current_student(current_user: User = Depends(get_current_user)):
     if current_user.role != UserRole.STUDENT:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only students can access")
     return current_user
 
+def rate_limited(bucket: str):
+    """Dependency: one token from the caller's `bucket` per request, 429 + Retry-After when empty."""
+    async def take_token(response: Response, current_user: User = Depends(get_current_user)):
+        if not settings.rate_limit_enabled:
+            return
+        decision = await rate_limit.limiter.take(bucket, current_user.id)
+        if not decision.allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, please slow down",
+                headers=decision.headers(),
+            )
+        response.headers.update(decision.headers())
+    return take_token
+
+async def llm_quota(response: Response, current_user: User = Depends(get_current_user)):
+    """
+    Charge this request's LLM calls to the caller's daily quotas (checked
+    again atomically on each call) and fail fast when one is already used up.
+    Must stay async: the owner is bound in a context var the endpoint sees.
+    """
+    if not settings.rate_limit_enabled:
+        return
+    owner = rate_limit.bind_llm_owner(current_user)
+    usage = await rate_limit.limiter.llm_usage(owner)
+    if not usage.allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=rate_limit.LLMQuotaExceeded.detail,
+            headers=usage.headers(),
+        )
+    response.headers.update(usage.headers())
+
 # ===== END app/dependencies.py =====
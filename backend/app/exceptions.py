@@ -5,10 +5,13 @@ class AppException(Exception):
     """Base class: every custom error has an HTTP status and a detail string."""
     status_code: int = status.HTTP_500_INTERNAL_SERVER_ERROR
     detail: str = "Internal Server Error"
+    headers: dict | None = None  # extra response headers, e.g. Retry-After
 
-    def __init__(self, detail: str | None = None) -> None:
+    def __init__(self, detail: str | None = None, headers: dict | None = None) -> None:
         if detail:
             self.detail = detail
+        if headers:
+            self.headers = headers
         super().__init__(self.detail)
 
 
@@ -35,3 +38,18 @@ class NotFound(AppException):
 class Conflict(AppException):  # e.g. unique-key violations
     status_code = status.HTTP_409_CONFLICT
     detail = "Conflict"
+
+
+class PayloadTooLarge(AppException):  # e.g. uploads over the size limit
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    detail = "Payload too large"
+
+
+class TooManyRequests(AppException):  # e.g. rate limits and quotas
+    status_code = status.HTTP_429_TOO_MANY_REQUESTS
+    detail = "Too many requests"
+
+
+class ServiceUnavailable(AppException):  # e.g. upstream API degraded
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    detail = "Service temporarily unavailable"
@@ -1,43 +1,21 @@
 # app/main.py – FIXED CORS FOR PRODUCTION
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import auth, courses, events
+from app.routers import auth, courses, events, analytics, stream, admin
 from app.database import engine, Base
+from app.config import settings
+from app.middleware.errors import ErrorMiddleware
+from app.middleware.admission import AdmissionMiddleware
+from app.middleware.timing import QueryTimingMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.request_id import RequestIdMiddleware
+from app.logging_config import setup_logging
+from app import metrics
 import os
 
-# ------------------------------------------------------------------ #
-#  Error-handling middleware (unchanged)
-# ------------------------------------------------------------------ #
-from starlette.middleware.base import BaseHTTPMiddleware
-from fastapi.responses import JSONResponse
-from sqlalchemy.exc import IntegrityError
-from pydantic import ValidationError
-import logging
-
-logger = logging.getLogger(__name__)
-
-class ErrorMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request, call_next):
-        try:
-            return await call_next(request)
-        except IntegrityError as exc:
-            logger.error(f"Database integrity error: {exc}")
-            return JSONResponse(
-                {"detail": "Database constraint violation", "error": str(exc)},
-                status_code=400,
-            )
-        except ValidationError as exc:
-            logger.error(f"Validation error: {exc}")
-            return JSONResponse(
-                {"detail": "Validation failed", "errors": exc.errors()},
-                status_code=422,
-            )
-        except Exception as exc:
-            logger.error(f"Unexpected error: {exc}")
-            return JSONResponse(
-                {"detail": "Internal server error", "error": str(exc)},
-                status_code=500,
-            )
+# Route all logging through the background queue listener before anything logs
+setup_logging()
 
 # ------------------------------------------------------------------ #
 #  Database setup
@@ -51,10 +29,19 @@ app = FastAPI(
     title="SyllabAI Backend",
     description="API for managing academic courses and events",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 # Add error middleware first
 app.add_middleware(ErrorMiddleware)
+# Per-route-class concurrency limits; sheds load with 503 + Retry-After
+app.add_middleware(AdmissionMiddleware)
+# Per-request query count / DB time (Server-Timing header + log line)
+app.add_middleware(QueryTimingMiddleware)
+# Prometheus latency histograms by route template
+app.add_middleware(MetricsMiddleware)
+# Outermost of ours so every log line for the request carries its id
+app.add_middleware(RequestIdMiddleware)
 
 # ------------------------------------------------------------------ #
 #  CORS CONFIGURATION (NOW ALLOWS GITHUB PAGES + CUSTOM DOMAINS)
@@ -86,6 +73,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let the frontend read the rate-limit and quota headers
+    expose_headers=[
+        "Retry-After",
+        "X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset",
+        "X-LLM-Quota-Limit", "X-LLM-Quota-Remaining", "X-LLM-Quota-Reset",
+    ],
 )
 
 # ------------------------------------------------------------------ #
@@ -103,10 +96,39 @@ async def health_check_detailed():
         "database": "healthy",
     }
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    body, content_type = metrics.render_latest()
+    return Response(content=body, media_type=content_type)
+
 @app.get("/")
 async def root():
     return {"message": "SyllabAI Backend API", "status": "operational"}
 
+# ------------------------------------------------------------------ #
+#  Background workers
+# ------------------------------------------------------------------ #
+@app.on_event("startup")
+async def ensure_event_partitions():
+    if engine.dialect.name == "postgresql":
+        from app.services import partitioning
+        with engine.begin() as conn:
+            partitioning.ensure_partitions(conn)
+
+@app.on_event("startup")
+async def start_background_workers():
+    if settings.reminders_enabled:
+        from app.services import reminder_service
+        app.state.reminder_worker = reminder_service.start_worker()
+
+@app.on_event("shutdown")
+async def stop_background_workers():
+    worker = getattr(app.state, "reminder_worker", None)
+    if worker:
+        worker.stop()
+    from app.services import openai_service
+    await openai_service.close_client()
+
 # ------------------------------------------------------------------ #
 #  Routers
 # ------------------------------------------------------------------ #
@@ -114,6 +136,9 @@ async def root():
 app.include_router(auth.router, prefix="/api")
 app.include_router(courses.router, prefix="/api")
 app.include_router(events.router,  prefix="/api")
+app.include_router(analytics.router, prefix="/api")
+app.include_router(stream.router, prefix="/api")
+app.include_router(admin.router, prefix="/api")
 
 
 # ------------------------------------------------------------------ #
@@ -0,0 +1,114 @@
+"""
+Prometheus metrics.
+
+With several uvicorn workers each process has its own counters, so set
+PROMETHEUS_MULTIPROC_DIR to an empty, writable directory shared by the
+workers: values are then written to mmap'd files and /metrics aggregates
+every worker's samples on each scrape.
+"""
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+
+MULTIPROCESS = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requests currently being served",
+    multiprocess_mode="livesum",
+)
+
+SYLLABUS_STAGE_SECONDS = Histogram(
+    "syllabus_stage_duration_seconds",
+    "Time spent in each syllabus pipeline stage",
+    ["stage"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+
+OPENAI_TOKENS = Counter(
+    "openai_tokens_total",
+    "OpenAI tokens consumed",
+    ["model", "kind"],  # kind: prompt | completion
+)
+
+
+_stage_collector: ContextVar[Optional[Dict[str, List[float]]]] = ContextVar("stage_collector", default=None)
+
+
+@contextmanager
+def stage(name: str):
+    """Time a pipeline stage: `with metrics.stage("llm_call"): ...`"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        SYLLABUS_STAGE_SECONDS.labels(stage=name).observe(elapsed)
+        collected = _stage_collector.get()
+        if collected is not None:
+            collected.setdefault(name, []).append(elapsed)
+
+
+@contextmanager
+def collect_stages():
+    """Also capture stage timings in the current context: {stage: [seconds, ...]}"""
+    collected: Dict[str, List[float]] = {}
+    token = _stage_collector.set(collected)
+    try:
+        yield collected
+    finally:
+        _stage_collector.reset(token)
+
+
+ADMISSION_REJECTED = Counter(
+    "admission_rejected_total",
+    "Requests shed with 503 by admission control",
+    ["route_class", "reason"],  # reason: queue_full | queue_timeout
+)
+
+ADMISSION_QUEUE_WAIT = Histogram(
+    "admission_queue_wait_seconds",
+    "Time requests spent queued for a route-class slot",
+    ["route_class"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+PROMPT_TOKENS_SAVED = Counter(
+    "syllabus_prompt_tokens_saved_total",
+    "Estimated prompt tokens removed by syllabus text compaction",
+)
+
+
+def record_token_usage(model: str, usage) -> None:
+    """Count tokens from an OpenAI `usage` block (no-op if absent)."""
+    if usage is None:
+        return
+    OPENAI_TOKENS.labels(model=model, kind="prompt").inc(usage.prompt_tokens or 0)
+    OPENAI_TOKENS.labels(model=model, kind="completion").inc(usage.completion_tokens or 0)
+
+
+def render_latest() -> tuple[bytes, str]:
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import math
+import re
+import time
+from typing import Optional
+
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import settings
+from app.metrics import ADMISSION_QUEUE_WAIT, ADMISSION_REJECTED
+
+log = logging.getLogger("syllaai.admission")
+
+# Never queued: probes, scrapes and long-lived SSE connections (capped separately)
+EXEMPT_PREFIXES = ("/health", "/metrics", "/api/stream/")
+
+
+class Rejected(Exception):
+    def __init__(self, reason: str):
+        self.reason = reason
+
+
+class RouteClassLimiter:
+    """
+    At most `limit` requests of one class in flight, at most `queue_size`
+    more waiting (each for up to `queue_timeout` seconds); anything beyond
+    that is turned away at once instead of piling up.
+    """
+
+    def __init__(self, name: str, limit: int, queue_size: int, queue_timeout: float):
+        self.name = name
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self._slots = asyncio.Semaphore(limit)
+        self.waiting = 0
+
+    async def acquire(self) -> None:
+        if not self._slots.locked():
+            await self._slots.acquire()  # free slot: no wait
+            return
+        if self.waiting >= self.queue_size:
+            raise Rejected("queue_full")
+        self.waiting += 1
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise Rejected("queue_timeout")
+        finally:
+            self.waiting -= 1
+            ADMISSION_QUEUE_WAIT.labels(route_class=self.name).observe(time.perf_counter() - start)
+
+    def release(self) -> None:
+        self._slots.release()
+
+
+class AdmissionMiddleware:
+    """
+    Pure ASGI admission control by route class.
+
+    Syllabus uploads, re-extraction, batch ingestion and bulk imports are
+    "expensive" (seconds of PDF parsing and LLM time each); everything else
+    is "cheap". Each class has its own concurrency limit and bounded wait
+    queue, so a burst of uploads queues behind the expensive limit and is
+    shed with 503 + Retry-After once that queue is full, while /auth/me
+    and friends keep their own slots and the threadpool headroom.
+
+    Limits are per process: with N uvicorn workers the server-wide limit
+    is N times the setting.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.expensive_patterns = [re.compile(pattern) for pattern in settings.admission_expensive_routes]
+        self.limiters = {
+            "expensive": RouteClassLimiter(
+                "expensive",
+                settings.admission_expensive_limit,
+                settings.admission_expensive_queue,
+                settings.admission_expensive_queue_timeout_seconds,
+            ),
+            "cheap": RouteClassLimiter(
+                "cheap",
+                settings.admission_cheap_limit,
+                settings.admission_cheap_queue,
+                settings.admission_cheap_queue_timeout_seconds,
+            ),
+        }
+
+    def route_class(self, scope: Scope) -> Optional[str]:
+        path = scope["path"]
+        if scope["method"] == "OPTIONS" or path.startswith(EXEMPT_PREFIXES):
+            return None
+        if scope["method"] != "GET" and any(pattern.search(path) for pattern in self.expensive_patterns):
+            return "expensive"
+        return "cheap"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        route_class = self.route_class(scope) if scope["type"] == "http" and settings.admission_enabled else None
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.limiters[route_class]
+        try:
+            await limiter.acquire()
+        except Rejected as rejected:
+            ADMISSION_REJECTED.labels(route_class=route_class, reason=rejected.reason).inc()
+            log.debug("Shed %s %s (%s, %s)", scope["method"], scope["path"], route_class, rejected.reason)
+            response = _overloaded(limiter)
+            await response(scope, receive, send)
+            return
+        try:
+            # The slot is held until the response (including any stream) is finished
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+
+def _overloaded(limiter: RouteClassLimiter) -> JSONResponse:
+    retry_after = max(1, math.ceil(limiter.queue_timeout))
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server busy, please retry shortly"},
+        headers={"Retry-After": str(retry_after)},
+    )
@@ -1,41 +1,72 @@
 import logging
-from fastapi import Request
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
 from sqlalchemy.exc import IntegrityError
 from pydantic import ValidationError
 from psycopg2.errors import UniqueViolation  # Postgres-specific
-from app.exceptions import AppException, BadRequest, Conflict
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.exceptions import AppException
 
 
 log = logging.getLogger("syllaai.errors")
 
 
-class ErrorMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        try:
-            return await call_next(request)
+class ErrorMiddleware:
+    """
+    Pure ASGI error mapper.
+
+    Unlike BaseHTTPMiddleware this never wraps the response body in a
+    memory stream or spawns a task per request: `send` is passed straight
+    through (streaming/SSE responses are untouched) and we only step in
+    when the app raises before it has started a response.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
-        # ---------- OUR CUSTOM EXCEPTIONS ----------
-        except AppException as exc:
-            return _json(exc.status_code, exc.detail)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # ---------- Pydantic & validation ----------
-        except ValidationError as exc:
-            return _json(422, exc.errors())
+        response_started = False
 
-        # ---------- DB integrity / unique key ----------
-        except IntegrityError as exc:
-            # dig into PG error code to distinguish unique-key vs other
-            if isinstance(exc.orig, UniqueViolation):
-                return _json(409, "Resource already exists")
-            raise  # let outer handler convert to 500
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
 
-        # ---------- Fallback ----------
+        try:
+            await self.app(scope, receive, send_wrapper)
         except Exception as exc:
-            log.exception("Unhandled error on %s %s", request.method, request.url.path)
-            return _json(500, "Internal Server Error")
+            if response_started:
+                # Too late to send an error body; let the server close the connection
+                raise
+            response = _response_for(exc, scope)
+            await response(scope, receive, send)
+
+
+def _response_for(exc: Exception, scope: Scope) -> JSONResponse:
+    # ---------- OUR CUSTOM EXCEPTIONS ----------
+    if isinstance(exc, AppException):
+        return _json(exc.status_code, exc.detail, exc.headers)
+
+    # ---------- Pydantic & validation ----------
+    if isinstance(exc, ValidationError):
+        return _json(422, exc.errors(include_url=False))
+
+    # ---------- DB integrity / unique key ----------
+    if isinstance(exc, IntegrityError):
+        # dig into PG error code to distinguish unique-key vs other
+        if isinstance(exc.orig, UniqueViolation):
+            return _json(409, "Resource already exists")
+        log.warning("Integrity error on %s %s: %s", scope["method"], scope["path"], exc.orig)
+        return _json(400, "Database constraint violation")
+
+    # ---------- Fallback ----------
+    log.exception("Unhandled error on %s %s", scope["method"], scope["path"], exc_info=exc)
+    return _json(500, "Internal Server Error")
 
 
-def _json(status_code: int, detail):
-    return JSONResponse(status_code=status_code, content={"detail": detail})
+def _json(status_code: int, detail, headers=None):
+    return JSONResponse(status_code=status_code, content={"detail": detail}, headers=headers)
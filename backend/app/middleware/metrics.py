@@ -0,0 +1,46 @@
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.metrics import REQUEST_LATENCY, REQUESTS_IN_FLIGHT
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI: request latency histogram keyed by route *template*
+    (e.g. /api/courses/{course_id}/syllabus) so label cardinality stays
+    bounded no matter how many ids are requested.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            REQUEST_LATENCY.labels(
+                method=scope["method"],
+                route=_route_template(scope),
+                status=str(status_code),
+            ).observe(time.perf_counter() - start)
+
+
+def _route_template(scope: Scope) -> str:
+    # The router has already matched the request and left the route in the
+    # (shared) scope, so there is no need to scan the route table again
+    route = scope.get("route")
+    return getattr(route, "path", "<unmatched>")
@@ -0,0 +1,51 @@
+import logging
+import time
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.database import track_queries
+
+
+log = logging.getLogger("syllaai.timing")
+
+
+class QueryTimingMiddleware:
+    """
+    Pure ASGI: counts SQL statements and DB time per request.
+
+    The totals are reported in a `Server-Timing` header (visible in the
+    browser devtools) and in one log line per request. Queries issued after
+    the response has started (streaming bodies) only reach the log line.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        with track_queries() as stats:
+            async def send_wrapper(message: Message) -> None:
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    total_ms = (time.perf_counter() - start) * 1000
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "Server-Timing",
+                        f'db;dur={stats.total_ms:.1f};desc="{stats.count} queries", app;dur={total_ms:.1f}',
+                    )
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                log.info(
+                    "%s %s %s queries=%d db_ms=%.1f total_ms=%.1f",
+                    scope["method"], scope["path"], status_code,
+                    stats.count, stats.total_ms, (time.perf_counter() - start) * 1000,
+                )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, Integer, DateTime, Text
+from sqlalchemy import Column, String, ForeignKey, Integer, DateTime, Text, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 import uuid
@@ -7,6 +7,10 @@ from ..database import Base
 
 class Course(Base):
     __tablename__ = "courses"
+    # One course per CRN per school and term; bulk import upserts on it
+    __table_args__ = (
+        Index("ux_courses_school_crn_semester", "school_id", "crn", "semester", unique=True),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
@@ -27,18 +31,19 @@ class Course(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
-    # EXISTING relationships (kept exactly the same)
-    events = relationship("Event", back_populates="course")  # Keep for backward compatibility
-    syllabi = relationship("Syllabus", back_populates="course")  # Keep existing
+    # Child rows are removed by ON DELETE CASCADE in the database;
+    # passive_deletes stops the ORM loading them just to delete them one by one
+    events = relationship("Event", back_populates="course", cascade="all, delete-orphan", passive_deletes=True)
+    syllabi = relationship("Syllabus", back_populates="course", cascade="all, delete-orphan", passive_deletes=True)
     
     # NEW MVP relationships
     school = relationship("School", back_populates="courses")
-    course_events = relationship("CourseEvent", back_populates="course", cascade="all, delete-orphan")
-    student_links = relationship("StudentCourseLink", back_populates="course")
+    course_events = relationship("CourseEvent", back_populates="course", cascade="all, delete-orphan", passive_deletes=True)
+    student_links = relationship("StudentCourseLink", back_populates="course", cascade="all, delete-orphan", passive_deletes=True)
     professor = relationship("User", foreign_keys=[created_by])
 
 # EXISTING Enrollment model (kept exactly the same)
 class Enrollment(Base):
     __tablename__ = "enrollments"
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
-    course_id = Column(UUID(as_uuid=True), ForeignKey("courses.id"), primary_key=True)
\ No newline at end of file
+    course_id = Column(UUID(as_uuid=True), ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True, index=True)
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Index, DDL, event
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -7,11 +7,17 @@ from ..database import Base
 
 class CourseEvent(Base):
     __tablename__ = "course_events"
+    # Range-partitioned by term on start_ts (see services/partitioning.py);
+    # Postgres requires the partition key in the primary key
+    __table_args__ = (
+        Index("ix_course_events_course_id_start_ts", "course_id", "start_ts"),
+        {"postgresql_partition_by": "RANGE (start_ts)"},
+    )
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    course_id = Column(UUID(as_uuid=True), ForeignKey("courses.id"), nullable=False)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)  # (id, start_ts) PK covers id lookups
+    course_id = Column(UUID(as_uuid=True), ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
     
-    start_ts = Column(DateTime(timezone=True), nullable=False)
+    start_ts = Column(DateTime(timezone=True), primary_key=True, nullable=False)
     end_ts = Column(DateTime(timezone=True), nullable=False)
     title = Column(Text, nullable=False)
     category = Column(String, nullable=False)  # "Exam", "HW", "Project", etc.
@@ -27,3 +33,11 @@ class CourseEvent(Base):
     
     # Relationships
     course = relationship("Course", back_populates="course_events")
+    
+    # Rows are still identified by id alone
+    __mapper_args__ = {"primary_key": [id]}
+
+event.listen(
+    CourseEvent.__table__, "after_create",
+    DDL("CREATE TABLE course_events_default PARTITION OF course_events DEFAULT").execute_if(dialect="postgresql"),
+)
@@ -1,6 +1,6 @@
 # app/models/event.py - FIX THE ENUM VALUES
 import enum
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Enum as SQLAEnum
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Index, DDL, LargeBinary, Enum as SQLAEnum, event
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -27,11 +27,16 @@ class SyllabusStatus(enum.Enum):
 
 class Event(Base):
     __tablename__ = "events"
+    # Range-partitioned by term on dt_start (see services/partitioning.py)
+    __table_args__ = (
+        Index("ix_events_course_id_dt_start", "course_id", "dt_start"),
+        {"postgresql_partition_by": "RANGE (dt_start)"},
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    course_id = Column(UUID(as_uuid=True), ForeignKey("courses.id"), nullable=False)
+    course_id = Column(UUID(as_uuid=True), ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
     title = Column(String, nullable=False)
-    dt_start = Column(DateTime(timezone=True), nullable=False)
+    dt_start = Column(DateTime(timezone=True), primary_key=True, nullable=False)
     dt_end = Column(DateTime(timezone=True), nullable=True)
     category = Column(SQLAEnum(EventCategory), default=EventCategory.other)
     location = Column(String, nullable=True)
@@ -43,17 +48,35 @@ class Event(Base):
     # Relationship
     course = relationship("Course", back_populates="events")
 
+    __mapper_args__ = {"primary_key": [id]}
+
+event.listen(
+    Event.__table__, "after_create",
+    DDL("CREATE TABLE events_default PARTITION OF events DEFAULT").execute_if(dialect="postgresql"),
+)
+
 class Syllabus(Base):
     __tablename__ = "syllabi"
+    __table_args__ = (
+        # Re-uploads of the same file are found by hash within the course
+        Index("ix_syllabi_course_id_document_hash", "course_id", "document_hash"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    course_id = Column(UUID(as_uuid=True), ForeignKey("courses.id"), nullable=False)
+    course_id = Column(UUID(as_uuid=True), ForeignKey("courses.id", ondelete="CASCADE"), nullable=False, index=True)
     filename = Column(String, nullable=False)
     file_url = Column(String, nullable=True)
     file_size = Column(String, nullable=True)
-    parsed_text = Column(Text, nullable=True)
+    parsed_text = Column(Text, nullable=True)  # legacy rows; new rows use text_compressed
     status = Column(SQLAEnum(SyllabusStatus), default=SyllabusStatus.pending)
     error_message = Column(Text, nullable=True)
+    
+    # Parse artifacts: re-extraction starts from these instead of the PDF
+    document_hash = Column(String(64), nullable=True)  # sha256 of the uploaded bytes
+    text_compressed = Column(LargeBinary, nullable=True)  # zlib of the normalized text
+    raw_llm_output = Column(Text, nullable=True)  # the model's reply, unparsed
+    prompt_version = Column(String, nullable=True)  # openai_service.prompt_version() at extraction
+    extracted_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
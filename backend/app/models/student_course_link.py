@@ -8,7 +8,7 @@ class StudentCourseLink(Base):
     __tablename__ = "student_course_links"
     
     student_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
-    course_id = Column(UUID(as_uuid=True), ForeignKey("courses.id"), primary_key=True)
+    course_id = Column(UUID(as_uuid=True), ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True, index=True)
     
     # Store mapping of course events to student's calendar events
     gcal_event_map = Column(JSON, default=dict)  # {course_event_id: student_gcal_id}
@@ -0,0 +1,79 @@
+from sqlalchemy import Table, Column, String, Integer, Date, DDL, event
+from sqlalchemy.dialects.postgresql import UUID
+
+from ..database import Base
+
+# One row per (course, category, ISO week), kept current by triggers on
+# course_events and events: every insert, delete, or update of a counted
+# column adjusts its week's count in the same transaction, so readers
+# never see a stale summary and writers never pay for a full recount.
+# Categories are lower-cased so "Exam" and "exam" share a bucket.
+course_event_weekly_counts = Table(
+    "course_event_weekly_counts",
+    Base.metadata,
+    Column("course_id", UUID(as_uuid=True), primary_key=True),
+    Column("category", String, primary_key=True),
+    Column("week_start", Date, primary_key=True),
+    Column("iso_year", Integer, nullable=False),
+    Column("iso_week", Integer, nullable=False),
+    Column("event_count", Integer, nullable=False),
+)
+
+# Same DDL as alembic 007, (re)created once every table exists, on every
+# create_all; hence CREATE OR REPLACE.
+# Row triggers on a partitioned table apply to all of its partitions, and a
+# row moved between partitions fires DELETE then INSERT.
+WEEKLY_COUNT_FUNCTIONS = """
+CREATE OR REPLACE FUNCTION bump_weekly_count(p_course_id uuid, p_category text, p_start timestamptz, p_delta int)
+RETURNS void LANGUAGE plpgsql AS $$
+DECLARE
+    p_week date := date_trunc('week', p_start AT TIME ZONE 'UTC')::date;
+BEGIN
+    INSERT INTO course_event_weekly_counts AS w (course_id, category, week_start, iso_year, iso_week, event_count)
+    VALUES (
+        p_course_id, p_category, p_week,
+        extract(isoyear FROM p_start AT TIME ZONE 'UTC')::int,
+        extract(week FROM p_start AT TIME ZONE 'UTC')::int,
+        p_delta
+    )
+    ON CONFLICT (course_id, category, week_start) DO UPDATE SET event_count = w.event_count + EXCLUDED.event_count;
+    IF p_delta < 0 THEN
+        DELETE FROM course_event_weekly_counts
+        WHERE course_id = p_course_id AND category = p_category AND week_start = p_week AND event_count <= 0;
+    END IF;
+END $$;
+
+CREATE OR REPLACE FUNCTION course_events_weekly_count() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP <> 'INSERT' THEN
+        PERFORM bump_weekly_count(OLD.course_id, lower(OLD.category), OLD.start_ts, -1);
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        PERFORM bump_weekly_count(NEW.course_id, lower(NEW.category), NEW.start_ts, 1);
+    END IF;
+    RETURN NULL;
+END $$;
+
+CREATE OR REPLACE FUNCTION events_weekly_count() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP <> 'INSERT' THEN
+        PERFORM bump_weekly_count(OLD.course_id, lower(coalesce(OLD.category::text, 'other')), OLD.dt_start, -1);
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        PERFORM bump_weekly_count(NEW.course_id, lower(coalesce(NEW.category::text, 'other')), NEW.dt_start, 1);
+    END IF;
+    RETURN NULL;
+END $$;
+"""
+WEEKLY_COUNT_TRIGGERS = """
+CREATE OR REPLACE TRIGGER course_events_weekly_count
+AFTER INSERT OR DELETE OR UPDATE OF course_id, category, start_ts ON course_events
+FOR EACH ROW EXECUTE FUNCTION course_events_weekly_count();
+
+CREATE OR REPLACE TRIGGER events_weekly_count
+AFTER INSERT OR DELETE OR UPDATE OF course_id, category, dt_start ON events
+FOR EACH ROW EXECUTE FUNCTION events_weekly_count();
+"""
+
+event.listen(Base.metadata, "after_create", DDL(WEEKLY_COUNT_FUNCTIONS).execute_if(dialect="postgresql"))
+event.listen(Base.metadata, "after_create", DDL(WEEKLY_COUNT_TRIGGERS).execute_if(dialect="postgresql"))
@@ -0,0 +1,170 @@
+import asyncio
+import json
+import logging
+import zipfile
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..database import get_db
+from ..dependencies import get_current_admin
+from ..models.course import Course as CourseModel
+from ..models.school import School
+from ..models.user import User
+from ..schemas.admin import ImportReport
+from ..services import bulk_import, event_export, notification_service, syllabus_batch
+from ..services.partitioning import TERM_RE
+from .. import metrics
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+logger = logging.getLogger(__name__)
+
+def _check_upload(file: UploadFile) -> None:
+    if file.size is not None and file.size > settings.bulk_import_max_mb * 1024 * 1024:
+        raise HTTPException(status_code=413, detail=f"CSV larger than {settings.bulk_import_max_mb} MB")
+
+def _check_syllabus_size(file: UploadFile) -> None:
+    if file.size is not None and file.size > settings.max_file_size_mb * 1024 * 1024:
+        raise HTTPException(status_code=413, detail=f"{file.filename} is larger than {settings.max_file_size_mb} MB")
+
+def _report(result: bulk_import.ImportResult, dry_run: bool) -> ImportReport:
+    return ImportReport(
+        rows=result.rows,
+        inserted=result.inserted,
+        updated=result.updated,
+        skipped=result.error_count,
+        errors=result.errors,
+        errors_truncated=result.error_count > len(result.errors),
+        dry_run=dry_run,
+    )
+
+def _run_import(db: Session, dry_run: bool, importer, *args) -> bulk_import.ImportResult:
+    """Run an importer in one transaction: committed, or rolled back for a dry run."""
+    try:
+        with metrics.stage("db_write"):
+            result = importer(db, *args)
+            if dry_run:
+                db.rollback()
+            else:
+                db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return result
+
+@router.post("/import/courses", response_model=ImportReport)
+async def import_courses(
+    file: UploadFile = File(...),
+    dry_run: bool = Query(False, description="Validate and report without writing"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin)
+):
+    """Create/update courses from a registrar CSV (school, crn, semester, title[, professor_email])"""
+    _check_upload(file)
+    # COPY blocks for the whole upload; keep it off the event loop
+    result = await asyncio.to_thread(
+        _run_import, db, dry_run, bulk_import.import_courses, file.file, current_user.id
+    )
+    logger.info(
+        "Course import by %s: %d rows, %d inserted, %d updated, %d skipped%s",
+        current_user.id, result.rows, result.inserted, result.updated, result.error_count,
+        " (dry run)" if dry_run else "",
+    )
+    return _report(result, dry_run)
+
+@router.post("/import/rosters", response_model=ImportReport)
+async def import_rosters(
+    file: UploadFile = File(...),
+    dry_run: bool = Query(False, description="Validate and report without writing"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin)
+):
+    """Enroll students from a registrar roster CSV (school, crn, semester, student_email)"""
+    _check_upload(file)
+    result = await asyncio.to_thread(_run_import, db, dry_run, bulk_import.import_roster, file.file)
+    logger.info(
+        "Roster import by %s: %d rows, %d enrolled, %d already enrolled, %d skipped%s",
+        current_user.id, result.rows, result.inserted, result.updated, result.error_count,
+        " (dry run)" if dry_run else "",
+    )
+    if not dry_run:
+        # One notification per course, not per student
+        for course_id in result.course_ids:
+            await notification_service.publish_change(course_id, "enrollment", "imported")
+    return _report(result, dry_run)
+
+@router.get("/export/events")
+async def export_events(
+    school_id: int,
+    semester: str,
+    fmt: Literal["csv", "ndjson", "ics"] = Query("csv", alias="format"),
+    category: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin)
+):
+    """Stream every course event for a school and semester (e.g. 2025FA) as CSV, NDJSON or ICS"""
+    semester = semester.upper()
+    if not TERM_RE.match(semester):
+        raise HTTPException(status_code=400, detail=f"Invalid semester: {semester}")
+    if not db.get(School, school_id):
+        raise HTTPException(status_code=404, detail="School not found")
+    # Yield dependencies are only closed once the response has been sent;
+    # hand this connection back now rather than pin it for the whole stream
+    db.close()
+
+    filename = f"events-{school_id}-{semester}.{fmt}"
+    return StreamingResponse(
+        event_export.export_events(school_id, semester, fmt, category),
+        media_type=event_export.MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+@router.post("/syllabi/batch")
+async def ingest_syllabi(
+    school_id: int,
+    semester: str,
+    files: List[UploadFile] = File(..., description="ZIP archive(s) and/or individual syllabi named by CRN"),
+    publish: bool = Query(True, description="Replace each course's events; false only reports what was extracted"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin)
+):
+    """
+    Ingest a term's syllabi at once, streamed as server-sent events: one
+    `file` event per document as it finishes, then a `summary`.
+    """
+    semester = semester.upper()
+    if not TERM_RE.match(semester):
+        raise HTTPException(status_code=400, detail=f"Invalid semester: {semester}")
+    for upload in files:
+        if not upload.filename.lower().endswith(".zip"):
+            _check_syllabus_size(upload)
+    courses_by_crn = {
+        row.crn: row.id for row in db.query(CourseModel.crn, CourseModel.id).filter(
+            CourseModel.school_id == school_id,
+            CourseModel.semester == semester,
+            CourseModel.crn.isnot(None),
+        )
+    }
+    # The stream can run for minutes; don't pin this connection meanwhile
+    db.close()
+    try:
+        documents = await asyncio.to_thread(
+            syllabus_batch.list_documents, [(upload.filename, upload.file) for upload in files]
+        )
+    except (zipfile.BadZipFile, KeyError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail=f"Could not read archive: {e}")
+
+    async def progress_stream():
+        async for event, data in syllabus_batch.run_batch(
+            documents, courses_by_crn, store=syllabus_batch.store_in_db if publish else None
+        ):
+            yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+    return StreamingResponse(
+        progress_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,72 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from typing import Optional
+from uuid import UUID
+from datetime import date
+
+from ..database import get_db
+from ..dependencies import get_current_user
+from ..models.user import User
+from ..models.course import Course as CourseModel, Enrollment
+from ..schemas.analytics import CourseWorkload, StudentWorkload
+from ..services import workload_service
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+@router.get("/courses/{course_id}/workload", response_model=CourseWorkload)
+async def get_course_workload(
+    course_id: UUID,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Weekly exam/HW/project counts for one course"""
+    course = db.query(CourseModel).filter(CourseModel.id == course_id).first()
+    if not course:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
+
+    if current_user.role.value == "professor" and course.created_by != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You can only view your own courses")
+    if current_user.role.value == "student":
+        enrolled = db.query(Enrollment).filter(
+            Enrollment.user_id == current_user.id,
+            Enrollment.course_id == course_id
+        ).first()
+        if not enrolled:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enrolled in this course")
+
+    weeks = workload_service.get_course_workload(db, course_id, start, end)
+    return CourseWorkload(course_id=course_id, weeks=weeks)
+
+@router.get("/students/{student_id}/workload", response_model=StudentWorkload)
+async def get_student_workload(
+    student_id: UUID,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Weekly workload across all of a student's enrolled courses (self or admin)"""
+    if current_user.id != student_id and current_user.role.value != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You can only view your own workload")
+
+    weeks = workload_service.get_student_workload(db, student_id, start, end)
+    return StudentWorkload(student_id=student_id, weeks=weeks)
+
+@router.get("/me/workload", response_model=StudentWorkload)
+async def get_my_workload(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Weekly workload for the current user (enrolled courses, or taught courses for professors)"""
+    if current_user.role.value == "professor":
+        course_ids = [
+            row.id for row in db.query(CourseModel.id).filter(CourseModel.created_by == current_user.id)
+        ]
+        weeks = workload_service.get_courses_workload(db, course_ids, start, end)
+    else:
+        weeks = workload_service.get_student_workload(db, current_user.id, start, end)
+    return StudentWorkload(student_id=current_user.id, weeks=weeks)
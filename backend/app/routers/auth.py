@@ -1,3 +1,4 @@
+import logging
 from datetime import timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, status
@@ -13,6 +14,7 @@ from ..models.user import User, UserRole
 from ..schemas.user import Token, UserCreate
 
 router = APIRouter(prefix="/auth", tags=["auth"])
+logger = logging.getLogger(__name__)
 
 class GoogleToken(BaseModel):
     token: str
@@ -88,7 +90,7 @@ async def google_token_login(payload: GoogleToken, db: Session = Depends(get_db)
         user = _get_or_create_user(idinfo, db)
         return _issue_backend_token(user)
     except Exception as e:
-        print(f"Auth error: {e}")  # For debugging
+        logger.warning("Google login failed: %s", e)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid Google ID token",
@@ -1,22 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Request, status, UploadFile, File
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, func, select
 from sqlalchemy.orm import Session
 from typing import List
 from uuid import UUID
+from datetime import timedelta
+import asyncio
+import json
+import logging
+import mimetypes
 import random
 import string
 
+from ..config import settings
 from ..database import get_db
-from ..dependencies import get_current_user
+from ..dependencies import get_current_user, get_read_db, llm_quota, rate_limited
 from ..models.user import User
 from ..models.course import Course as CourseModel, Enrollment
 from ..models.school import School
 from ..models.course_event import CourseEvent
 from ..models.student_course_link import StudentCourseLink
-from ..schemas.course import CourseCreate, Course as CourseSchema, EnrollmentCreate
+from ..models.event import Event as EventModel, Syllabus as SyllabusModel, SyllabusStatus
+from ..schemas.course import CourseCreate, Course as CourseSchema, CourseUpdate, EnrollmentCreate, CourseClone, CourseCloneResponse
 from ..schemas.school import School as SchoolSchema, SchoolCreate
-from ..schemas.course_event import CourseEvent as CourseEventSchema, CourseEventCreate, SyllabusUploadResponse
+from ..schemas.course_event import CourseEvent as CourseEventSchema, CourseEventCreate, SyllabusUploadResponse, SyllabusReextract
+from ..services import reminder_service, notification_service, syllabus_pipeline, course_clone
+from ..services import file_store, openai_service, syllabus_store
+from .. import metrics
+from ..serialization import COURSE_LIST, SCHOOL_LIST, Projection, list_response, rows_to_dicts, schema_columns
+from ..exceptions import AppException
+from ..services.singleflight import RedisSingleFlight
 
 router = APIRouter(prefix="/courses", tags=["courses"])
+logger = logging.getLogger(__name__)
 
 def generate_course_code() -> str:
     """Generate a unique 8-character course code"""
@@ -28,32 +44,49 @@ def generate_course_code() -> str:
 
 @router.get("/", response_model=List[CourseSchema])
 async def get_courses(
-    db: Session = Depends(get_db),
+    projection: Projection = Depends(),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get courses based on user role"""
+    fields = projection.fields_for(CourseSchema)
+    
+    # One query for columns, school name and student count (no per-course lookups);
+    # the join and the count subquery are only added when those fields are wanted
+    columns = schema_columns(CourseModel, CourseSchema, fields)
+    if "school" in fields:
+        columns += [School.id.label("school_ref_id"), School.name.label("school_name")]
+    if "student_count" in fields:
+        student_count = (
+            select(func.count())
+            .where(Enrollment.course_id == CourseModel.id)
+            .correlate(CourseModel)
+            .scalar_subquery()
+        )
+        columns.append(student_count.label("student_count"))
+    query = db.query(*columns).select_from(CourseModel)
+    if "school" in fields:
+        query = query.outerjoin(School, CourseModel.school_id == School.id)
+    
     if current_user.role.value == "professor":
         # Professors see courses they created
-        courses = db.query(CourseModel).filter(CourseModel.created_by == current_user.id).all()
+        query = query.filter(CourseModel.created_by == current_user.id)
     elif current_user.role.value == "student":
         # Students see enrolled courses
-        courses = db.query(CourseModel).join(
+        query = query.join(
             Enrollment, CourseModel.id == Enrollment.course_id
-        ).filter(Enrollment.user_id == current_user.id).all()
-    else:  # admin
-        # Admins see all courses
-        courses = db.query(CourseModel).all()
-    
-    # Add additional info for each course
-    for course in courses:
-        # Add student count
-        course.student_count = db.query(Enrollment).filter(Enrollment.course_id == course.id).count()
-        
-        # Add school info if available
-        if course.school:
-            course.school = {"id": course.school.id, "name": course.school.name}
-    
-    return courses
+        ).filter(Enrollment.user_id == current_user.id)
+    # admin: all courses
+    
+    courses = rows_to_dicts(query)
+    if "school" in fields:
+        for course in courses:
+            # Add school info if available
+            school_id, school_name = course.pop("school_ref_id"), course.pop("school_name")
+            course["school"] = {"id": school_id, "name": school_name} if school_id is not None else None
+        courses = [{f: course[f] for f in fields} for course in courses]
+    
+    return projection.respond(COURSE_LIST, fields, courses)
 
 @router.post("/", response_model=CourseSchema)
 async def create_course(
@@ -81,8 +114,87 @@ async def create_course(
     db.add(course)
     db.commit()
     db.refresh(course)
+    # Targeted at the creator, which also adds the course to their open streams
+    await notification_service.publish_change(course.id, "course", "created", user_id=current_user.id)
+    return course
+
+@router.put("/{course_id}", response_model=CourseSchema)
+async def update_course(
+    course_id: UUID,
+    course_update: CourseUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Update an existing course (Professor only)"""
+    if current_user.role.value != "professor":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only professors can update courses"
+        )
+    
+    course = db.query(CourseModel).filter(CourseModel.id == course_id).first()
+    if not course:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Course not found"
+        )
+    
+    if course.created_by != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You can only update your own courses"
+        )
+    
+    # Update only provided fields
+    for field, value in course_update.model_dump(exclude_unset=True).items():
+        setattr(course, field, value)
+    
+    db.commit()
+    db.refresh(course)
+    await notification_service.publish_change(course.id, "course", "updated")
     return course
 
+@router.delete("/{course_id}")
+async def delete_course(
+    course_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Delete a course (Professor only)"""
+    if current_user.role.value != "professor":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only professors can delete courses"
+        )
+    
+    course = db.query(CourseModel).filter(CourseModel.id == course_id).first()
+    if not course:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Course not found"
+        )
+    
+    if course.created_by != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You can only delete your own courses"
+        )
+    
+    # Reminders live in Redis, outside the cascade; collect their ids first
+    event_ids, course_event_ids = [], []
+    if settings.reminders_enabled:
+        event_ids = [row.id for row in db.query(EventModel.id).filter(EventModel.course_id == course_id)]
+        course_event_ids = [row.id for row in db.query(CourseEvent.id).filter(CourseEvent.course_id == course_id)]
+    
+    # One statement: ON DELETE CASCADE removes events, course_events, syllabi,
+    # enrollments and student links in the database, without loading them
+    db.execute(delete(CourseModel).where(CourseModel.id == course_id))
+    db.commit()
+    await reminder_service.cancel_reminders("event", event_ids)
+    await reminder_service.cancel_reminders("course_event", course_event_ids)
+    await notification_service.publish_change(course_id, "course", "deleted")
+    return {"detail": "Course deleted successfully"}
+
 @router.post("/join", response_model=CourseSchema)
 async def join_course(
     enrollment_in: EnrollmentCreate,
@@ -120,6 +232,8 @@ async def join_course(
     enrollment = Enrollment(user_id=current_user.id, course_id=course.id)
     db.add(enrollment)
     db.commit()
+    # Type and action only: every subscriber of the course receives this
+    await notification_service.publish_change(course.id, "enrollment", "joined")
     
     return course
 
@@ -129,10 +243,10 @@ async def join_course(
 
 # School Management
 @router.get("/schools", response_model=List[SchoolSchema])
-async def get_schools(db: Session = Depends(get_db)):
+async def get_schools(db: Session = Depends(get_read_db)):
     """Get list of all schools"""
-    schools = db.query(School).order_by(School.name).all()
-    return schools
+    schools = rows_to_dicts(db.query(*schema_columns(School, SchoolSchema)).order_by(School.name))
+    return list_response(SCHOOL_LIST, schools)
 
 @router.post("/schools", response_model=SchoolSchema)
 async def create_school(
@@ -197,15 +311,74 @@ async def create_course_mvp(
     db.add(db_course)
     db.commit()
     db.refresh(db_course)
+    await notification_service.publish_change(db_course.id, "course", "created", user_id=current_user.id)
     return db_course
 
+# Semester Rollover
+@router.post("/{course_id}/clone", response_model=CourseCloneResponse)
+async def clone_course(
+    course_id: UUID,
+    clone: CourseClone,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Copy a course and all its events into a new semester, dates shifted (no re-parsing)"""
+    course = db.query(CourseModel).filter(
+        CourseModel.id == course_id,
+        CourseModel.created_by == current_user.id
+    ).first()
+    
+    if not course:
+        raise HTTPException(status_code=404, detail="Course not found or access denied")
+    
+    try:
+        if clone.offset_weeks is not None:
+            offset = timedelta(weeks=clone.offset_weeks)
+        else:
+            offset = course_clone.rollover_offset(course.semester, clone.semester)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    crn = clone.crn or course.crn
+    if crn and db.query(CourseModel.id).filter(
+        CourseModel.school_id == course.school_id,
+        CourseModel.crn == crn,
+        CourseModel.semester == clone.semester
+    ).first():
+        raise HTTPException(status_code=400, detail="Course with this CRN already exists for this semester")
+    
+    course_code = generate_course_code()
+    while db.query(CourseModel).filter(CourseModel.code == course_code).first():
+        course_code = generate_course_code()
+    
+    with metrics.stage("db_write"):
+        try:
+            new_id, copied = course_clone.clone_course(
+                db, course_id,
+                code=course_code, crn=crn, semester=clone.semester, title=clone.title, offset=offset,
+            )
+        except LookupError:
+            raise HTTPException(status_code=404, detail="Course not found or access denied")
+        db.commit()
+    
+    for kind in ("course_event", "event"):
+        await reminder_service.schedule_reminders(kind, [(event_id, start) for k, event_id, start in copied if k == kind])
+    await notification_service.publish_change(new_id, "course", "created", user_id=current_user.id)
+    
+    return CourseCloneResponse(
+        course=rows_to_dicts(db.query(*schema_columns(CourseModel, CourseSchema)).filter(CourseModel.id == new_id))[0],
+        course_events_copied=sum(1 for kind, _, _ in copied if kind == "course_event"),
+        events_copied=sum(1 for kind, _, _ in copied if kind == "event"),
+        offset_days=offset.days,
+    )
+
 # Course Search
 @router.get("/search")
 async def search_course(
     school_id: int,
     crn: str,
     semester: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Search for a course by school, CRN, and semester"""
     course = db.query(CourseModel).filter(
@@ -276,18 +449,27 @@ async def join_course_mvp(
     db.add(enrollment)
     db.add(link)
     db.commit()
+    # Type and action only: every subscriber of the course receives this
+    await notification_service.publish_change(course.id, "enrollment", "joined")
     
     return {"message": f"Successfully enrolled in {course.title}"}
 
 # Syllabus Upload (Demo Implementation)
-@router.post("/{course_id}/syllabus", response_model=SyllabusUploadResponse)
+# Each may call the LLM: rate limited per user and charged to the daily LLM quotas
+SYLLABUS_LIMITS = [Depends(rate_limited("syllabus")), Depends(llm_quota)]
+
+@router.post("/{course_id}/syllabus", response_model=SyllabusUploadResponse, dependencies=SYLLABUS_LIMITS)
 async def upload_syllabus(
     course_id: UUID,
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Upload and process syllabus for a course"""
+    """
+    Extract events from a course syllabus and keep the text and raw model
+    reply, so re-uploads and re-extraction skip the PDF (and, with an
+    unchanged prompt, the LLM)
+    """
     course = db.query(CourseModel).filter(
         CourseModel.id == course_id,
         CourseModel.created_by == current_user.id
@@ -296,40 +478,137 @@ async def upload_syllabus(
     if not course:
         raise HTTPException(status_code=404, detail="Course not found or access denied")
     
-    # TODO: Implement actual AI processing
-    # For now, return demo events
-    from datetime import datetime, timedelta
-    today = datetime.now()
-    
-    demo_events = [
-        CourseEventCreate(
-            title="Midterm Exam",
-            start_ts=today + timedelta(days=30),
-            end_ts=today + timedelta(days=30, hours=2),
-            category="Exam",
-            location="Room 101"
-        ),
-        CourseEventCreate(
-            title="Assignment 1 Due",
-            start_ts=today + timedelta(days=14),
-            end_ts=today + timedelta(days=14),
-            category="HW",
-            location=None
-        ),
-        CourseEventCreate(
-            title="Group Project Presentation",
-            start_ts=today + timedelta(days=45),
-            end_ts=today + timedelta(days=45, hours=1),
-            category="Project",
-            location="Conference Room A"
-        )
-    ]
+    # Streamed to disk in chunks while hashing; the PDF is never held in memory whole
+    store = file_store.get_file_store()
+    with metrics.stage("upload_read"):
+        spooled = await file_store.spool_upload(file, store, settings.max_file_size_mb * 1024 * 1024)
+    try:
+        skipped = []
+        syllabus = syllabus_store.find_by_hash(db, course_id, spooled.sha256)
+        if syllabus:
+            text = syllabus_store.stored_text(syllabus)
+            skipped.append("pdf_extract")
+        else:
+            with metrics.stage("pdf_extract"):
+                text = await asyncio.to_thread(syllabus_pipeline.extract_pdf_text, spooled.path)
+            syllabus = SyllabusModel(
+                course_id=course_id,
+                filename=file.filename,
+                file_size=str(spooled.size),
+                document_hash=spooled.sha256,
+                status=SyllabusStatus.processing,
+            )
+            syllabus_store.set_text(syllabus, text)
+            db.add(syllabus)
+        if not syllabus.file_url:
+            with metrics.stage("file_store"):
+                syllabus.file_url = await asyncio.to_thread(store.save, spooled.path, spooled.sha256)
+        db.commit()
+    finally:
+        spooled.discard()
+    
+    events = await _extract_for(db, syllabus, text, force=False, skipped=skipped)
+    return SyllabusUploadResponse(
+        extracted_events=events, course_id=course_id, syllabus_id=syllabus.id, stages_skipped=skipped
+    )
+
+@router.post("/{course_id}/syllabus/{syllabus_id}/reextract", response_model=SyllabusUploadResponse, dependencies=SYLLABUS_LIMITS)
+async def reextract_syllabus(
+    course_id: UUID,
+    syllabus_id: UUID,
+    request: SyllabusReextract,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Re-run extraction from the stored text (optionally corrected); no upload, no PDF"""
+    syllabus = db.query(SyllabusModel).join(CourseModel).filter(
+        SyllabusModel.id == syllabus_id,
+        SyllabusModel.course_id == course_id,
+        CourseModel.created_by == current_user.id
+    ).first()
     
+    if not syllabus:
+        raise HTTPException(status_code=404, detail="Syllabus not found or access denied")
+    
+    skipped = ["upload_read", "pdf_extract"]
+    if request.text is not None:
+        if not request.text.strip():
+            raise HTTPException(status_code=400, detail="Empty syllabus text")
+        text = request.text.strip()
+        syllabus_store.set_text(syllabus, text)
+        syllabus.prompt_version = None  # the stored reply no longer matches the text
+        db.commit()
+    else:
+        text = syllabus_store.stored_text(syllabus)
+        if text is None:
+            raise HTTPException(status_code=409, detail="No stored text for this syllabus; upload it again")
+    
+    events = await _extract_for(db, syllabus, text, force=request.force, skipped=skipped)
     return SyllabusUploadResponse(
-        extracted_events=demo_events,
-        course_id=course_id
+        extracted_events=events, course_id=course_id, syllabus_id=syllabus.id, stages_skipped=skipped
     )
 
+@router.get("/{course_id}/syllabus/{syllabus_id}/file")
+async def download_syllabus(
+    course_id: UUID,
+    syllabus_id: UUID,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """The original syllabus file; honours a single byte Range on local storage"""
+    syllabus = db.query(SyllabusModel).filter(
+        SyllabusModel.id == syllabus_id,
+        SyllabusModel.course_id == course_id
+    ).first()
+    
+    if not syllabus:
+        raise HTTPException(status_code=404, detail="Syllabus not found")
+    
+    course = db.get(CourseModel, course_id)
+    if course.created_by != current_user.id:
+        enrolled = db.query(Enrollment).filter(
+            Enrollment.course_id == course_id,
+            Enrollment.user_id == current_user.id
+        ).first()
+        if not enrolled:
+            raise HTTPException(status_code=403, detail="Not enrolled in this course")
+    
+    stored = file_store.parse_file_url(syllabus.file_url)
+    filename = syllabus.filename or "syllabus.pdf"
+    db.close()  # nothing more to read; don't hold the connection while the file streams
+    store = file_store.get_file_store()
+    if stored is None or stored[0] != store.name:
+        raise HTTPException(status_code=404, detail="Syllabus file not stored")
+    media_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    return store.response(stored[1], filename, media_type, request.headers.get("range"))
+
+async def _extract_for(db: Session, syllabus: SyllabusModel, text: str, force: bool, skipped: List[str]):
+    """Events for a stored syllabus: from its stored reply when still valid, else via the LLM."""
+    if not force and syllabus_store.reusable_output(syllabus, openai_service.prompt_version()):
+        skipped.append("llm_call")
+        return syllabus_pipeline.events_from_raw(syllabus.raw_llm_output)
+    
+    syllabus_id = syllabus.id
+    # Don't hold a pooled connection open for the length of the LLM call
+    db.close()
+    try:
+        extraction = await syllabus_pipeline.extract_with_artifacts(text)
+    except Exception as e:
+        logger.warning("Syllabus extraction failed (%s): %s", type(e).__name__, e)
+        detail = e.detail if isinstance(e, AppException) else "Failed to parse syllabus"
+        syllabus_store.record_failure(db.get(SyllabusModel, syllabus_id), detail)
+        db.commit()
+        if isinstance(e, AppException):
+            raise
+        raise HTTPException(status_code=422, detail=f"Failed to parse syllabus: {str(e)}")
+    
+    with metrics.stage("db_write"):
+        syllabus = db.get(SyllabusModel, syllabus_id)
+        syllabus_store.record_extraction(syllabus, extraction)
+        db.commit()
+    return extraction.events
+
 # Event Publishing
 @router.post("/{course_id}/events/publish")
 async def publish_events(
@@ -347,7 +626,10 @@ async def publish_events(
     if not course:
         raise HTTPException(status_code=404, detail="Course not found or access denied")
     
-    # Clear existing events for this course
+    # Clear existing events for this course (and, after the commit, their reminders)
+    old_event_ids = []
+    if settings.reminders_enabled:
+        old_event_ids = [row.id for row in db.query(CourseEvent.id).filter(CourseEvent.course_id == course_id)]
     db.query(CourseEvent).filter(CourseEvent.course_id == course_id).delete()
     
     # Create new events
@@ -360,7 +642,13 @@ async def publish_events(
         db.add(db_event)
         created_events.append(db_event)
     
-    db.commit()
+    with metrics.stage("db_write"):
+        db.flush()
+        reminder_targets = [(e.id, e.start_ts) for e in created_events]
+        db.commit()
+    await reminder_service.cancel_reminders("course_event", old_event_ids)
+    await reminder_service.schedule_reminders("course_event", reminder_targets)
+    await notification_service.publish_change(course_id, "course_event", "published")
     
     # TODO: Create calendar events for professor and students
     
@@ -370,170 +658,95 @@ async def publish_events(
     }
 
 # Student Syllabus Processing
-@router.post("/student-syllabus", response_model=SyllabusUploadResponse)
+def _dump_events(events: List[CourseEventCreate]) -> str:
+    return json.dumps([e.model_dump(mode="json") for e in events])
+
+def _load_events(raw: str) -> List[CourseEventCreate]:
+    return [CourseEventCreate(**e) for e in json.loads(raw)]
+
+# Identical uploads (same bytes) arriving together share one extraction
+syllabus_flight = RedisSingleFlight("syllabus-parse", _dump_events, _load_events)
+
+async def _spool_student_upload(file: UploadFile) -> file_store.SpooledUpload:
+    # Streamed to the store's spool dir in chunks while hashing, like course
+    # uploads; students' files are not kept (there is no syllabus row for them)
+    with metrics.stage("upload_read"):
+        return await file_store.spool_upload(file, file_store.get_file_store(), settings.max_file_size_mb * 1024 * 1024)
+
+async def _extract_spooled(path: str) -> List[CourseEventCreate]:
+    with metrics.stage("pdf_extract"):
+        text = await asyncio.to_thread(syllabus_pipeline.extract_pdf_text, path)
+    return await syllabus_pipeline.events_from_text(text)
+
+@router.post("/student-syllabus", response_model=SyllabusUploadResponse, dependencies=SYLLABUS_LIMITS)
 async def process_student_syllabus(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Process student-uploaded syllabus and extract events"""
-    import PyPDF2
-    import io
-    import re
-    import os
-    from datetime import datetime, timedelta
-    
     try:
-        # Read and validate file
-        contents = await file.read()
-        print(f"DEBUG: Successfully extracted {len(contents)} chars with PyPDF2")
-        
-        if not contents:
-            raise HTTPException(status_code=400, detail="Empty file")
-        
-        # Extract text from PDF with better processing
-        text = ""
+        spooled = await _spool_student_upload(file)
+        logger.debug("Spooled upload: %d bytes", spooled.size)
         try:
-            pdf_reader = PyPDF2.PdfReader(io.BytesIO(contents))
-            for page_num, page in enumerate(pdf_reader.pages):
-                page_text = page.extract_text()
-                # Clean up the text
-                page_text = ' '.join(page_text.split())  # Normalize whitespace
-                text += page_text + "\n"
-                print(f"DEBUG: Page {page_num + 1} extracted {len(page_text)} chars")
-        except Exception as e:
-            print(f"DEBUG: PDF extraction error: {e}")
-            raise HTTPException(status_code=400, detail="Failed to extract text from PDF")
-        
-        if not text.strip():
-            raise HTTPException(status_code=400, detail="No text found in PDF")
-        
-        # Clean and process text
-        text = text.strip()
-        print(f"DEBUG: Raw text sample: '{text[:50]}'")
-        print(f"DEBUG: Processing text length: {len(text)}")
-        
-        # Extract basic info (semester, dates, etc.)
-        semester_match = re.search(r'(20\d{2})(SP|SU|FA|WI)', text)
-        semester = semester_match.group(0) if semester_match else "2025SP"
-        print(f"DEBUG: Detected semester: {semester}")
-        
-        # Look for dates in the text
-        date_pattern = r'\b(\d{1,2})/(\d{1,2})\b'
-        dates = re.findall(date_pattern, text)
-        print(f"DEBUG: Found potential dates in text: {dates[:20]}")  # Show first 20 dates
-        
-        if not dates:
-            print("DEBUG: No dates found in regex, returning empty events")
-            return SyllabusUploadResponse(
-                extracted_events=[],
-                course_id=None
-            )
-        
-        print("DEBUG: Regex found dates, proceeding with OpenAI parsing")
-        
-        # Process with OpenAI (fixed null reference)
-        extracted_events = await parse_syllabus_with_openai(text)
+            extracted_events = await syllabus_flight.do(spooled.sha256, lambda: _extract_spooled(spooled.path))
+        finally:
+            spooled.discard()
         
         return SyllabusUploadResponse(
             extracted_events=extracted_events,
             course_id=None
         )
         
+    except (HTTPException, AppException):
+        raise
     except Exception as e:
-        print(f"DEBUG: OpenAI parsing error: {e}")
-        print(f"DEBUG: Error type: {type(e)}")
+        logger.warning("Syllabus processing failed (%s): %s", type(e).__name__, e)
         raise HTTPException(
             status_code=422, 
             detail=f"Failed to parse syllabus: {str(e)}"
         )
 
-async def parse_syllabus_with_openai(text: str) -> List[CourseEventCreate]:
-    """Parse syllabus text using OpenAI API"""
-    import openai
-    import json
-    from datetime import datetime, timedelta
-    
+@router.post("/student-syllabus/stream", dependencies=SYLLABUS_LIMITS)
+async def stream_student_syllabus(
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Same extraction as /student-syllabus, streamed as server-sent events:
+    one `event` per extracted event as soon as the model has written it,
+    then `done` with the total, or `error` with a detail message.
+    """
+    spooled = await _spool_student_upload(file)
     try:
-        # Count tokens (approximate)
-        token_count = len(text.split())
-        print(f"DEBUG: Total text tokens: {token_count}")
-        
-        # Get OpenAI API key
-        openai_api_key = os.getenv("OPENAI_API_KEY")
-        if not openai_api_key:
-            raise Exception("OpenAI API key not configured")
-        
-        client = openai.OpenAI(api_key=openai_api_key)
-        
-        # Create enhanced prompt for OpenAI GPT-4o-mini
-        prompt = f"""
-        You are an expert at parsing academic syllabi. Extract all important events with dates from this syllabus.
-        
-        Return ONLY a valid JSON array of events. Each event should have:
-        - "title": descriptive name of the event
-        - "date": ISO date string (YYYY-MM-DD) - if year is missing, assume 2025
-        - "category": one of "Exam", "Quiz", "HW", "Project", "Presentation", "Class", "Other"
-        - "location": room/building or null if not specified
-        
-        Example format:
-        [
-          {{"title": "Midterm Exam", "date": "2025-03-15", "category": "Exam", "location": "Room 101"}},
-          {{"title": "Assignment 1 Due", "date": "2025-02-20", "category": "HW", "location": null}}
-        ]
-        
-        Syllabus text:
-        {text[:6000]}  # Increased limit for GPT-4o-mini
-        """
-        
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.1,
-            max_tokens=2000
-        )
-        
-        # Parse response
-        content = response.choices[0].message.content
-        
-        # Try to parse JSON from response
+        # PDF problems still surface as a plain 400 before the stream starts
+        with metrics.stage("pdf_extract"):
+            text = await asyncio.to_thread(syllabus_pipeline.extract_pdf_text, spooled.path)
+    finally:
+        spooled.discard()
+    
+    async def produce():
+        if syllabus_pipeline.has_schedule_dates(text):
+            with metrics.stage("llm_stream"):
+                async for event in syllabus_pipeline.stream_syllabus_events(text):
+                    yield event
+    
+    async def event_stream():
+        count = 0
         try:
-            events_data = json.loads(content)
-        except json.JSONDecodeError:
-            # If JSON parsing fails, try to extract JSON from text
-            import re
-            json_match = re.search(r'\[.*\]', content, re.DOTALL)
-            if json_match:
-                events_data = json.loads(json_match.group(0))
-            else:
-                events_data = []
-        
-        # Convert to CourseEventCreate objects
-        events = []
-        for event_data in events_data:
-            try:
-                # Parse date
-                date_str = event_data.get("date", "")
-                if date_str:
-                    event_date = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-                else:
-                    event_date = datetime.now() + timedelta(days=30)
-                
-                # Create event
-                event = CourseEventCreate(
-                    title=event_data.get("title", "Untitled Event"),
-                    start_ts=event_date,
-                    end_ts=event_date + timedelta(hours=1),
-                    category=event_data.get("category", "Other"),
-                    location=event_data.get("location") or None  # Fix: use None instead of null
-                )
-                events.append(event)
-            except Exception as e:
-                print(f"DEBUG: Error parsing event: {e}")
-                continue
-        
-        return events
-        
-    except Exception as e:
-        print(f"DEBUG: OpenAI parsing error: {e}")
-        raise Exception(f"Failed to parse syllabus: {str(e)}")
\ No newline at end of file
+            # Shares the /student-syllabus flight: identical uploads, streamed
+            # or not, make one LLM call between them
+            async for event in syllabus_flight.stream(spooled.sha256, produce):
+                count += 1
+                yield f"event: event\ndata: {event.model_dump_json()}\n\n"
+            yield f"event: done\ndata: {json.dumps({'events': count})}\n\n"
+        except Exception as e:
+            logger.warning("Syllabus stream failed after %d events (%s): %s", count, type(e).__name__, e)
+            detail = e.detail if isinstance(e, AppException) else "Failed to parse syllabus"
+            yield f"event: error\ndata: {json.dumps({'detail': detail})}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
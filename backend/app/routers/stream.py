@@ -0,0 +1,130 @@
+import asyncio
+import json
+import secrets
+from typing import Optional
+from uuid import UUID
+
+import redis
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+
+from ..config import settings
+from ..database import SessionLocal
+from ..dependencies import decode_access_token, get_current_user
+from ..models.user import User
+from ..models.course import Course as CourseModel, Enrollment
+from ..models.student_course_link import StudentCourseLink
+from ..services import redis_client
+from ..services.notification_service import broker, TooManyConnections
+
+router = APIRouter(prefix="/stream", tags=["stream"])
+
+optional_bearer = HTTPBearer(auto_error=False)
+
+STREAM_TOKEN_PREFIX = "stream-token:"
+
+def _redis_unavailable() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Change stream unavailable, retry shortly",
+        headers={"Retry-After": "5"},
+    )
+
+def _load_subscription(user_id):
+    """Resolve the user and the courses they follow with a short-lived session,
+    so an open stream never pins a pooled DB connection."""
+    with SessionLocal() as db:
+        user = db.query(User).filter(User.id == user_id).first()
+        if not user:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+
+        role = user.role.value
+        if role == "admin":
+            return user.id, [], True
+        if role == "professor":
+            rows = db.query(CourseModel.id).filter(CourseModel.created_by == user.id)
+            return user.id, [r.id for r in rows], False
+
+        enrolled = db.query(Enrollment.course_id).filter(Enrollment.user_id == user.id)
+        linked = db.query(StudentCourseLink.course_id).filter(StudentCourseLink.student_id == user.id)
+        return user.id, [r.course_id for r in enrolled.union(linked)], False
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def _redeem_stream_token(token: str) -> UUID:
+    try:
+        user_id = await redis_client.get_async_redis().getdel(STREAM_TOKEN_PREFIX + token)
+    except redis.RedisError:
+        raise _redis_unavailable()
+    if not user_id:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired stream token")
+    return UUID(user_id)
+
+@router.post("/token")
+async def create_stream_token(current_user: User = Depends(get_current_user)):
+    """
+    One-time token for opening /stream/events from EventSource, which cannot
+    send an Authorization header. It is only good for one stream and expires
+    after sse_token_ttl_seconds, so the JWT never appears in a URL.
+    """
+    token = secrets.token_urlsafe(32)
+    try:
+        await redis_client.get_async_redis().set(
+            STREAM_TOKEN_PREFIX + token, str(current_user.id), ex=settings.sse_token_ttl_seconds
+        )
+    except redis.RedisError:
+        raise _redis_unavailable()
+    return {"token": token, "expires_in": settings.sse_token_ttl_seconds}
+
+@router.get("/events")
+async def stream_course_changes(
+    request: Request,
+    token: Optional[str] = Query(None, description="One-time token from POST /stream/token"),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_bearer),
+):
+    """Server-sent events: one `change` event per course/event update the user can see"""
+    if credentials:
+        user_id = decode_access_token(credentials.credentials).user_id
+    elif token:
+        user_id = await _redeem_stream_token(token)
+    else:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+
+    user_id, course_ids, all_courses = await asyncio.to_thread(_load_subscription, user_id)
+
+    try:
+        subscriber = broker.register(user_id, course_ids, all_courses)
+    except TooManyConnections:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many open streams, retry shortly",
+            headers={"Retry-After": "5"},
+        )
+
+    async def event_stream():
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                if subscriber.overflowed:
+                    # We dropped messages for this client; ask it to refetch once
+                    subscriber.overflowed = False
+                    while not subscriber.queue.empty():
+                        subscriber.queue.get_nowait()
+                    yield _sse("resync", {})
+                try:
+                    message = await asyncio.wait_for(subscriber.queue.get(), timeout=settings.sse_heartbeat_seconds)
+                    yield _sse("change", message)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": ping\n\n"
+        finally:
+            broker.unregister(subscriber)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
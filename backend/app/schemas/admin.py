@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import List
+
+class ImportRowError(BaseModel):
+    row: int  # 1-based data row (the header is not counted)
+    error: str
+
+class ImportReport(BaseModel):
+    rows: int
+    inserted: int
+    updated: int  # courses: existing course refreshed; rosters: already enrolled
+    skipped: int
+    errors: List[ImportRowError]
+    errors_truncated: bool
+    dry_run: bool
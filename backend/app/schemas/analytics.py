@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import List
+from datetime import date
+import uuid
+
+class WorkloadWeek(BaseModel):
+    week_start: date
+    iso_year: int
+    iso_week: int
+    category: str
+    event_count: int
+
+class CourseWorkload(BaseModel):
+    course_id: uuid.UUID
+    weeks: List[WorkloadWeek]
+
+class StudentWorkload(BaseModel):
+    student_id: uuid.UUID
+    weeks: List[WorkloadWeek]
@@ -1,8 +1,10 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import uuid
 
+from ..services.partitioning import SEMESTER_PATTERN
+
 # KEEP your existing schemas, ADD new ones
 class CourseBase(BaseModel):
     title: str
@@ -23,6 +25,26 @@ class CourseSearchMVP(BaseModel):
     crn: str
     semester: str
 
+class CourseUpdate(BaseModel):
+    title: Optional[str] = None
+    crn: Optional[str] = None
+    semester: Optional[str] = None
+
+class CourseClone(BaseModel):
+    semester: str  # target term, e.g. "2025FA"
+    crn: Optional[str] = None
+    title: Optional[str] = None  # defaults to the source course's title
+    offset_weeks: Optional[int] = None  # overrides the term-to-term shift
+
+    @field_validator("semester")
+    @classmethod
+    def check_semester(cls, value: str) -> str:
+        # courses.semester is String(6): reject anything else here, not as a DataError
+        value = value.strip().upper()
+        if not SEMESTER_PATTERN.fullmatch(value):
+            raise ValueError("semester must look like 2025FA (term SP, SU, FA or WI)")
+        return value
+
 class EnrollmentCreate(BaseModel):
     course_code: str
 
@@ -42,4 +64,10 @@ class Course(CourseBase):
     student_count: Optional[int] = None
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class CourseCloneResponse(BaseModel):
+    course: Course
+    course_events_copied: int
+    events_copied: int
+    offset_days: int
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 import uuid
 
@@ -24,4 +24,10 @@ class CourseEvent(CourseEventBase):
 
 class SyllabusUploadResponse(BaseModel):
     extracted_events: List[CourseEventCreate]
-    course_id: uuid.UUID
+    course_id: Optional[uuid.UUID] = None
+    syllabus_id: Optional[uuid.UUID] = None  # stored upload, for re-extraction
+    stages_skipped: List[str] = []  # e.g. ["pdf_extract", "llm_call"] when stored artifacts were reused
+
+class SyllabusReextract(BaseModel):
+    text: Optional[str] = None  # corrected syllabus text; replaces the stored text
+    force: bool = False  # call the LLM even if the stored reply used the current prompt
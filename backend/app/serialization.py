@@ -0,0 +1,97 @@
+"""
+Fast JSON for list endpoints.
+
+With `response_model=List[X]` and ORM objects, FastAPI validates every
+attribute of every row against X, runs jsonable_encoder over the result
+and only then calls json.dumps. For rows we have just read from our own
+database that validation is redundant. List endpoints instead select only
+the schema's columns, turn the rows into plain dicts and return them via
+ORJSONResponse (orjson handles UUID, datetime and Enum natively).
+
+The decorators keep their response_model so the OpenAPI docs are
+unchanged; returning a Response directly makes FastAPI skip validation.
+The precompiled TypeAdapters below are the schema of record: with
+settings.debug each projected payload is checked against them, so a
+column/schema mismatch shows up in development rather than in clients.
+
+List endpoints also take `?fields=id,title,...` (only those columns are
+selected in SQL; `id` is always included) and `?format=compact`, which
+returns {"fields": [...], "rows": [[...], ...]} instead of repeating
+every key in every object.
+"""
+
+from typing import Any, Dict, Iterable, List, Literal, Optional, Sequence
+
+from fastapi import Query
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+from .config import settings
+from .exceptions import BadRequest
+from .schemas.course import Course as CourseSchema
+from .schemas.event import Event as EventSchema
+from .schemas.school import School as SchoolSchema
+
+# Building a TypeAdapter compiles the validator/serializer: do it once at import
+COURSE_LIST = TypeAdapter(List[CourseSchema])
+EVENT_LIST = TypeAdapter(List[EventSchema])
+SCHOOL_LIST = TypeAdapter(List[SchoolSchema])
+
+
+def schema_columns(model, schema: type[BaseModel], fields: Optional[Sequence[str]] = None) -> list:
+    """The model's column attributes that `schema` exposes (or just `fields`), in schema field order."""
+    table_columns = model.__table__.columns
+    names = schema.model_fields if fields is None else fields
+    return [getattr(model, name) for name in names if name in table_columns]
+
+
+def rows_to_dicts(rows: Iterable[Any]) -> List[Dict[str, Any]]:
+    """Column-query rows (sqlalchemy Row) to plain dicts."""
+    return [row._asdict() for row in rows]
+
+
+def list_response(adapter: TypeAdapter, items: Sequence[Dict[str, Any]]) -> ORJSONResponse:
+    if settings.debug:
+        adapter.validate_python(items)
+    return ORJSONResponse(items)
+
+
+class Projection:
+    """
+    `fields` / `format` query parameters for list endpoints; use as
+    `projection: Projection = Depends()`.
+    """
+
+    def __init__(
+        self,
+        fields: Optional[str] = Query(
+            None, description="Comma-separated fields to return; id is always included"
+        ),
+        format: Literal["objects", "compact"] = Query(
+            "objects", description='"compact": {"fields": [...], "rows": [[...], ...]}'
+        ),
+    ):
+        self.requested = fields
+        self.format = format
+
+    def fields_for(self, schema: type[BaseModel]) -> List[str]:
+        """Requested field names in schema order; every field when none were requested."""
+        names = list(schema.model_fields)
+        if not self.requested:
+            return names
+        requested = {name.strip() for name in self.requested.split(",") if name.strip()}
+        unknown = requested - set(names)
+        if unknown:
+            raise BadRequest(
+                f"Unknown field(s): {', '.join(sorted(unknown))}. Available: {', '.join(names)}"
+            )
+        requested.add("id")
+        return [name for name in names if name in requested]
+
+    def respond(self, adapter: TypeAdapter, fields: List[str], items: Sequence[Dict[str, Any]]) -> ORJSONResponse:
+        if self.format == "compact":
+            return ORJSONResponse({"fields": fields, "rows": [[item[f] for f in fields] for item in items]})
+        if self.requested:
+            # Partial objects can't pass the full schema; nothing to validate against
+            return ORJSONResponse(items)
+        return list_response(adapter, items)
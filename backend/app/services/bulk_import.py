@@ -0,0 +1,250 @@
+"""
+Bulk course and roster import from registrar CSV exports.
+
+Onboarding a school used to mean one create_course_mvp call per course
+and one join_course_mvp call per student. Here the upload is streamed
+into a temporary staging table with COPY, validated with a handful of
+UPDATEs that stamp an error on bad rows, and applied with one
+INSERT ... SELECT (ON CONFLICT) per target table. Row count only changes
+how long Postgres spends on each statement, not how many statements
+there are.
+
+Courses CSV:  school, crn, semester, title[, professor_email]
+Roster CSV:   school, crn, semester, student_email
+
+`school` is the school's name (case-insensitive). Rows that fail
+validation are skipped and reported with their 1-based data row number;
+every other row is applied in the same transaction.
+"""
+
+import codecs
+import csv
+import logging
+from dataclasses import dataclass, field
+from typing import BinaryIO, Dict, List, Optional
+
+import psycopg2
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..exceptions import BadRequest
+from ..models.user import UserRole
+from .partitioning import TERM_RE
+
+logger = logging.getLogger(__name__)
+
+COURSE_COLUMNS = {"school", "crn", "semester", "title", "professor_email"}
+COURSE_REQUIRED = {"school", "crn", "semester", "title"}
+ROSTER_COLUMNS = {"school", "crn", "semester", "student_email"}
+ROSTER_REQUIRED = ROSTER_COLUMNS
+
+_CODE_ROUNDS = 5  # re-draws of colliding course codes before giving up
+
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    inserted: int = 0
+    updated: int = 0  # courses: existing course refreshed; rosters: already enrolled
+    errors: List[Dict] = field(default_factory=list)
+    error_count: int = 0
+    course_ids: List = field(default_factory=list)
+
+
+def _read_header(stream: BinaryIO, allowed: set, required: set) -> List[str]:
+    """Consume the header line and map it onto staging columns."""
+    line = stream.readline()
+    if not line.strip():
+        raise BadRequest("CSV file is empty")
+    header = [name.strip().lower() for name in next(csv.reader([codecs.decode(line, "utf-8-sig")]))]
+    unknown = [name for name in header if name not in allowed]
+    if unknown:
+        raise BadRequest(f"Unknown CSV column(s): {', '.join(unknown)}; expected {', '.join(sorted(allowed))}")
+    missing = required - set(header)
+    if missing:
+        raise BadRequest(f"Missing CSV column(s): {', '.join(sorted(missing))}")
+    if len(set(header)) != len(header):
+        raise BadRequest("Duplicate CSV column names")
+    return header
+
+
+def _copy_into_staging(db: Session, table: str, columns: List[str], stream: BinaryIO) -> int:
+    """COPY the rest of the upload into `table`; the serial `row_no` keeps input order."""
+    cursor = db.connection().connection.driver_connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, ENCODING 'UTF8')",
+            stream,
+            size=settings.bulk_import_copy_chunk_bytes,
+        )
+    except psycopg2.Error as e:
+        # Malformed CSV (ragged rows, bad quoting, bad encoding) aborts the whole COPY
+        db.rollback()
+        raise BadRequest(f"Could not read CSV: {(e.pgerror or str(e)).strip()}")
+    finally:
+        cursor.close()
+    return db.execute(text(f"SELECT count(*) FROM {table}")).scalar()
+
+
+def _flag(db: Session, table: str, error: str, condition: str, params: Optional[dict] = None) -> None:
+    """Stamp `error` on rows that are still clean and match `condition`."""
+    db.execute(text(f"UPDATE {table} SET error = {error} WHERE error IS NULL AND ({condition})"), params or {})
+
+
+def _resolve_school(db: Session, table: str) -> None:
+    db.execute(text(f"""
+        UPDATE {table} s SET school_id = sc.id
+        FROM schools sc
+        WHERE lower(sc.name) = lower(trim(s.school))
+    """))
+    _flag(db, table, "'unknown school: ' || coalesce(school, '')", "school_id IS NULL")
+
+
+def _collect_errors(db: Session, table: str, result: ImportResult) -> None:
+    result.error_count = db.execute(text(f"SELECT count(*) FROM {table} WHERE error IS NOT NULL")).scalar()
+    rows = db.execute(text(f"""
+        SELECT row_no, error FROM {table} WHERE error IS NOT NULL ORDER BY row_no LIMIT :limit
+    """), {"limit": settings.bulk_import_max_errors})
+    result.errors = [{"row": row.row_no, "error": row.error} for row in rows]
+
+
+def _validate_key(db: Session, table: str) -> None:
+    """Checks shared by both imports: school, CRN and semester must name a course slot."""
+    db.execute(text(f"UPDATE {table} SET crn = trim(crn), semester = upper(trim(semester))"))
+    _resolve_school(db, table)
+    _flag(db, table, "'missing crn'", "crn IS NULL OR crn = ''")
+    _flag(db, table, "'crn longer than 10 characters'", "length(crn) > 10")
+    _flag(db, table, "'invalid semester: ' || coalesce(semester, '')",
+          "semester IS NULL OR semester !~ :term_re", {"term_re": TERM_RE.pattern})
+
+
+def import_courses(db: Session, stream: BinaryIO, default_professor_id) -> ImportResult:
+    """
+    Create or update courses keyed by (school, crn, semester). New courses
+    belong to `professor_email` when given, otherwise to `default_professor_id`.
+    Not committed.
+    """
+    columns = _read_header(stream, COURSE_COLUMNS, COURSE_REQUIRED)
+    db.execute(text("""
+        CREATE TEMP TABLE course_import (
+            row_no bigserial,
+            school text, crn text, semester text, title text, professor_email text,
+            school_id integer, created_by uuid, code text, error text
+        ) ON COMMIT DROP
+    """))
+    result = ImportResult(rows=_copy_into_staging(db, "course_import", columns, stream))
+
+    _validate_key(db, "course_import")
+    db.execute(text("UPDATE course_import SET title = trim(title)"))
+    _flag(db, "course_import", "'missing title'", "title IS NULL OR title = ''")
+    db.execute(text("""
+        UPDATE course_import s SET created_by = u.id
+        FROM users u
+        WHERE lower(u.email) = lower(trim(s.professor_email)) AND u.role = :professor
+    """), {"professor": UserRole.PROFESSOR.name})
+    _flag(db, "course_import", "'no professor with email: ' || professor_email",
+          "created_by IS NULL AND coalesce(trim(professor_email), '') <> ''")
+    # ON CONFLICT cannot touch the same course twice in one statement
+    db.execute(text("""
+        UPDATE course_import s SET error = 'duplicate of row ' || f.first_row
+        FROM (
+            SELECT school_id, crn, semester, min(row_no) AS first_row
+            FROM course_import WHERE error IS NULL
+            GROUP BY school_id, crn, semester HAVING count(*) > 1
+        ) f
+        WHERE s.error IS NULL AND s.school_id = f.school_id AND s.crn = f.crn
+          AND s.semester = f.semester AND s.row_no > f.first_row
+    """))
+    _collect_errors(db, "course_import", result)
+
+    # Join codes for the new courses: random, re-drawn while they collide
+    db.execute(text("""
+        UPDATE course_import SET code = upper(substr(md5(random()::text || row_no::text), 1, 8))
+        WHERE error IS NULL
+    """))
+    for _ in range(_CODE_ROUNDS):
+        clashes = db.execute(text("""
+            UPDATE course_import s SET code = upper(substr(md5(random()::text || s.row_no::text), 1, 8))
+            WHERE s.error IS NULL AND (
+                EXISTS (SELECT 1 FROM courses c WHERE c.code = s.code)
+                OR EXISTS (SELECT 1 FROM course_import o WHERE o.code = s.code AND o.row_no < s.row_no)
+            )
+        """)).rowcount
+        if not clashes:
+            break
+    else:
+        raise BadRequest("Could not generate unique course codes; retry the import")
+
+    # xmax = 0 only for freshly inserted tuples, which separates inserts from updates
+    rows = db.execute(text("""
+        INSERT INTO courses (id, code, title, created_by, school_id, crn, semester)
+        SELECT gen_random_uuid(), code, title, coalesce(created_by, :default), school_id, crn, semester
+        FROM course_import
+        WHERE error IS NULL
+        ORDER BY row_no
+        ON CONFLICT (school_id, crn, semester) DO UPDATE SET title = EXCLUDED.title, updated_at = now()
+        RETURNING id, (xmax = 0) AS inserted
+    """), {"default": default_professor_id}).all()
+    # Existing courses only change hands when the row names a professor
+    db.execute(text("""
+        UPDATE courses c SET created_by = s.created_by
+        FROM course_import s
+        WHERE s.error IS NULL AND s.created_by IS NOT NULL AND c.created_by <> s.created_by
+          AND c.school_id = s.school_id AND c.crn = s.crn AND c.semester = s.semester
+    """))
+    result.inserted = sum(1 for row in rows if row.inserted)
+    result.updated = len(rows) - result.inserted
+    result.course_ids = [row.id for row in rows]
+    return result
+
+
+def import_roster(db: Session, stream: BinaryIO) -> ImportResult:
+    """
+    Enroll existing students into existing courses, writing both
+    enrollments and student_course_links like join_course_mvp. Students
+    already enrolled are counted under `updated`. Not committed.
+    """
+    columns = _read_header(stream, ROSTER_COLUMNS, ROSTER_REQUIRED)
+    db.execute(text("""
+        CREATE TEMP TABLE roster_import (
+            row_no bigserial,
+            school text, crn text, semester text, student_email text,
+            school_id integer, course_id uuid, user_id uuid, calendar_token text, error text
+        ) ON COMMIT DROP
+    """))
+    result = ImportResult(rows=_copy_into_staging(db, "roster_import", columns, stream))
+
+    _validate_key(db, "roster_import")
+    db.execute(text("""
+        UPDATE roster_import s SET course_id = c.id
+        FROM courses c
+        WHERE c.school_id = s.school_id AND c.crn = s.crn AND c.semester = s.semester
+    """))
+    _flag(db, "roster_import", "'no course ' || crn || ' in ' || semester || ' at this school'",
+          "course_id IS NULL")
+    db.execute(text("""
+        UPDATE roster_import s SET user_id = u.id, calendar_token = u.google_refresh_token
+        FROM users u
+        WHERE lower(u.email) = lower(trim(s.student_email)) AND u.role = :student
+    """), {"student": UserRole.STUDENT.name})
+    _flag(db, "roster_import", "'no student with email: ' || coalesce(student_email, '')", "user_id IS NULL")
+    _collect_errors(db, "roster_import", result)
+
+    inserted = db.execute(text("""
+        INSERT INTO enrollments (user_id, course_id)
+        SELECT DISTINCT user_id, course_id FROM roster_import WHERE error IS NULL
+        ON CONFLICT DO NOTHING
+    """)).rowcount
+    db.execute(text("""
+        INSERT INTO student_course_links (student_id, course_id, student_calendar_token, gcal_event_map)
+        SELECT DISTINCT ON (user_id, course_id) user_id, course_id, calendar_token, '{}'::json
+        FROM roster_import WHERE error IS NULL
+        ON CONFLICT DO NOTHING
+    """))
+    result.inserted = inserted
+    result.updated = result.rows - result.error_count - inserted
+    result.course_ids = [row.course_id for row in db.execute(text(
+        "SELECT DISTINCT course_id FROM roster_import WHERE error IS NULL"
+    ))]
+    return result
@@ -0,0 +1,104 @@
+"""
+Semester rollover: copy a course and all its events into a new term.
+
+The copy runs as one statement. Data-modifying CTEs insert the new
+course, then INSERT ... SELECT its course_events and events with every
+timestamp shifted, and RETURNING hands back the new event ids for
+reminder scheduling. Event rows never travel to the application, so a
+200-event course costs one round trip.
+
+The shift is the distance between the two terms' start dates rounded
+to whole weeks, so a Tuesday exam lands on a Tuesday.
+"""
+
+import uuid
+from datetime import timedelta
+from typing import List, Optional, Tuple
+
+from sqlalchemy import func, insert, literal, literal_column, null, select, true, union_all
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Session
+
+from ..models.course import Course
+from ..models.course_event import CourseEvent
+from ..models.event import Event
+from .partitioning import term_bounds
+
+
+def rollover_offset(source_semester: Optional[str], target_semester: str) -> timedelta:
+    """Whole weeks between the two terms' starts; ValueError if either code is unknown."""
+    if not source_semester:
+        raise ValueError("Source course has no semester; pass offset_weeks")
+    source_start, _ = term_bounds(source_semester)
+    target_start, _ = term_bounds(target_semester)
+    return timedelta(weeks=round((target_start - source_start).days / 7))
+
+
+def clone_course(
+    db: Session,
+    source_id: uuid.UUID,
+    *,
+    code: str,
+    crn: Optional[str],
+    semester: str,
+    title: Optional[str],
+    offset: timedelta,
+) -> Tuple[uuid.UUID, List[Tuple[str, uuid.UUID, object]]]:
+    """
+    Insert the copy (not committed). Returns the new course id and
+    (kind, event_id, start) for every copied event.
+    """
+    new_id = uuid.uuid4()
+    new_course = insert(Course).from_select(
+        ["id", "code", "title", "created_by", "school_id", "crn", "semester"],
+        select(
+            literal(new_id, UUID(as_uuid=True)),
+            literal(code),
+            func.coalesce(literal(title), Course.title),
+            Course.created_by,
+            Course.school_id,
+            literal(crn),
+            literal(semester),
+        ).where(Course.id == source_id),
+    ).returning(Course.id).cte("new_course")
+
+    # Joining new_course makes each copy depend on the course row (and
+    # makes the CTE render); the FK checks run at the end of the statement
+    course_events = insert(CourseEvent).from_select(
+        ["id", "course_id", "start_ts", "end_ts", "title", "category", "location"],
+        select(
+            func.gen_random_uuid(),
+            new_course.c.id,
+            CourseEvent.start_ts + offset,
+            CourseEvent.end_ts + offset,
+            CourseEvent.title,
+            CourseEvent.category,
+            CourseEvent.location,
+        ).join(new_course, true()).where(CourseEvent.course_id == source_id),
+    ).returning(CourseEvent.id, CourseEvent.start_ts).cte("copied_course_events")
+
+    events = insert(Event).from_select(
+        ["id", "course_id", "title", "dt_start", "dt_end", "category", "location", "description", "source"],
+        select(
+            func.gen_random_uuid(),
+            new_course.c.id,
+            Event.title,
+            Event.dt_start + offset,
+            Event.dt_end + offset,
+            Event.category,
+            Event.location,
+            Event.description,
+            Event.source,
+        ).join(new_course, true()).where(Event.course_id == source_id),
+    ).returning(Event.id, Event.dt_start).cte("copied_events")
+
+    copied = union_all(
+        select(literal_column("'course_event'").label("kind"), course_events.c.id, course_events.c.start_ts.label("start")),
+        select(literal_column("'event'"), events.c.id, events.c.dt_start),
+        # Always one row, so an event-less course still runs the course insert
+        select(literal_column("'course'"), new_course.c.id, null()),
+    )
+    rows = db.execute(copied).all()
+    if not any(row.kind == "course" for row in rows):
+        raise LookupError(f"Course {source_id} not found")
+    return new_id, [(row.kind, row.id, row.start) for row in rows if row.kind != "course"]
@@ -0,0 +1,155 @@
+"""
+School-wide event export: every course_event for a school and semester,
+streamed as CSV, NDJSON or iCalendar.
+
+Events are also bounded to the term's date range, so Postgres scans only
+that term's course_events partition; events a course schedules outside
+its own term are left out.
+
+Rows come through a server-side cursor (yield_per implies stream_results,
+i.e. a named cursor on psycopg2) and are formatted one batch at a time,
+so memory stays at one batch whatever the result size. The generator is
+synchronous: StreamingResponse iterates it in the threadpool, keeping the
+blocking fetches off the event loop. It opens its own replica session
+instead of using a request dependency, so the connection is held exactly
+as long as the cursor is being read.
+"""
+
+import csv
+import io
+import logging
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Optional
+
+import orjson
+from sqlalchemy import select
+
+from ..config import settings
+from ..database import read_session
+from ..models.course import Course
+from ..models.course_event import CourseEvent
+from .partitioning import term_range_filter
+
+logger = logging.getLogger(__name__)
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "ics": "text/calendar",  # Starlette appends the utf-8 charset to text/*
+}
+
+COLUMNS = [
+    CourseEvent.id,
+    Course.crn,
+    Course.code.label("course_code"),
+    Course.title.label("course_title"),
+    CourseEvent.title,
+    CourseEvent.category,
+    CourseEvent.start_ts,
+    CourseEvent.end_ts,
+    CourseEvent.location,
+]
+FIELDS = [column.key for column in COLUMNS]
+
+
+def _csv_chunk(rows: List[dict], first: bool) -> str:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=FIELDS)
+    if first:
+        writer.writeheader()
+    for row in rows:
+        writer.writerow({**row, "start_ts": row["start_ts"].isoformat(), "end_ts": row["end_ts"].isoformat()})
+    return buffer.getvalue()
+
+
+def _ndjson_chunk(rows: List[dict], first: bool) -> bytes:
+    return b"".join(orjson.dumps(row) + b"\n" for row in rows)
+
+
+def _ics_text(value: Optional[str]) -> str:
+    """RFC 5545 TEXT escaping."""
+    return (value or "").replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+
+def _ics_line(line: str) -> str:
+    """Fold at 75 octets (continuation lines start with a space)."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + "\r\n"
+    parts, start, limit = [], 0, 75
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1  # never split a UTF-8 sequence
+        parts.append(encoded[start:end].decode("utf-8"))
+        start, limit = end, 74
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _ics_time(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _ics_chunk(rows: List[dict], first: bool) -> str:
+    stamp = _ics_time(datetime.now(timezone.utc))
+    lines = []
+    for row in rows:
+        summary = f"{row['crn'] or row['course_code']}: {row['title']}"
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:{row['id']}@syllaai",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART:{_ics_time(row['start_ts'])}",
+            f"DTEND:{_ics_time(row['end_ts'])}",
+            f"SUMMARY:{_ics_text(summary)}",
+            f"CATEGORIES:{_ics_text(row['category'])}",
+            f"DESCRIPTION:{_ics_text(row['course_title'])}",
+        ]
+        if row["location"]:
+            lines.append(f"LOCATION:{_ics_text(row['location'])}")
+        lines.append("END:VEVENT")
+    return "".join(_ics_line(line) for line in lines)
+
+
+_ICS_HEADER = "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//SyllabAI//Event export//EN\r\nCALSCALE:GREGORIAN\r\n"
+_ICS_FOOTER = "END:VCALENDAR\r\n"
+
+FORMATTERS: Dict[str, Callable] = {"csv": _csv_chunk, "ndjson": _ndjson_chunk, "ics": _ics_chunk}
+
+
+def export_query(school_id: int, semester: str, category: Optional[str] = None):
+    query = (
+        select(*COLUMNS)
+        .join(Course, Course.id == CourseEvent.course_id)
+        .where(
+            Course.school_id == school_id,
+            Course.semester == semester,
+            term_range_filter(CourseEvent.start_ts, semester),
+        )
+        .order_by(Course.crn, CourseEvent.start_ts, CourseEvent.id)
+    )
+    if category:
+        query = query.where(CourseEvent.category == category)
+    return query
+
+
+def export_events(school_id: int, semester: str, fmt: str, category: Optional[str] = None) -> Iterator:
+    """Yield the export in `fmt`, one chunk per fetched batch."""
+    format_chunk = FORMATTERS[fmt]
+    query = export_query(school_id, semester, category).execution_options(yield_per=settings.export_batch_size)
+
+    if fmt == "ics":
+        yield _ICS_HEADER
+    count = 0
+    db = read_session()
+    try:
+        for batch in db.execute(query).partitions():
+            yield format_chunk([row._asdict() for row in batch], count == 0)
+            count += len(batch)
+        if fmt == "csv" and count == 0:
+            yield format_chunk([], True)  # header only
+    finally:
+        db.close()
+    if fmt == "ics":
+        yield _ICS_FOOTER
+    logger.info("Exported %d events for school %s %s as %s", count, school_id, semester, fmt)
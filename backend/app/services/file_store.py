@@ -0,0 +1,246 @@
+"""
+Content-addressed storage for uploaded syllabi.
+
+Uploads are streamed to a spool file in `file_store_chunk_bytes` chunks
+while being hashed, so a large PDF is never held in worker memory; the
+spool file is then handed to the configured backend under its sha256.
+Identical files uploaded to different courses are stored once.
+
+Backends (settings.file_store_backend):
+
+- "local" (default): <file_store_root>/ab/cd/<sha256>. The spool lives
+  under the same root so storing is an atomic rename. Downloads are
+  FileResponses, or 206 partial responses for a single byte Range.
+- "s3": any S3-compatible store (s3_bucket, optional s3_endpoint_url;
+  credentials from the usual AWS environment). Needs boto3, which is not
+  a hard dependency. Downloads redirect to a short-lived presigned URL,
+  so the bytes never pass through the API at all.
+
+Syllabus.file_url records "<backend>:<sha256>".
+"""
+
+import abc
+import hashlib
+import logging
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterator, Optional
+from urllib.parse import quote
+
+from fastapi import UploadFile
+from fastapi.responses import FileResponse, RedirectResponse, Response, StreamingResponse
+
+from ..config import settings
+from ..exceptions import BadRequest, NotFound, PayloadTooLarge
+
+logger = logging.getLogger(__name__)
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+@dataclass
+class SpooledUpload:
+    path: str
+    sha256: str
+    size: int
+
+    def discard(self) -> None:
+        """Remove the spool file unless the store has already taken it."""
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class FileStore(abc.ABC):
+    name: str
+    spool_dir: Optional[str] = None  # None: the system temp directory
+
+    @abc.abstractmethod
+    def save(self, path: str, sha256: str) -> str:
+        """Store the file at `path` (consuming it) under its hash; returns the file_url."""
+
+    @abc.abstractmethod
+    def response(self, sha256: str, filename: str, media_type: str, range_header: Optional[str]) -> Response:
+        """Download response for a stored file (`range_header` is the raw Range header, if any)."""
+
+    def url_for(self, sha256: str) -> str:
+        return f"{self.name}:{sha256}"
+
+    def save_bytes(self, data: bytes) -> str:
+        """Store an in-memory document (already bounded in size, e.g. a ZIP member)."""
+        sha256 = hashlib.sha256(data).hexdigest()
+        fd, path = tempfile.mkstemp(dir=self.spool_dir, prefix="spool-")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        try:
+            return self.save(path, sha256)
+        finally:
+            SpooledUpload(path, sha256, len(data)).discard()
+
+
+class LocalFileStore(FileStore):
+    name = "local"
+
+    def __init__(self, root: str):
+        self.root = root
+        self.spool_dir = os.path.join(root, ".spool")
+        os.makedirs(self.spool_dir, exist_ok=True)
+
+    def path_for(self, sha256: str) -> str:
+        return os.path.join(self.root, sha256[:2], sha256[2:4], sha256)
+
+    def save(self, path: str, sha256: str) -> str:
+        target = self.path_for(sha256)
+        if os.path.exists(target):
+            os.unlink(path)  # already stored (another course, or a re-upload)
+        else:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(path, target)
+        return self.url_for(sha256)
+
+    def response(self, sha256: str, filename: str, media_type: str, range_header: Optional[str]) -> Response:
+        path = self.path_for(sha256)
+        try:
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            raise NotFound("Stored file is missing")
+        headers = {"Accept-Ranges": "bytes", "ETag": f'"{sha256}"'}
+
+        try:
+            byte_range = _parse_range(range_header, size) if range_header else None
+        except ValueError:
+            return Response(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+        if byte_range is None:
+            # FileResponse streams from disk in chunks (and uses sendfile where the server supports it)
+            return FileResponse(path, media_type=media_type, filename=filename, headers=headers)
+        start, end = byte_range
+        headers.update({
+            "Content-Range": f"bytes {start}-{end}/{size}",
+            "Content-Length": str(end - start + 1),
+            "Content-Disposition": content_disposition(filename),
+        })
+        return StreamingResponse(_read_range(path, start, end), status_code=206, media_type=media_type, headers=headers)
+
+
+class S3FileStore(FileStore):
+    name = "s3"
+
+    def __init__(self, bucket: str, endpoint_url: Optional[str], prefix: str):
+        try:
+            import boto3
+        except ImportError:
+            raise RuntimeError("file_store_backend='s3' requires boto3 (pip install boto3)")
+        self.client = boto3.client("s3", endpoint_url=endpoint_url)
+        self.bucket = bucket
+        self.prefix = prefix
+
+    def _key(self, sha256: str) -> str:
+        return f"{self.prefix}{sha256}"
+
+    def save(self, path: str, sha256: str) -> str:
+        from botocore.exceptions import ClientError
+
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._key(sha256))
+        except ClientError:
+            # upload_file sends large files as a multipart upload, straight from disk
+            self.client.upload_file(path, self.bucket, self._key(sha256))
+        os.unlink(path)
+        return self.url_for(sha256)
+
+    def response(self, sha256: str, filename: str, media_type: str, range_header: Optional[str]) -> Response:
+        # The object store serves the bytes (and any Range requests) itself
+        url = self.client.generate_presigned_url(
+            "get_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": self._key(sha256),
+                "ResponseContentType": media_type,
+                "ResponseContentDisposition": content_disposition(filename),
+            },
+            ExpiresIn=settings.s3_presign_seconds,
+        )
+        return RedirectResponse(url, status_code=307)
+
+
+def content_disposition(filename: str) -> str:
+    """attachment header for a user-supplied filename, quoted the way Starlette's FileResponse does."""
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
+def _parse_range(header: str, size: int) -> Optional[tuple]:
+    """(start, end) inclusive for a single byte range; None to send the whole file, ValueError for 416."""
+    match = _RANGE_RE.match(header.strip())
+    if not match:
+        return None  # multiple or malformed ranges: a full response is always allowed
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    elif last:
+        start, end = max(size - int(last), 0), size - 1  # suffix range: the last N bytes
+    else:
+        return None
+    if start >= size or start > end:
+        raise ValueError("Range not satisfiable")
+    return start, end
+
+
+def _read_range(path: str, start: int, end: int) -> Iterator[bytes]:
+    remaining = end - start + 1
+    with open(path, "rb") as f:
+        f.seek(start)
+        while remaining > 0:
+            chunk = f.read(min(settings.file_store_chunk_bytes, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+async def spool_upload(upload: UploadFile, store: FileStore, max_bytes: int) -> SpooledUpload:
+    """Copy the upload to a spool file chunk by chunk, hashing as it goes."""
+    digest = hashlib.sha256()
+    size = 0
+    fd, path = tempfile.mkstemp(dir=store.spool_dir, prefix="spool-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            while chunk := await upload.read(settings.file_store_chunk_bytes):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise PayloadTooLarge(f"File larger than {max_bytes // (1024 * 1024)} MB")
+                digest.update(chunk)
+                f.write(chunk)
+    except BaseException:
+        os.unlink(path)
+        raise
+    if size == 0:
+        os.unlink(path)
+        raise BadRequest("Empty file")
+    return SpooledUpload(path, digest.hexdigest(), size)
+
+
+def parse_file_url(file_url: Optional[str]) -> Optional[tuple]:
+    """(backend, sha256) from a Syllabus.file_url."""
+    if not file_url or ":" not in file_url:
+        return None
+    backend, sha256 = file_url.split(":", 1)
+    return backend, sha256
+
+
+@lru_cache(maxsize=1)
+def get_file_store() -> FileStore:
+    if settings.file_store_backend == "s3":
+        if not settings.s3_bucket:
+            raise RuntimeError("file_store_backend='s3' requires S3_BUCKET")
+        return S3FileStore(settings.s3_bucket, settings.s3_endpoint_url, settings.s3_prefix)
+    if settings.file_store_backend != "local":
+        raise RuntimeError(f"Unknown file_store_backend {settings.file_store_backend!r}")
+    return LocalFileStore(settings.file_store_root)
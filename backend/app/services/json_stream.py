@@ -0,0 +1,70 @@
+"""
+Incremental parser for a streamed JSON array of objects.
+
+Completions arrive a few characters at a time. Rather than waiting for
+the closing bracket and calling json.loads on the whole reply, feed()
+tracks string/escape state and brace depth and returns each top-level
+object as soon as its closing brace arrives. Prose before the array
+(e.g. "Here are the events:") is skipped, as is a ```json fence.
+"""
+
+import json
+from typing import Any, Dict, List
+
+
+class JSONArrayStreamParser:
+    def __init__(self):
+        self._in_array = False
+        self._done = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._buffer: List[str] = []
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Consume a chunk; return the objects completed by it (possibly none)."""
+        completed = []
+        for ch in chunk:
+            if self._done:
+                break
+            if not self._in_array:
+                if ch == "[":
+                    self._in_array = True
+                continue
+
+            if self._depth == 0:
+                # Between elements: only '{' starts one, ']' ends the array
+                if ch == "{":
+                    self._depth = 1
+                    self._buffer = [ch]
+                elif ch == "]":
+                    self._done = True
+                continue
+
+            self._buffer.append(ch)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        obj = json.loads("".join(self._buffer))
+                    except json.JSONDecodeError:
+                        obj = None
+                    if isinstance(obj, dict):
+                        completed.append(obj)
+                    self._buffer = []
+        return completed
@@ -0,0 +1,74 @@
+"""
+Record/replay of LLM calls, keyed by a hash of the exact request.
+
+With settings.llm_replay_mode = "record", every completion is made live
+and its reply stored as <fixtures_dir>/<key>.json; with "replay", no
+network call is made and the stored reply is returned instead (a missing
+fixture raises FixtureMissing). The key covers model, messages and
+sampling parameters, so any prompt change needs a fresh recording.
+"""
+
+import hashlib
+import json
+import os
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+from ..config import settings
+
+MODES = ("off", "record", "replay")
+
+
+class FixtureMissing(LookupError):
+    pass
+
+
+def mode() -> str:
+    if settings.llm_replay_mode not in MODES:
+        raise ValueError(f"llm_replay_mode must be one of {MODES}, got {settings.llm_replay_mode!r}")
+    return settings.llm_replay_mode
+
+
+def fixture_key(model: str, messages: List[Dict[str, str]], params: Dict[str, Any]) -> str:
+    payload = json.dumps({"model": model, "messages": messages, "params": params}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _path(key: str) -> str:
+    return os.path.join(settings.llm_fixtures_dir, f"{key}.json")
+
+
+def load(key: str) -> Dict[str, Any]:
+    try:
+        with open(_path(key), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        raise FixtureMissing(f"No LLM fixture {key} in {settings.llm_fixtures_dir}")
+
+
+def save(key: str, model: str, content: str, usage: Optional[Dict[str, int]] = None) -> None:
+    os.makedirs(settings.llm_fixtures_dir, exist_ok=True)
+    tmp = _path(key) + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"model": model, "content": content, "usage": usage}, f, indent=2)
+    os.replace(tmp, _path(key))
+
+
+def as_completion(record: Dict[str, Any]) -> SimpleNamespace:
+    """Just enough of a ChatCompletion for callers: .choices[0].message.content and .usage"""
+    usage = record.get("usage")
+    return SimpleNamespace(
+        model=record["model"],
+        choices=[SimpleNamespace(message=SimpleNamespace(content=record["content"]))],
+        usage=SimpleNamespace(**usage) if usage else None,
+    )
+
+
+def usage_dict(usage) -> Optional[Dict[str, int]]:
+    if usage is None:
+        return None
+    return {
+        "prompt_tokens": usage.prompt_tokens,
+        "completion_tokens": usage.completion_tokens,
+        "total_tokens": usage.total_tokens,
+    }
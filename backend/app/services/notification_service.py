@@ -0,0 +1,155 @@
+"""
+Course change notifications fanned out over Redis pub/sub.
+
+Routers await publish_change() after a commit. Every API worker runs one
+ChangeBroker that holds a single Redis subscription and forwards each
+message to the local SSE connections that care about that course, so
+the cost of a change is one PUBLISH plus an in-memory dispatch per
+worker – independent of how many tabs are open.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Dict, Optional, Set, Iterable
+
+import redis
+import redis.asyncio as aioredis
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "course-changes"
+
+
+async def publish_change(course_id, kind: str, action: str, user_id=None) -> None:
+    """
+    Announce that something under a course changed.
+
+    `user_id` targets a single user (e.g. the professor who just created
+    the course) and adds the course to their live subscriptions. It is
+    only used for routing: subscribers never see it.
+    """
+    message = {"course_id": str(course_id), "kind": kind, "action": action}
+    if user_id:
+        message["user_id"] = str(user_id)
+    try:
+        from .redis_client import get_async_redis
+        await get_async_redis().publish(CHANNEL, json.dumps(message))
+    except redis.RedisError as e:
+        logger.error("Failed to publish change notification: %s", e)
+
+
+class TooManyConnections(Exception):
+    pass
+
+
+class Subscriber:
+    """One SSE connection: a bounded queue plus the courses it follows."""
+
+    def __init__(self, user_id: str, course_ids: Iterable[str], all_courses: bool = False, queue_size: int = 64):
+        self.user_id = user_id
+        self.course_ids: Set[str] = set(course_ids)
+        self.all_courses = all_courses
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        # Set when a message had to be dropped; the client is told to refetch
+        self.overflowed = False
+
+    def offer(self, message: dict) -> None:
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class ChangeBroker:
+    """Per-worker fan-out from one Redis subscription to local subscribers."""
+
+    def __init__(self, max_connections: Optional[int] = None, queue_size: Optional[int] = None):
+        self.max_connections = max_connections or settings.sse_max_connections_per_worker
+        self.queue_size = queue_size or settings.sse_queue_size
+        self.subscribers: Set[Subscriber] = set()
+        self._by_course: Dict[str, Set[Subscriber]] = {}
+        self._by_user: Dict[str, Set[Subscriber]] = {}
+        self._listener: Optional[asyncio.Task] = None
+
+    # ---- connection bookkeeping ----
+
+    def register(self, user_id, course_ids: Iterable, all_courses: bool = False) -> Subscriber:
+        if len(self.subscribers) >= self.max_connections:
+            raise TooManyConnections()
+        sub = Subscriber(str(user_id), (str(c) for c in course_ids), all_courses, self.queue_size)
+        self.subscribers.add(sub)
+        self._by_user.setdefault(sub.user_id, set()).add(sub)
+        for course_id in sub.course_ids:
+            self._by_course.setdefault(course_id, set()).add(sub)
+        self._ensure_listener()
+        return sub
+
+    def unregister(self, sub: Subscriber) -> None:
+        self.subscribers.discard(sub)
+        _discard(self._by_user, sub.user_id, sub)
+        for course_id in sub.course_ids:
+            _discard(self._by_course, course_id, sub)
+
+    def dispatch(self, message: dict) -> None:
+        course_id = message.get("course_id")
+        targets = set(self._by_course.get(course_id, ()))
+        targets.update(s for s in self.subscribers if s.all_courses)
+
+        user_id = message.get("user_id")
+        if user_id:
+            for sub in self._by_user.get(user_id, ()):
+                if course_id and course_id not in sub.course_ids:
+                    sub.course_ids.add(course_id)
+                    self._by_course.setdefault(course_id, set()).add(sub)
+                targets.add(sub)
+
+        # Routing only: don't tell everyone on the course who the change was for
+        public = {key: value for key, value in message.items() if key != "user_id"}
+        for sub in targets:
+            sub.offer(public)
+
+    # ---- Redis listener ----
+
+    def _ensure_listener(self) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+
+    async def _listen(self) -> None:
+        backoff = 1.0
+        while self.subscribers:
+            # No socket_timeout here: the subscription idles between messages
+            client = aioredis.from_url(
+                settings.redis_url, decode_responses=True, socket_connect_timeout=settings.redis_connect_timeout_seconds
+            )
+            pubsub = client.pubsub()
+            try:
+                await pubsub.subscribe(CHANNEL)
+                backoff = 1.0
+                while self.subscribers:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message and message["type"] == "message":
+                        try:
+                            self.dispatch(json.loads(message["data"]))
+                        except (ValueError, TypeError):
+                            logger.warning("Ignoring malformed change notification")
+            except (redis.RedisError, OSError) as e:
+                logger.error("Change listener lost Redis connection: %s", e)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                await pubsub.close()
+                await client.close()
+
+
+def _discard(index: Dict[str, Set[Subscriber]], key: str, sub: Subscriber) -> None:
+    subs = index.get(key)
+    if subs is not None:
+        subs.discard(sub)
+        if not subs:
+            del index[key]
+
+
+broker = ChangeBroker()
@@ -1,91 +1,361 @@
 # app/services/openai_service.py - Production OpenAI Integration
 """
 OpenAI service for syllabus parsing using GPT-4o-mini
+
+One AsyncOpenAI client is shared by the whole process so calls reuse
+pooled keep-alive connections instead of paying a TLS handshake each.
+Every call gets a per-attempt timeout and an overall deadline, 429/5xx
+and connection errors are retried with jittered exponential backoff,
+and a circuit breaker fails fast while the upstream is degraded.
 """
 
-import openai
-import os
+import asyncio
+import hashlib
 import json
+import logging
+import random
 import re
-from typing import List, Dict, Any
-from datetime import datetime, timedelta
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import AsyncIterator, List, Dict, Any, Optional
 
-def parse_syllabus_text(text: str) -> dict:
-    """
-    Parse syllabus text using OpenAI GPT-4o-mini
-    """
-    try:
-        # Get OpenAI API key
-        openai_api_key = os.getenv("OPENAI_API_KEY")
-        if not openai_api_key:
-            return {
-                "events": [],
-                "status": "error",
-                "message": "OpenAI API key not configured"
-            }
-        
-        client = openai.OpenAI(api_key=openai_api_key)
-        
-        # Enhanced prompt for better extraction
-        prompt = f"""
+import httpx
+import openai
+
+from ..config import settings
+from ..exceptions import ServiceUnavailable
+from .. import metrics
+from . import llm_replay, rate_limit
+from .json_stream import JSONArrayStreamParser
+
+logger = logging.getLogger(__name__)
+
+REPLAY_CHUNK_CHARS = 16  # replayed streams arrive in token-sized pieces
+
+SYLLABUS_PROMPT = """
         You are an expert at parsing academic syllabi. Extract all important events with dates from this syllabus.
-        
+
         Return ONLY a valid JSON array of events. Each event should have:
         - "title": descriptive name of the event
         - "date": ISO date string (YYYY-MM-DD) - if year is missing, assume 2025
         - "category": one of "Exam", "Quiz", "HW", "Project", "Presentation", "Class", "Other"
         - "location": room/building or null if not specified
-        
-        Focus on:
-        - Exams (midterms, finals, quizzes)
-        - Assignment due dates
-        - Project deadlines
-        - Presentation dates
-        - Important class dates
-        
+
+        Example format:
+        [
+          {{"title": "Midterm Exam", "date": "2025-03-15", "category": "Exam", "location": "Room 101"}},
+          {{"title": "Assignment 1 Due", "date": "2025-02-20", "category": "HW", "location": null}}
+        ]
+
         Syllabus text:
-        {text[:6000]}
+        {text}
         """
-        
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.1,
-            max_tokens=2000
+_PROMPT_HASH = hashlib.sha256(SYLLABUS_PROMPT.encode()).hexdigest()[:12]
+
+
+def prompt_version() -> str:
+    """
+    Identifies everything that shapes the model's reply besides the text:
+    stored raw output is only reused while this is unchanged.
+    """
+    return f"{settings.openai_model}/{_PROMPT_HASH}/{settings.llm_input_budget_chars}"
+
+
+class CircuitOpenError(ServiceUnavailable):
+    detail = "Syllabus parser is temporarily unavailable, please retry shortly"
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after `failure_threshold` consecutive failed calls; open
+    rejects calls for `reset_seconds`, then half-open lets one trial call
+    through: success closes the circuit, failure re-opens it.
+
+    A failure is one logical call that gave up, however many attempts it
+    made: retries back off inside the call and do not count separately.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half-open"
+        return "open"
+
+    def before_call(self) -> bool:
+        """Raise CircuitOpenError if the call may not go out; True if it is the half-open trial."""
+        state = self.state
+        if state == "open" or (state == "half-open" and self._trial_in_flight):
+            raise CircuitOpenError()
+        if state == "half-open":
+            self._trial_in_flight = True
+            return True
+        return False
+
+    @contextmanager
+    def call(self):
+        """
+        Guard one logical call, retries included. A trial that ends without
+        recording a result (cancelled, generator closed) gives the trial up
+        instead of leaving the circuit half-open with no way to close it.
+        """
+        trial = self.before_call()
+        try:
+            yield
+        finally:
+            if trial:
+                self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            logger.warning("OpenAI circuit opened after %d failures", self.failures)
+
+
+_client: Optional[openai.AsyncOpenAI] = None
+breaker = CircuitBreaker(settings.openai_breaker_failure_threshold, settings.openai_breaker_reset_seconds)
+
+
+def get_client() -> openai.AsyncOpenAI:
+    """The process-wide client; created lazily on first use."""
+    global _client
+    if _client is None:
+        _client = openai.AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            base_url=settings.openai_base_url,
+            timeout=settings.openai_timeout_seconds,
+            max_retries=0,  # retries are ours, so they share one deadline and the breaker
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=settings.openai_max_connections,
+                    max_keepalive_connections=settings.openai_max_connections,
+                ),
+                timeout=settings.openai_timeout_seconds,
+            ),
         )
-        
-        content = response.choices[0].message.content
-        
-        # Parse JSON response
+    return _client
+
+
+async def close_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
+def _is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, (openai.APITimeoutError, openai.APIConnectionError, openai.RateLimitError)):
+        return True
+    return isinstance(exc, openai.APIStatusError) and exc.status_code >= 500
+
+
+def _backoff_seconds(attempt: int, exc: Exception) -> float:
+    """Full-jitter exponential backoff, honouring Retry-After when the server sends one."""
+    response = getattr(exc, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
         try:
-            events_data = json.loads(content)
-        except json.JSONDecodeError:
-            # Try to extract JSON from text if direct parsing fails
-            json_match = re.search(r'\[.*\]', content, re.DOTALL)
-            if json_match:
-                events_data = json.loads(json_match.group(0))
-            else:
-                events_data = []
-        
-        return {
-            "events": events_data,
-            "status": "success",
-            "message": f"Extracted {len(events_data)} events"
-        }
-        
-    except Exception as e:
-        return {
-            "events": [],
-            "status": "error",
-            "message": f"Failed to parse syllabus: {str(e)}"
-        }
+            return float(retry_after)
+        except ValueError:
+            pass
+    return random.uniform(0, min(8.0, 0.5 * 2 ** attempt))
+
+
+def _retry_delay(exc: Exception, attempt: int, deadline: float) -> float:
+    """Return the backoff before the next attempt; out of retries, record the failure and re-raise."""
+    if not _is_retryable(exc):
+        # 4xx other than 429 is our fault, not upstream health: leave the breaker as it is
+        raise exc
+    delay = _backoff_seconds(attempt, exc)
+    if attempt + 1 > settings.openai_max_retries or time.monotonic() + delay >= deadline:
+        breaker.record_failure()
+        raise exc
+    logger.info("OpenAI call failed (%s), retry %d in %.2fs", type(exc).__name__, attempt + 1, delay)
+    return delay
+
+
+def _chunk_usage(chunk):
+    """The usage block of a stream's final chunk (a plain dict on this client version), if any."""
+    usage = getattr(chunk, "usage", None)
+    if isinstance(usage, dict):
+        return SimpleNamespace(**{k: usage.get(k) for k in ("prompt_tokens", "completion_tokens", "total_tokens")})
+    return usage
+
+
+def _attempt_timeout(deadline: float) -> float:
+    return min(settings.openai_timeout_seconds, max(deadline - time.monotonic(), 0.1))
+
+
+async def chat_completion(messages: List[Dict[str, str]], model: Optional[str] = None, **kwargs):
+    """
+    chat.completions.create with deadline, retries and circuit breaking.
+
+    Raises LLMQuotaExceeded (429) when the request's owner has used up a
+    daily quota, CircuitOpenError (503) when the breaker is open, and the
+    last upstream error once retries or the deadline are exhausted.
+    """
+    model = model or settings.openai_model
+    replay_mode = llm_replay.mode()
+    if replay_mode != "off":
+        key = llm_replay.fixture_key(model, messages, kwargs)
+        if replay_mode == "replay":
+            record = llm_replay.load(key)
+            if settings.llm_replay_latency_seconds:
+                # Stand-in for API latency, so concurrency shows up in offline benchmarks
+                await asyncio.sleep(settings.llm_replay_latency_seconds)
+            return llm_replay.as_completion(record)
+
+    deadline = time.monotonic() + settings.openai_deadline_seconds
+    client = get_client()
+    attempt = 0
+    with breaker.call():
+        # Charged once the call is really going upstream: not for replays or an open circuit
+        await rate_limit.charge_llm_call()
+        while True:
+            try:
+                response = await client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    timeout=_attempt_timeout(deadline),
+                    **kwargs,
+                )
+            except Exception as exc:
+                await asyncio.sleep(_retry_delay(exc, attempt, deadline))
+                attempt += 1
+                continue
+            breaker.record_success()
+            metrics.record_token_usage(model, getattr(response, "usage", None))
+            if replay_mode == "record":
+                llm_replay.save(
+                    key, model, response.choices[0].message.content,
+                    llm_replay.usage_dict(getattr(response, "usage", None)),
+                )
+            return response
+
+
+async def stream_chat_completion(
+    messages: List[Dict[str, str]], model: Optional[str] = None, **kwargs
+) -> AsyncIterator[str]:
+    """
+    Streaming variant of chat_completion(): yields content deltas as they arrive.
+
+    Failures before the first delta are retried like chat_completion();
+    once output has been yielded a failure is raised to the caller, since
+    replaying the stream would duplicate what it already consumed.
+    """
+    model = model or settings.openai_model
+    replay_mode = llm_replay.mode()
+    if replay_mode != "off":
+        # Same key as the non-streaming call: one recording serves both
+        key = llm_replay.fixture_key(model, messages, kwargs)
+        if replay_mode == "replay":
+            content = llm_replay.load(key)["content"]
+            for i in range(0, len(content), REPLAY_CHUNK_CHARS):
+                yield content[i:i + REPLAY_CHUNK_CHARS]
+            return
+
+    deadline = time.monotonic() + settings.openai_deadline_seconds
+    client = get_client()
+    attempt = 0
+    yielded = False
+    received: List[str] = []
+    usage = None
+    with breaker.call():
+        await rate_limit.charge_llm_call()
+        while True:
+            try:
+                stream = await client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    stream=True,
+                    timeout=_attempt_timeout(deadline),
+                    # Ask for a final usage chunk, so streamed calls show up in the token metrics too
+                    extra_body={"stream_options": {"include_usage": True}},
+                    **kwargs,
+                )
+                async for chunk in stream:
+                    usage = _chunk_usage(chunk) or usage
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        yielded = True
+                        received.append(delta)
+                        yield delta
+            except Exception as exc:
+                if yielded:
+                    if _is_retryable(exc):
+                        breaker.record_failure()
+                    raise
+                await asyncio.sleep(_retry_delay(exc, attempt, deadline))
+                attempt += 1
+                continue
+            breaker.record_success()
+            metrics.record_token_usage(model, usage)
+            if replay_mode == "record":
+                llm_replay.save(key, model, "".join(received), llm_replay.usage_dict(usage))
+            return
+
+
+def build_prompt(text: str) -> str:
+    return SYLLABUS_PROMPT.format(text=text[:settings.llm_input_budget_chars])
+
+
+def parse_events_json(content: str) -> List[Dict[str, Any]]:
+    """Parse the model's reply, tolerating prose around the JSON array."""
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError:
+        # Try to extract JSON from text if direct parsing fails
+        json_match = re.search(r'\[.*\]', content, re.DOTALL)
+        if json_match:
+            return json.loads(json_match.group(0))
+        return []
+
+
+async def complete_syllabus(syllabus_text: str) -> str:
+    """The model's unparsed reply for the syllabus prompt."""
+    response = await chat_completion(
+        [{"role": "user", "content": build_prompt(syllabus_text)}],
+        temperature=0.1,
+        max_tokens=2000,
+    )
+    return response.choices[0].message.content
+
 
 async def parse_syllabus_with_openai(syllabus_text: str) -> List[Dict[str, Any]]:
     """
-    Async version for use in FastAPI endpoints
+    Extract raw event dicts ({title, date, category, location}) from syllabus text
+    """
+    return parse_events_json(await complete_syllabus(syllabus_text))
+
+
+async def stream_syllabus_events(syllabus_text: str) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Like parse_syllabus_with_openai(), but yields each raw event dict as soon
+    as its JSON object is complete in the streamed reply.
     """
-    result = parse_syllabus_text(syllabus_text)
-    if result["status"] == "success":
-        return result["events"]
-    else:
-        raise Exception(result["message"])
\ No newline at end of file
+    parser = JSONArrayStreamParser()
+    async for delta in stream_chat_completion(
+        [{"role": "user", "content": build_prompt(syllabus_text)}],
+        temperature=0.1,
+        max_tokens=2000,
+    ):
+        for event in parser.feed(delta):
+            yield event
@@ -0,0 +1,201 @@
+"""
+Term-based range partitioning of the event tables.
+
+course_events (by start_ts) and events (by dt_start) are declaratively
+partitioned with one partition per academic term plus a DEFAULT
+partition, so the hot indexes only cover recent terms and queries that
+bound the start time touch a single partition.
+
+Terms use the same codes as courses.semester ("2025SP"):
+
+    WI  Jan 1  - Jan 15  (winter intersession)
+    SP  Jan 15 - Jun 1
+    SU  Jun 1  - Aug 15
+    FA  Aug 15 - Jan 1
+
+ensure_partitions() creates partitions for the current and upcoming
+terms, and for any term whose rows have landed in the DEFAULT partition
+(moving them over). archive_partitions() detaches partitions older than
+N terms into the `archive` schema, where they stay queryable for audits
+but no longer sit under the live tables. A term archived before keeps
+its one archive table: rows that arrived for it since are appended.
+
+    python -m app.services.partitioning ensure
+    python -m app.services.partitioning archive [--keep-terms 6]
+"""
+
+import argparse
+import logging
+import re
+from datetime import date, datetime, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# partitioned table -> its partition key column
+PARTITIONED_TABLES = {"course_events": "start_ts", "events": "dt_start"}
+ARCHIVE_SCHEMA = "archive"
+
+TERM_STARTS = (("WI", 1, 1), ("SP", 1, 15), ("SU", 6, 1), ("FA", 8, 15))
+TERM_RE = re.compile(r"^(\d{4})(WI|SP|SU|FA)$")
+SEMESTER_PATTERN = re.compile(r"(20\d{2})(SP|SU|FA|WI)")  # a term code anywhere in free text
+_LOCK_KEY = "partition-maintenance"
+
+
+def term_for(day: date) -> str:
+    code = TERM_STARTS[0][0]
+    for name, month, start_day in TERM_STARTS:
+        if (day.month, day.day) >= (month, start_day):
+            code = name
+    return f"{day.year}{code}"
+
+
+def term_bounds(term: str) -> Tuple[datetime, datetime]:
+    """[start, end) of a term as UTC datetimes; ValueError for unknown codes."""
+    match = TERM_RE.match(term.upper())
+    if not match:
+        raise ValueError(f"Not a partitioned term code: {term!r}")
+    year, code = int(match.group(1)), match.group(2)
+    index = [name for name, _, _ in TERM_STARTS].index(code)
+    _, month, day = TERM_STARTS[index]
+    start = datetime(year, month, day, tzinfo=timezone.utc)
+    if index + 1 < len(TERM_STARTS):
+        _, month, day = TERM_STARTS[index + 1]
+        end = datetime(year, month, day, tzinfo=timezone.utc)
+    else:
+        _, month, day = TERM_STARTS[0]
+        end = datetime(year + 1, month, day, tzinfo=timezone.utc)
+    return start, end
+
+
+def _term_ordinal(term: str) -> int:
+    """Terms numbered consecutively, so ordering and arithmetic are plain integers."""
+    match = TERM_RE.match(term.upper())
+    names = [name for name, _, _ in TERM_STARTS]
+    return int(match.group(1)) * len(names) + names.index(match.group(2))
+
+
+def shift_term(term: str, terms: int) -> str:
+    """The term `terms` terms after (or, if negative, before) `term`."""
+    names = [name for name, _, _ in TERM_STARTS]
+    index = _term_ordinal(term) + terms
+    return f"{index // len(names)}{names[index % len(names)]}"
+
+
+def partition_name(table: str, term: str) -> str:
+    return f"{table}_{term.lower()}"
+
+
+def _partitions(conn: Connection, table: str) -> List[str]:
+    rows = conn.execute(text("""
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        JOIN pg_class p ON p.oid = i.inhparent
+        WHERE p.relname = :table
+    """), {"table": table})
+    return [row.relname for row in rows]
+
+
+def _table_exists(conn: Connection, schema: str, name: str) -> bool:
+    return conn.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": f"{schema}.{name}"}).scalar()
+
+
+def _create_partition(conn: Connection, table: str, column: str, term: str) -> None:
+    """Create and attach the partition for `term`, moving its rows out of DEFAULT first."""
+    name = partition_name(table, term)
+    start, end = term_bounds(term)
+    conn.execute(text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    # ATTACH fails if DEFAULT still holds rows in the new range
+    conn.execute(text(f"""
+        WITH moved AS (
+            DELETE FROM {table}_default WHERE {column} >= :start AND {column} < :end RETURNING *
+        )
+        INSERT INTO {name} SELECT * FROM moved
+    """), {"start": start, "end": end})
+    conn.execute(text(
+        f"ALTER TABLE {table} ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    ))
+    logger.info("Created partition %s", name)
+
+
+def ensure_partitions(conn: Connection, terms_ahead: Optional[int] = None, today: Optional[date] = None) -> None:
+    """Partitions for the current term, `terms_ahead` upcoming terms and any term stranded in DEFAULT."""
+    terms_ahead = settings.partition_terms_ahead if terms_ahead is None else terms_ahead
+    current = term_for(today or datetime.now(timezone.utc).date())
+    # Several workers run this at startup; serialise them
+    conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:key))"), {"key": _LOCK_KEY})
+
+    for table, column in PARTITIONED_TABLES.items():
+        existing = set(_partitions(conn, table))
+        wanted = {shift_term(current, n) for n in range(terms_ahead + 1)}
+        low, high = conn.execute(text(f"SELECT min({column}), max({column}) FROM {table}_default")).one()
+        if low is not None:
+            first = term_for(low.astimezone(timezone.utc).date())
+            last = term_for(high.astimezone(timezone.utc).date())
+            wanted.update(shift_term(first, n) for n in range(_term_ordinal(last) - _term_ordinal(first) + 1))
+        for term in sorted(wanted, key=_term_ordinal):
+            if partition_name(table, term) not in existing:
+                _create_partition(conn, table, column, term)
+
+
+def archive_partitions(conn: Connection, keep_terms: Optional[int] = None, today: Optional[date] = None) -> List[str]:
+    """Detach partitions for terms older than the last `keep_terms` into the archive schema."""
+    keep_terms = settings.partition_keep_terms if keep_terms is None else keep_terms
+    oldest_kept = shift_term(term_for(today or datetime.now(timezone.utc).date()), -keep_terms)
+    cutoff, _ = term_bounds(oldest_kept)
+    conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:key))"), {"key": _LOCK_KEY})
+    conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+
+    archived = []
+    for table in PARTITIONED_TABLES:
+        prefix = f"{table}_"
+        for name in _partitions(conn, table):
+            term = name[len(prefix):].upper()
+            if not TERM_RE.match(term) or term_bounds(term)[1] > cutoff:
+                continue
+            conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+            if _table_exists(conn, ARCHIVE_SCHEMA, name):
+                # Archived before, then late rows recreated the partition
+                conn.execute(text(f"INSERT INTO {ARCHIVE_SCHEMA}.{name} SELECT * FROM {name}"))
+                conn.execute(text(f"DROP TABLE {name}"))
+            else:
+                conn.execute(text(f"ALTER TABLE {name} SET SCHEMA {ARCHIVE_SCHEMA}"))
+            archived.append(name)
+            logger.info("Archived partition %s to %s", name, ARCHIVE_SCHEMA)
+    return archived
+
+
+def term_range_filter(column, term: str):
+    """`column` bounded to `term`, so the planner prunes to one partition."""
+    start, end = term_bounds(term)
+    return (column >= start) & (column < end)
+
+
+def main() -> None:
+    from ..database import engine
+
+    parser = argparse.ArgumentParser(description="Event table partition maintenance")
+    sub = parser.add_subparsers(dest="command", required=True)
+    ensure = sub.add_parser("ensure")
+    ensure.add_argument("--terms-ahead", type=int, default=None)
+    archive = sub.add_parser("archive")
+    archive.add_argument("--keep-terms", type=int, default=None)
+    args = parser.parse_args()
+
+    with engine.begin() as conn:
+        if args.command == "ensure":
+            ensure_partitions(conn, args.terms_ahead)
+        else:
+            names = archive_partitions(conn, args.keep_terms)
+            print(f"Archived {len(names)} partition(s): {', '.join(names) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
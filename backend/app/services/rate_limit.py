@@ -0,0 +1,310 @@
+"""
+Per-user rate limits and daily LLM call quotas.
+
+- Rate limits are token buckets keyed by user id: a bucket holds up to
+  `burst` tokens, refills at `per_minute` tokens a minute, and each
+  request takes one. Refill and take happen in one Lua script, with
+  Redis's clock, so every worker sees the same bucket.
+- LLM quotas count real LLM calls per UTC day, for the user and for their
+  school. Users have no school column and students upload outside any
+  course, so the school is the user's email domain. One Lua script
+  checks both counters and increments both, so concurrent calls on
+  different workers cannot overshoot either limit.
+
+Endpoints bind the caller with `bind_llm_owner` (see the `llm_quota`
+dependency); openai_service charges the bound owner when a call is about
+to go upstream, so cache hits, reused replies, single-flight followers,
+replayed fixtures and calls refused by the open circuit cost nothing.
+Calls with no bound owner (admin batches, benchmarks) are not charged.
+
+If Redis is unreachable, each process falls back to in-memory state
+(retrying Redis every REDIS_RETRY_SECONDS): limits then hold per worker
+instead of across them.
+"""
+
+import logging
+import math
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+
+import redis
+
+from ..config import settings
+from ..exceptions import TooManyRequests
+
+logger = logging.getLogger(__name__)
+
+REDIS_RETRY_SECONDS = 5.0
+LOCAL_PRUNE_SECONDS = 60.0  # how often the fallback drops buckets that have refilled
+
+# KEYS[1] bucket; ARGV burst, tokens per ms -> {allowed, tokens left (string: Lua floats truncate)}
+TOKEN_BUCKET_LUA = """
+local burst = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil((burst - tokens) / rate) + 1000)
+return {allowed, tostring(tokens)}
+"""
+
+# KEYS user counter, school counter; ARGV user limit, school limit, ttl -> {allowed, user used, school used}
+LLM_QUOTA_LUA = """
+local user_used = tonumber(redis.call('GET', KEYS[1]) or '0')
+local school_used = tonumber(redis.call('GET', KEYS[2]) or '0')
+if user_used >= tonumber(ARGV[1]) or school_used >= tonumber(ARGV[2]) then
+    return {0, user_used, school_used}
+end
+user_used = redis.call('INCR', KEYS[1])
+school_used = redis.call('INCR', KEYS[2])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+return {1, user_used, school_used}
+"""
+
+
+@dataclass(frozen=True)
+class Limit:
+    per_minute: float
+    burst: int
+
+
+def _limits() -> Dict[str, Limit]:
+    return {
+        "syllabus": Limit(settings.rate_limit_syllabus_per_minute, settings.rate_limit_syllabus_burst),
+    }
+
+
+@dataclass
+class Decision:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_seconds: int  # until the bucket is full again
+    retry_after: int  # until the next token, when denied
+
+    def headers(self) -> Dict[str, str]:
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(self.reset_seconds),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(self.retry_after)
+        return headers
+
+
+@dataclass(frozen=True)
+class LLMOwner:
+    user_id: str
+    school: str
+
+
+@dataclass
+class QuotaUsage:
+    allowed: bool
+    user_used: int
+    school_used: int
+
+    def headers(self) -> Dict[str, str]:
+        headers = {
+            "X-LLM-Quota-Limit": str(settings.llm_daily_quota_per_user),
+            "X-LLM-Quota-Remaining": str(max(settings.llm_daily_quota_per_user - self.user_used, 0)),
+            "X-LLM-Quota-Reset": str(_seconds_to_midnight()),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = headers["X-LLM-Quota-Reset"]
+        return headers
+
+
+class LLMQuotaExceeded(TooManyRequests):
+    detail = "Daily syllabus parsing quota reached, try again tomorrow"
+
+
+_llm_owner: ContextVar[Optional[LLMOwner]] = ContextVar("llm_owner", default=None)
+
+
+def bind_llm_owner(user) -> LLMOwner:
+    """Charge LLM calls made in the current request to `user` (call from an async dependency)."""
+    domain = user.email.rsplit("@", 1)[-1].lower() if user.email else "unknown"
+    owner = LLMOwner(str(user.id), domain)
+    _llm_owner.set(owner)
+    return owner
+
+
+def _decision(limit: Limit, allowed: bool, tokens: float) -> Decision:
+    per_second = limit.per_minute / 60
+    return Decision(
+        allowed=allowed,
+        limit=limit.burst,
+        remaining=int(tokens),
+        reset_seconds=math.ceil((limit.burst - tokens) / per_second),
+        retry_after=max(1, math.ceil((1 - tokens) / per_second)),
+    )
+
+
+def _day() -> str:
+    return datetime.now(timezone.utc).strftime("%Y%m%d")
+
+
+def _seconds_to_midnight() -> int:
+    now = datetime.now(timezone.utc)
+    midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return math.ceil((midnight - now).total_seconds())
+
+
+def _quota_keys(owner: LLMOwner) -> Tuple[str, str]:
+    day = _day()
+    return f"llmquota:{day}:user:{owner.user_id}", f"llmquota:{day}:school:{owner.school}"
+
+
+class LocalLimiter:
+    """In-process fallback with the same semantics as the Lua scripts."""
+
+    def __init__(self):
+        # key -> (tokens, monotonic ts, monotonic time the bucket is full again)
+        self.buckets: Dict[str, Tuple[float, float, float]] = {}
+        self.counters: Dict[str, int] = {}
+        self.day = _day()
+        self._pruned_at = time.monotonic()
+
+    def _prune(self, now: float) -> None:
+        # A full bucket is the same as no bucket, so drop those (as PEXPIRE does in Redis)
+        if now - self._pruned_at < LOCAL_PRUNE_SECONDS:
+            return
+        self._pruned_at = now
+        self.buckets = {key: state for key, state in self.buckets.items() if state[2] > now}
+
+    def take(self, key: str, limit: Limit, now: Optional[float] = None) -> Tuple[bool, float]:
+        now = time.monotonic() if now is None else now
+        self._prune(now)
+        per_second = limit.per_minute / 60
+        tokens, ts, _ = self.buckets.get(key, (limit.burst, now, now))
+        tokens = min(limit.burst, tokens + (now - ts) * per_second)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self.buckets[key] = (tokens, now, now + (limit.burst - tokens) / per_second)
+        return allowed, tokens
+
+    def charge(self, user_key: str, school_key: str, user_limit: int, school_limit: int) -> Tuple[bool, int, int]:
+        if self.day != _day():
+            self.counters.clear()  # keys carry the day; drop yesterday's
+            self.day = _day()
+        user_used = self.counters.get(user_key, 0)
+        school_used = self.counters.get(school_key, 0)
+        if user_used >= user_limit or school_used >= school_limit:
+            return False, user_used, school_used
+        self.counters[user_key] = user_used + 1
+        self.counters[school_key] = school_used + 1
+        return True, user_used + 1, school_used + 1
+
+
+class RateLimiter:
+    def __init__(self, client=None):
+        self._client = client
+        self._scripts = None
+        self.local = LocalLimiter()
+        self._redis_down_until = 0.0
+
+    def _use_redis(self) -> bool:
+        return time.monotonic() >= self._redis_down_until
+
+    def _fall_back(self, error: Exception) -> None:
+        # Don't pay a failed round trip on every request while Redis is down
+        if self._redis_down_until == 0.0:
+            logger.warning("Rate limit Redis unavailable, limiting per worker: %s", error)
+        self._redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+
+    def _recovered(self) -> None:
+        if self._redis_down_until:
+            logger.info("Rate limit Redis reachable again")
+            self._redis_down_until = 0.0
+
+    @property
+    def client(self):
+        if self._client is None:
+            from .redis_client import get_async_redis
+            self._client = get_async_redis()
+        return self._client
+
+    @property
+    def scripts(self):
+        if self._scripts is None:
+            self._scripts = (
+                self.client.register_script(TOKEN_BUCKET_LUA),
+                self.client.register_script(LLM_QUOTA_LUA),
+            )
+        return self._scripts
+
+    async def take(self, bucket: str, user_id) -> Decision:
+        """Take one token from the user's `bucket`."""
+        limit = _limits()[bucket]
+        key = f"ratelimit:{bucket}:{user_id}"
+        if self._use_redis():
+            try:
+                allowed, tokens = await self.scripts[0](keys=[key], args=[limit.burst, limit.per_minute / 60000])
+                self._recovered()
+                return _decision(limit, bool(int(allowed)), float(tokens))
+            except redis.RedisError as e:
+                self._fall_back(e)
+        allowed, tokens = self.local.take(key, limit)
+        return _decision(limit, allowed, tokens)
+
+    async def charge_llm_call(self, owner: LLMOwner) -> QuotaUsage:
+        """Count one LLM call against the owner's daily quotas, unless either is used up."""
+        user_key, school_key = _quota_keys(owner)
+        user_limit, school_limit = settings.llm_daily_quota_per_user, settings.llm_daily_quota_per_school
+        if self._use_redis():
+            try:
+                allowed, user_used, school_used = await self.scripts[1](
+                    keys=[user_key, school_key],
+                    args=[user_limit, school_limit, _seconds_to_midnight() + 3600],
+                )
+                self._recovered()
+                return QuotaUsage(bool(int(allowed)), int(user_used), int(school_used))
+            except redis.RedisError as e:
+                self._fall_back(e)
+        return QuotaUsage(*self.local.charge(user_key, school_key, user_limit, school_limit))
+
+    async def llm_usage(self, owner: LLMOwner) -> QuotaUsage:
+        """Today's usage without charging; `allowed` is whether another call would be."""
+        user_key, school_key = _quota_keys(owner)
+        user_used, school_used = self.local.counters.get(user_key), self.local.counters.get(school_key)
+        if self._use_redis():
+            try:
+                user_used, school_used = await self.client.mget(user_key, school_key)
+            except redis.RedisError as e:
+                self._fall_back(e)
+        user_used, school_used = int(user_used or 0), int(school_used or 0)
+        allowed = (
+            user_used < settings.llm_daily_quota_per_user
+            and school_used < settings.llm_daily_quota_per_school
+        )
+        return QuotaUsage(allowed, user_used, school_used)
+
+
+limiter = RateLimiter()
+
+
+async def charge_llm_call() -> None:
+    """Called by openai_service before every upstream LLM call; raises LLMQuotaExceeded (429)."""
+    owner = _llm_owner.get()
+    if owner is None or not settings.rate_limit_enabled:
+        return
+    usage = await limiter.charge_llm_call(owner)
+    if not usage.allowed:
+        logger.info("LLM quota reached for user %s / school %s", owner.user_id, owner.school)
+        raise LLMQuotaExceeded(headers=usage.headers())
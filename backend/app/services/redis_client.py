@@ -0,0 +1,34 @@
+"""
+Shared Redis connection for the API process.
+
+Both clients time out connects and commands, so a Redis that is down or
+hung surfaces as a RedisError (which callers already handle) within a
+couple of seconds instead of blocking a request or a worker thread.
+"""
+
+from functools import lru_cache
+
+import redis
+import redis.asyncio as aioredis
+
+from ..config import settings
+
+
+def _options() -> dict:
+    return {
+        "decode_responses": True,
+        "socket_timeout": settings.redis_socket_timeout_seconds,
+        "socket_connect_timeout": settings.redis_connect_timeout_seconds,
+    }
+
+
+@lru_cache(maxsize=1)
+def get_redis() -> redis.Redis:
+    """One pooled client per process; safe to share between threads."""
+    return redis.Redis.from_url(settings.redis_url, **_options())
+
+
+@lru_cache(maxsize=1)
+def get_async_redis() -> aioredis.Redis:
+    """Asyncio counterpart for code running on the event loop."""
+    return aioredis.Redis.from_url(settings.redis_url, **_options())
@@ -0,0 +1,321 @@
+"""
+Deadline reminders indexed in a Redis sorted set.
+
+Each (event, offset) pair is one member of REMINDER_KEY scored by the
+unix time it becomes due, so finding due work is a range query over the
+head of the set rather than a scan of every event × student. Hooks in
+the course/event routers keep the index in sync; a worker thread on the
+elected leader pops due items in batches and hands them to a delivery.
+A batch whose delivery fails is put back for the next tick; reminders
+that keep failing are moved to DEAD_KEY after `reminder_max_attempts`.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+import uuid
+from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional, Callable
+
+import httpx
+import redis
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+REMINDER_KEY = "reminders:due"
+ATTEMPTS_KEY = "reminders:attempts"  # member -> failed deliveries so far
+DEAD_KEY = "reminders:dead"  # members given up on, scored by due time
+LEADER_KEY = "reminders:leader"
+
+
+@dataclass
+class Reminder:
+    kind: str  # "course_event" or "event"
+    event_id: str
+    offset_minutes: int
+    due_at: float
+
+    @property
+    def member(self) -> str:
+        return _member(self.kind, self.event_id, self.offset_minutes)
+
+    @classmethod
+    def from_member(cls, member: str, score: float) -> "Reminder":
+        kind, event_id, offset = member.split(":")
+        return cls(kind=kind, event_id=event_id, offset_minutes=int(offset), due_at=score)
+
+
+def _member(kind: str, event_id, offset_minutes: int) -> str:
+    return f"{kind}:{event_id}:{offset_minutes}"
+
+
+def _timestamp(dt: datetime) -> float:
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+class ReminderScheduler:
+    """Maintains the sorted-set index of upcoming reminders."""
+
+    def __init__(self, client: redis.Redis, offsets_minutes: Optional[List[int]] = None):
+        self.redis = client
+        self.offsets = offsets_minutes if offsets_minutes is not None else settings.reminder_offsets_minutes
+
+    def schedule(self, kind: str, event_id, start_ts: datetime, now: Optional[float] = None) -> int:
+        """(Re)index every offset for one event; past-due offsets are dropped."""
+        return self.schedule_many(kind, [(event_id, start_ts)], now=now)
+
+    def schedule_many(self, kind: str, events: Iterable[tuple], now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        pipe = self.redis.pipeline(transaction=False)
+        scheduled = 0
+        for event_id, start_ts in events:
+            start = _timestamp(start_ts)
+            for offset in self.offsets:
+                member = _member(kind, event_id, offset)
+                due = start - offset * 60
+                if due > now:
+                    pipe.zadd(REMINDER_KEY, {member: due})
+                    scheduled += 1
+                else:
+                    pipe.zrem(REMINDER_KEY, member)
+        pipe.execute()
+        return scheduled
+
+    def cancel(self, kind: str, event_ids: Iterable) -> None:
+        members = [_member(kind, event_id, offset) for event_id in event_ids for offset in self.offsets]
+        if members:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.zrem(REMINDER_KEY, *members)
+            pipe.hdel(ATTEMPTS_KEY, *members)
+            pipe.execute()
+
+    def pop_due(self, now: Optional[float] = None, limit: int = 100) -> List[Reminder]:
+        """
+        Claim up to `limit` due reminders.
+
+        ZREM is the claim: only the caller whose ZREM removed the member
+        delivers it, so even two workers racing on the same batch never
+        double-fire.
+        """
+        now = time.time() if now is None else now
+        candidates = self.redis.zrangebyscore(REMINDER_KEY, "-inf", now, start=0, num=limit, withscores=True)
+        if not candidates:
+            return []
+        pipe = self.redis.pipeline(transaction=False)
+        for member, _ in candidates:
+            pipe.zrem(REMINDER_KEY, member)
+        removed = pipe.execute()
+        return [
+            Reminder.from_member(member, score)
+            for (member, score), claimed in zip(candidates, removed)
+            if claimed
+        ]
+
+    def delivered(self, reminders: List[Reminder]) -> None:
+        self.redis.hdel(ATTEMPTS_KEY, *[r.member for r in reminders])
+
+    def requeue_failed(self, reminders: List[Reminder], max_attempts: int) -> List[Reminder]:
+        """
+        Put a failed batch back for the next tick, except reminders that
+        have now failed `max_attempts` times: those go to DEAD_KEY.
+        Returns the dead-lettered reminders.
+        """
+        pipe = self.redis.pipeline(transaction=False)
+        for reminder in reminders:
+            pipe.hincrby(ATTEMPTS_KEY, reminder.member, 1)
+        attempts = pipe.execute()
+        retry = [r for r, n in zip(reminders, attempts) if n < max_attempts]
+        dead = [r for r, n in zip(reminders, attempts) if n >= max_attempts]
+        pipe = self.redis.pipeline(transaction=False)
+        if retry:
+            pipe.zadd(REMINDER_KEY, {r.member: r.due_at for r in retry})
+        if dead:
+            pipe.zadd(DEAD_KEY, {r.member: r.due_at for r in dead})
+            pipe.hdel(ATTEMPTS_KEY, *[r.member for r in dead])
+        pipe.execute()
+        return dead
+
+
+class LeaderElection:
+    """Lease-based leader election: SET NX PX, renewed only by the holder."""
+
+    def __init__(self, client: redis.Redis, key: str = LEADER_KEY, ttl_seconds: Optional[int] = None):
+        self.redis = client
+        self.key = key
+        self.ttl_ms = int((ttl_seconds or settings.reminder_leader_ttl_seconds) * 1000)
+        self.identity = uuid.uuid4().hex
+
+    def acquire(self) -> bool:
+        if self.redis.set(self.key, self.identity, nx=True, px=self.ttl_ms):
+            return True
+        # Renew our own lease; WATCH makes the check-and-extend atomic
+        with self.redis.pipeline() as pipe:
+            try:
+                pipe.watch(self.key)
+                if pipe.get(self.key) != self.identity:
+                    pipe.unwatch()
+                    return False
+                pipe.multi()
+                pipe.pexpire(self.key, self.ttl_ms)
+                pipe.execute()
+                return True
+            except redis.WatchError:
+                return False
+
+    def release(self) -> None:
+        with self.redis.pipeline() as pipe:
+            try:
+                pipe.watch(self.key)
+                if pipe.get(self.key) == self.identity:
+                    pipe.multi()
+                    pipe.delete(self.key)
+                    pipe.execute()
+                else:
+                    pipe.unwatch()
+            except redis.WatchError:
+                pass
+
+
+# ---------------------------------------------------------------------------
+# Delivery
+# ---------------------------------------------------------------------------
+
+class LogDelivery:
+    """Local stub: writes each reminder to the log."""
+
+    def __call__(self, reminders: List[Reminder]) -> None:
+        for reminder in reminders:
+            logger.info("Reminder due: %s %s (%d min before)", reminder.kind, reminder.event_id, reminder.offset_minutes)
+
+
+class WebhookDelivery:
+    """POSTs each batch as JSON to a webhook URL."""
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        self.url = url
+        self.timeout = timeout
+
+    def __call__(self, reminders: List[Reminder]) -> None:
+        payload = {"reminders": [asdict(r) for r in reminders]}
+        httpx.post(self.url, content=json.dumps(payload), timeout=self.timeout,
+                   headers={"Content-Type": "application/json"}).raise_for_status()
+
+
+def default_delivery() -> Callable[[List[Reminder]], None]:
+    if settings.reminder_webhook_url:
+        return WebhookDelivery(settings.reminder_webhook_url)
+    return LogDelivery()
+
+
+# ---------------------------------------------------------------------------
+# Worker
+# ---------------------------------------------------------------------------
+
+class ReminderWorker:
+    """Background thread: while leader, pop due reminders in batches and deliver them."""
+
+    def __init__(
+        self,
+        scheduler: ReminderScheduler,
+        election: LeaderElection,
+        delivery: Optional[Callable[[List[Reminder]], None]] = None,
+        poll_seconds: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+    ):
+        self.scheduler = scheduler
+        self.election = election
+        self.delivery = delivery or default_delivery()
+        self.poll_seconds = poll_seconds or settings.reminder_poll_seconds
+        self.batch_size = batch_size or settings.reminder_batch_size
+        self.max_attempts = max_attempts or settings.reminder_max_attempts
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def run_once(self, now: Optional[float] = None) -> int:
+        """One scheduling tick. Returns the number of reminders delivered."""
+        if not self.election.acquire():
+            return 0
+        delivered = 0
+        while True:
+            batch = self.scheduler.pop_due(now=now, limit=self.batch_size)
+            if not batch:
+                return delivered
+            try:
+                self.delivery(batch)
+            except Exception as e:
+                # Put the batch back so the next tick retries it
+                dead = self.scheduler.requeue_failed(batch, self.max_attempts)
+                logger.error("Reminder delivery failed, requeueing %d: %s", len(batch) - len(dead), e)
+                if dead:
+                    logger.error("Giving up on %d reminders after %d attempts (moved to %s)",
+                                 len(dead), self.max_attempts, DEAD_KEY)
+                return delivered
+            self.scheduler.delivered(batch)
+            delivered += len(batch)
+            if len(batch) < self.batch_size:
+                return delivered
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except redis.RedisError as e:
+                logger.error("Reminder worker error: %s", e)
+            self._stop.wait(self.poll_seconds)
+        self.election.release()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._loop, name="reminder-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.poll_seconds + 1)
+
+
+# ---------------------------------------------------------------------------
+# Router hooks – never let Redis trouble fail a write
+# ---------------------------------------------------------------------------
+
+def _scheduler() -> ReminderScheduler:
+    from .redis_client import get_redis
+    return ReminderScheduler(get_redis())
+
+
+async def schedule_reminders(kind: str, events: Iterable[tuple]) -> None:
+    """Index reminders for (event_id, start_ts) pairs after a commit; no-op unless reminders are enabled."""
+    events = list(events)
+    if not settings.reminders_enabled or not events:
+        return
+    try:
+        # The scheduler is sync (the worker thread shares it); keep its round trips off the event loop
+        await asyncio.to_thread(_scheduler().schedule_many, kind, events)
+    except redis.RedisError as e:
+        logger.error("Failed to schedule reminders: %s", e)
+
+
+async def cancel_reminders(kind: str, event_ids: Iterable) -> None:
+    event_ids = list(event_ids)
+    if not settings.reminders_enabled or not event_ids:
+        return
+    try:
+        await asyncio.to_thread(_scheduler().cancel, kind, event_ids)
+    except redis.RedisError as e:
+        logger.error("Failed to cancel reminders: %s", e)
+
+
+def start_worker() -> ReminderWorker:
+    from .redis_client import get_redis
+    client = get_redis()
+    worker = ReminderWorker(ReminderScheduler(client), LeaderElection(client))
+    worker.start()
+    return worker
@@ -0,0 +1,156 @@
+"""
+Single-flight: collapse concurrent calls with the same key into one.
+
+When a syllabus link is shared, dozens of students upload the same file
+within seconds. Without coalescing each upload pays for its own LLM call
+before any of them finishes. Here, the first caller for a key does the
+work and everyone else awaits its result:
+
+- within a worker, followers await the leader's asyncio task;
+- across workers, the leader holds a Redis lock (SET NX PX) and publishes
+  its result under a short-lived key that followers poll for.
+
+RedisSingleFlight.stream() does the same for list results that the
+leader can hand out item by item as they are produced.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List
+
+import redis
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """In-process coalescing keyed by string."""
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Future] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        existing = self._calls.get(key)
+        if existing is not None:
+            # shield: one follower disconnecting must not cancel the shared call
+            return await asyncio.shield(existing)
+
+        task = asyncio.ensure_future(fn())
+        self._calls[key] = task
+        task.add_done_callback(lambda _: self._calls.pop(key, None))
+        return await asyncio.shield(task)
+
+
+class RedisSingleFlight:
+    """
+    Cross-worker coalescing on top of the in-process layer.
+
+    `dumps`/`loads` convert results to and from strings for Redis. If the
+    leader fails, its lock is released without a result and one of the
+    waiting followers takes over. If Redis is unreachable every worker
+    simply runs its own (still locally coalesced) call.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        dumps: Callable[[Any], str],
+        loads: Callable[[str], Any],
+        client=None,
+    ):
+        self.namespace = namespace
+        self.dumps = dumps
+        self.loads = loads
+        self._client = client
+        self.local = SingleFlight()
+
+    @property
+    def client(self):
+        if self._client is None:
+            from .redis_client import get_async_redis
+            self._client = get_async_redis()
+        return self._client
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        return await self.local.do(key, lambda: self._do_distributed(key, fn))
+
+    async def stream(self, key: str, produce: Callable[[], AsyncIterator[Any]]) -> AsyncIterator[Any]:
+        """
+        Streaming do() for list results. If this call leads, it yields the
+        items as `produce()` makes them; otherwise it yields the leader's
+        finished list. The shared call runs to the end even if its own
+        consumer goes away, so followers still get the result.
+        """
+        live: asyncio.Queue = asyncio.Queue()
+        led = False
+
+        async def collect() -> List[Any]:
+            items = []
+            async for item in produce():
+                items.append(item)
+                live.put_nowait(item)
+            return items
+
+        def lead() -> Awaitable[List[Any]]:
+            nonlocal led
+            led = True
+            return collect()
+
+        call = asyncio.ensure_future(self.do(key, lead))
+        try:
+            while not call.done():
+                getter = asyncio.ensure_future(live.get())
+                await asyncio.wait({getter, call}, return_when=asyncio.FIRST_COMPLETED)
+                if getter.done():
+                    yield getter.result()
+                else:
+                    getter.cancel()
+            result = call.result()
+            if led:
+                while not live.empty():
+                    yield live.get_nowait()
+            else:
+                for item in result:
+                    yield item
+        finally:
+            call.cancel()  # only stops waiting: the shared call is shielded
+
+    async def _do_distributed(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        lock_key = f"{self.namespace}:lock:{key}"
+        result_key = f"{self.namespace}:result:{key}"
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + settings.singleflight_lock_ttl_seconds
+
+        try:
+            while True:
+                cached = await self.client.get(result_key)
+                if cached is not None:
+                    return self.loads(cached)
+                if await self.client.set(lock_key, token, nx=True, px=int(settings.singleflight_lock_ttl_seconds * 1000)):
+                    break
+                if time.monotonic() >= deadline:
+                    # Leader is stuck or gone without releasing; do it ourselves
+                    return await fn()
+                await asyncio.sleep(settings.singleflight_poll_seconds)
+        except redis.RedisError as e:
+            logger.warning("Single-flight Redis unavailable, running locally: %s", e)
+            return await fn()
+
+        try:
+            result = await fn()
+            try:
+                await self.client.set(result_key, self.dumps(result), ex=settings.singleflight_result_ttl_seconds)
+            except redis.RedisError as e:
+                logger.warning("Failed to share single-flight result: %s", e)
+            return result
+        finally:
+            try:
+                # Release only our own lock
+                if await self.client.get(lock_key) == token:
+                    await self.client.delete(lock_key)
+            except redis.RedisError:
+                pass
@@ -0,0 +1,304 @@
+"""
+Department-level syllabus ingestion: many syllabi, one upload.
+
+Documents arrive as ZIP archives and/or plain files and are mapped to
+courses by CRN: a `manifest.csv` (filename,crn) inside the archive wins,
+otherwise the longest run of 3-10 digits in the file name is taken
+("41823.pdf", "ECN4180_41823.pdf" -> 41823).
+
+The pipeline is three bounded stages:
+
+- unpack: archive members are read one at a time (the ZIP's central
+  directory is read up front, member data only when its turn comes), at
+  most `syllabus_batch_concurrency * 2` documents are held in memory;
+- extract: documents are hashed and identical bytes share one extraction,
+  so the LLM sees each distinct syllabus once; text extraction runs in a
+  thread, the LLM call in one of `syllabus_batch_concurrency` workers;
+- store: each course's events replace its previous ones (as
+  publish_events does) in a short-lived session, and the document itself
+  goes to the content-addressed file store (services/file_store.py).
+
+run_batch yields progress as (event, data) pairs, one `file` per
+document and a final `summary` with throughput in syllabi per minute.
+"""
+
+import asyncio
+import csv
+import hashlib
+import io
+import logging
+import os
+import re
+import time
+import zipfile
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable, BinaryIO, Callable, Dict, List, Optional, Tuple
+
+from .. import metrics
+from ..config import settings
+from ..exceptions import AppException
+from ..database import SessionLocal
+from ..models.course_event import CourseEvent
+from ..models.event import Syllabus
+from . import file_store, notification_service, reminder_service, syllabus_pipeline, syllabus_store
+from .syllabus_pipeline import Extraction
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = (".pdf", ".txt")
+MANIFEST_NAME = "manifest.csv"
+_CRN_RE = re.compile(r"\d{3,10}")
+
+
+@dataclass
+class Document:
+    name: str
+    crn: Optional[str]
+    read: Callable[[], bytes]  # reads the bytes when the document's turn comes
+    size: int = 0  # set once read
+    data: Optional[bytes] = None  # kept from read until stored, then dropped
+
+
+@dataclass
+class Summary:
+    files: int = 0
+    stored: int = 0
+    skipped: int = 0  # a second file for a course already in the batch
+    duplicates: int = 0  # identical bytes to an earlier file: extraction shared
+    errors: int = 0
+    events: int = 0
+    llm_calls: int = 0  # model replies: the date pre-check and shared extractions skip the LLM
+    started: float = field(default_factory=time.perf_counter)
+
+    def as_dict(self) -> Dict:
+        elapsed = time.perf_counter() - self.started
+        return {
+            "files": self.files,
+            "stored": self.stored,
+            "skipped": self.skipped,
+            "duplicates": self.duplicates,
+            "errors": self.errors,
+            "events": self.events,
+            "llm_calls": self.llm_calls,
+            "seconds": round(elapsed, 2),
+            "syllabi_per_minute": round(self.files / elapsed * 60, 1) if elapsed else 0.0,
+        }
+
+
+def crn_from_filename(name: str) -> Optional[str]:
+    runs = _CRN_RE.findall(os.path.splitext(os.path.basename(name))[0])
+    return max(runs, key=len) if runs else None
+
+
+def _wanted(name: str) -> bool:
+    base = os.path.basename(name)
+    return bool(base) and not base.startswith(".") and "__MACOSX" not in name
+
+
+def _read_capped(stream: BinaryIO) -> bytes:
+    """Read at most max_file_size_mb; one byte more means the file is too large."""
+    limit = settings.max_file_size_mb * 1024 * 1024
+    data = stream.read(limit + 1)
+    if len(data) > limit:
+        raise AppException(f"File larger than {settings.max_file_size_mb} MB")
+    return data
+
+
+def _read_member(archive: zipfile.ZipFile, info: zipfile.ZipInfo) -> Callable[[], bytes]:
+    def read() -> bytes:
+        # file_size comes from the archive and can lie; never inflate past the limit
+        with archive.open(info) as member:
+            return _read_capped(member)
+    return read
+
+
+def list_documents(uploads: List[Tuple[str, BinaryIO]]) -> List[Document]:
+    """Every syllabus in the uploads, in order, without reading any document bytes yet."""
+    documents = []
+    for filename, stream in uploads:
+        if not zipfile.is_zipfile(stream):
+            stream.seek(0)
+            documents.append(Document(filename, crn_from_filename(filename), lambda s=stream: _read_capped(s)))
+            continue
+        stream.seek(0)
+        archive = zipfile.ZipFile(stream)
+        manifest = {}
+        if MANIFEST_NAME in archive.namelist():
+            reader = csv.DictReader(io.TextIOWrapper(archive.open(MANIFEST_NAME), encoding="utf-8-sig"))
+            manifest = {row["filename"].strip(): row["crn"].strip() for row in reader if row.get("filename")}
+        for info in archive.infolist():
+            if info.is_dir() or info.filename == MANIFEST_NAME or not _wanted(info.filename):
+                continue
+            crn = manifest.get(info.filename) or manifest.get(os.path.basename(info.filename))
+            documents.append(Document(info.filename, crn or crn_from_filename(info.filename), _read_member(archive, info)))
+    return documents
+
+
+def _document_text(name: str, data: bytes) -> str:
+    if name.lower().endswith(".pdf"):
+        return syllabus_pipeline.extract_pdf_text(data)
+    return data.decode("utf-8", errors="replace")
+
+
+def _save_course_syllabus(
+    course_id, document: Document, digest: str, text: str, extraction: Extraction, file_url: Optional[str]
+):
+    """Replace the course's events with the extracted ones and store the syllabus artifacts."""
+    with SessionLocal() as db:
+        old_event_ids = []
+        if settings.reminders_enabled:
+            old_event_ids = [row.id for row in db.query(CourseEvent.id).filter(CourseEvent.course_id == course_id)]
+        db.query(CourseEvent).filter(CourseEvent.course_id == course_id).delete()
+        created = [CourseEvent(course_id=course_id, **event.model_dump()) for event in extraction.events]
+        db.add_all(created)
+        syllabus = Syllabus(
+            course_id=course_id,
+            filename=os.path.basename(document.name),
+            file_size=str(document.size),
+            file_url=file_url,
+            document_hash=digest,
+        )
+        syllabus_store.set_text(syllabus, text)
+        syllabus_store.record_extraction(syllabus, extraction)
+        db.add(syllabus)
+        with metrics.stage("db_write"):
+            db.flush()
+            targets = [(event.id, event.start_ts) for event in created]
+            db.commit()
+    return old_event_ids, targets
+
+
+async def store_in_db(course_id, document: Document, digest: str, text: str, extraction: Extraction) -> None:
+    """The default `store` for run_batch: same effect as publish_events for one course."""
+    file_url = None
+    if document.data is not None:
+        with metrics.stage("file_store"):
+            file_url = await asyncio.to_thread(file_store.get_file_store().save_bytes, document.data)
+    old_event_ids, targets = await asyncio.to_thread(
+        _save_course_syllabus, course_id, document, digest, text, extraction, file_url
+    )
+    await reminder_service.cancel_reminders("course_event", old_event_ids)
+    await reminder_service.schedule_reminders("course_event", targets)
+    await notification_service.publish_change(course_id, "course_event", "published")
+
+
+Store = Callable[[object, Document, str, str, Extraction], Awaitable[None]]
+
+
+async def run_batch(
+    documents: List[Document],
+    courses_by_crn: Dict[str, object],
+    store: Optional[Store] = None,
+    concurrency: Optional[int] = None,
+) -> AsyncIterator[Tuple[str, Dict]]:
+    """
+    Extract and (via `store(course_id, document, sha256, text, extraction)`) save every
+    document; yields ("file", {...}) per document then ("summary", {...}).
+    """
+    concurrency = concurrency or settings.syllabus_batch_concurrency
+    summary = Summary()
+    progress: asyncio.Queue = asyncio.Queue()
+    llm_jobs: asyncio.Queue = asyncio.Queue()
+    in_flight = asyncio.Semaphore(concurrency * 2)  # documents unpacked but not yet finished
+    extractions: Dict[str, asyncio.Future] = {}  # sha256 -> events
+    finishing: List[asyncio.Task] = []
+    seen_courses = set()
+
+    async def llm_worker() -> None:
+        while True:
+            text, future = await llm_jobs.get()
+            try:
+                extraction = await syllabus_pipeline.extract_with_artifacts(text)
+                if extraction.raw_output is not None:
+                    summary.llm_calls += 1
+                future.set_result(extraction)
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                llm_jobs.task_done()
+
+    async def finish(
+        document: Document, course_id, digest: str, text: str, future: asyncio.Future, duplicate: bool
+    ) -> None:
+        report = {"file": document.name, "crn": document.crn, "course_id": str(course_id)}
+        try:
+            extraction = await asyncio.shield(future)
+            if store is not None:
+                await store(course_id, document, digest, text, extraction)
+            summary.stored += 1
+            summary.events += len(extraction.events)
+            report.update(status="stored", events=len(extraction.events), shared_extraction=duplicate)
+        except Exception as e:
+            summary.errors += 1
+            detail = e.detail if isinstance(e, AppException) else "Failed to parse syllabus"
+            logger.warning("Batch syllabus %s failed (%s): %s", document.name, type(e).__name__, e)
+            report.update(status="error", detail=detail)
+        finally:
+            document.data = None
+            in_flight.release()
+        await progress.put(("file", report))
+
+    async def unpack() -> None:
+        try:
+            await _unpack_all()
+            await asyncio.gather(*finishing)
+        finally:
+            await progress.put(None)  # always end the progress stream
+
+    async def _unpack_all() -> None:
+        for document in documents:
+            summary.files += 1
+            report = {"file": document.name, "crn": document.crn}
+            course_id = courses_by_crn.get(document.crn) if document.crn else None
+            if not document.name.lower().endswith(SUPPORTED_EXTENSIONS):
+                summary.errors += 1
+                await progress.put(("file", {**report, "status": "error", "detail": "Unsupported file type"}))
+                continue
+            if course_id is None:
+                summary.errors += 1
+                detail = "No CRN in file name" if not document.crn else "No course with this CRN"
+                await progress.put(("file", {**report, "status": "error", "detail": detail}))
+                continue
+            if course_id in seen_courses:
+                summary.skipped += 1
+                await progress.put(("file", {**report, "status": "skipped", "detail": "Course already has a syllabus in this batch"}))
+                continue
+            seen_courses.add(course_id)
+
+            await in_flight.acquire()
+            try:
+                with metrics.stage("upload_read"):
+                    data = await asyncio.to_thread(document.read)
+                document.size = len(data)
+                digest = hashlib.sha256(data).hexdigest()
+                with metrics.stage("pdf_extract"):
+                    text = await asyncio.to_thread(_document_text, document.name, data)
+                document.data = data
+                del data
+            except Exception as e:
+                in_flight.release()
+                summary.errors += 1
+                detail = e.detail if isinstance(e, AppException) else "Could not read file"
+                await progress.put(("file", {**report, "status": "error", "detail": detail}))
+                continue
+
+            duplicate = digest in extractions
+            if duplicate:
+                summary.duplicates += 1
+            else:
+                extractions[digest] = asyncio.get_running_loop().create_future()
+                await llm_jobs.put((text, extractions[digest]))
+            finishing.append(asyncio.create_task(finish(document, course_id, digest, text, extractions[digest], duplicate)))
+
+    workers = [asyncio.create_task(llm_worker()) for _ in range(concurrency)]
+    producer = asyncio.create_task(unpack())
+    try:
+        while (item := await progress.get()) is not None:
+            yield item
+        await producer
+        yield "summary", summary.as_dict()
+    finally:
+        # Also reached when the client disconnects mid-stream: stop extracting and storing
+        for task in workers + [producer] + finishing:
+            task.cancel()
+        logger.info("Syllabus batch: %s", summary.as_dict())
@@ -0,0 +1,171 @@
+"""
+Syllabus extraction pipeline: PDF bytes -> text -> compaction -> LLM -> events.
+
+Each stage is a separate function (timed via app.metrics) so the upload
+endpoints, the streaming endpoint and offline tooling can compose them.
+"""
+
+import io
+import logging
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
+
+from .. import metrics
+from ..config import settings
+from ..exceptions import AppException, BadRequest
+from ..schemas.course_event import CourseEventCreate
+from . import openai_service
+from .partitioning import SEMESTER_PATTERN
+from .text_compaction import compact_syllabus_text
+
+logger = logging.getLogger(__name__)
+
+DATE_PATTERN = re.compile(r'\b(\d{1,2})/(\d{1,2})\b')
+
+
+def extract_pdf_text(contents: Union[bytes, str]) -> str:
+    """Extract and whitespace-normalise text, one line per page (from bytes or a file path)."""
+    import PyPDF2
+
+    text = ""
+    try:
+        pdf_reader = PyPDF2.PdfReader(io.BytesIO(contents) if isinstance(contents, bytes) else contents)
+        for page_num, page in enumerate(pdf_reader.pages):
+            with metrics.stage("pdf_extract_page"):
+                page_text = page.extract_text()
+                # Clean up the text
+                page_text = ' '.join(page_text.split())  # Normalize whitespace
+            text += page_text + "\n"
+            logger.debug("Page %d extracted %d chars", page_num + 1, len(page_text))
+    except Exception as e:
+        logger.warning("PDF extraction error: %s", e)
+        raise BadRequest("Failed to extract text from PDF")
+
+    if not text.strip():
+        raise BadRequest("No text found in PDF")
+
+    text = text.strip()
+    logger.debug("Processing text length: %d", len(text))
+    return text
+
+
+def has_schedule_dates(text: str) -> bool:
+    """Cheap pre-check: no m/d dates at all means there is nothing to send to the LLM."""
+    semester_match = SEMESTER_PATTERN.search(text)
+    logger.debug("Detected semester: %s", semester_match.group(0) if semester_match else None)
+
+    dates = DATE_PATTERN.findall(text)
+    logger.debug("Found %d potential dates in text", len(dates))
+    return bool(dates)
+
+
+def compact_for_prompt(text: str) -> str:
+    """Spend the prompt budget on the schedule, not on policy boilerplate."""
+    with metrics.stage("compaction"):
+        compaction = compact_syllabus_text(text, settings.llm_input_budget_chars)
+    metrics.PROMPT_TOKENS_SAVED.inc(compaction.tokens_saved)
+    logger.debug(
+        "Compacted syllabus: %d -> %d tokens (%d segments dropped)",
+        compaction.original_tokens, compaction.compacted_tokens, compaction.segments_dropped,
+    )
+    return compaction.text
+
+
+def event_from_llm(event_data: Dict[str, Any]) -> Optional[CourseEventCreate]:
+    """Convert one raw LLM event dict; None if it can't be used."""
+    try:
+        # Parse date
+        date_str = event_data.get("date", "")
+        if date_str:
+            event_date = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+        else:
+            event_date = datetime.now() + timedelta(days=30)
+
+        return CourseEventCreate(
+            title=event_data.get("title", "Untitled Event"),
+            start_ts=event_date,
+            end_ts=event_date + timedelta(hours=1),
+            category=event_data.get("category", "Other"),
+            location=event_data.get("location") or None  # Fix: use None instead of null
+        )
+    except Exception as e:
+        logger.debug("Skipping unparseable event: %s", e)
+        return None
+
+
+@dataclass
+class Extraction:
+    """Events plus what produced them, so they can be re-derived without the LLM."""
+    events: List[CourseEventCreate]
+    raw_output: Optional[str]  # None when the date pre-check skipped the LLM
+    prompt_version: str
+
+
+def events_from_raw(raw_output: Optional[str]) -> List[CourseEventCreate]:
+    """Re-derive events from a stored model reply (no LLM call)."""
+    if not raw_output:
+        return []
+    events = [event_from_llm(event_data) for event_data in openai_service.parse_events_json(raw_output)]
+    return [event for event in events if event is not None]
+
+
+async def extract_with_artifacts(text: str) -> Extraction:
+    """Like events_from_text, keeping the raw reply and prompt version for storage."""
+    version = openai_service.prompt_version()
+    if not has_schedule_dates(text):
+        return Extraction([], None, version)
+    try:
+        compacted = compact_for_prompt(text)
+        with metrics.stage("llm_call"):
+            raw_output = await openai_service.complete_syllabus(compacted)
+        with metrics.stage("event_conversion"):
+            events = events_from_raw(raw_output)
+    except AppException:
+        raise
+    except Exception as e:
+        logger.error("OpenAI parsing error: %s", e)
+        raise Exception(f"Failed to parse syllabus: {str(e)}")
+    return Extraction(events, raw_output, version)
+
+
+async def parse_syllabus_with_openai(text: str) -> List[CourseEventCreate]:
+    """Parse syllabus text using OpenAI API"""
+    try:
+        text = compact_for_prompt(text)
+
+        with metrics.stage("llm_call"):
+            events_data = await openai_service.parse_syllabus_with_openai(text)
+
+        # Convert to CourseEventCreate objects
+        with metrics.stage("event_conversion"):
+            events = [event_from_llm(event_data) for event_data in events_data]
+        return [event for event in events if event is not None]
+
+    except AppException:
+        raise
+    except Exception as e:
+        logger.error("OpenAI parsing error: %s", e)
+        raise Exception(f"Failed to parse syllabus: {str(e)}")
+
+
+async def extract_syllabus_events(contents: bytes) -> List[CourseEventCreate]:
+    """PDF bytes -> text -> date pre-check -> LLM -> events"""
+    return await events_from_text(extract_pdf_text(contents))
+
+
+async def events_from_text(text: str) -> List[CourseEventCreate]:
+    if not has_schedule_dates(text):
+        logger.debug("No dates found in regex, returning empty events")
+        return []
+    return await parse_syllabus_with_openai(text)
+
+
+async def stream_syllabus_events(text: str) -> AsyncIterator[CourseEventCreate]:
+    """Yield events one by one as the streamed LLM reply completes each object."""
+    text = compact_for_prompt(text)
+    async for event_data in openai_service.stream_syllabus_events(text):
+        event = event_from_llm(event_data)
+        if event is not None:
+            yield event
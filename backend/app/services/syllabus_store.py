@@ -0,0 +1,79 @@
+"""
+Stored syllabus text and parse artifacts.
+
+Each course upload keeps its normalized text (zlib-compressed; syllabus
+text compresses about 3-4x), the sha256 of the uploaded bytes, the
+model's raw reply and the prompt version that produced it. That makes
+the expensive stages skippable:
+
+- a re-upload of the same file skips PDF extraction (and the LLM too,
+  while the prompt version is unchanged);
+- re-extraction after a prompt change or a text correction starts from
+  the stored text, without the upload or the PDF.
+"""
+
+import zlib
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from ..models.event import Syllabus, SyllabusStatus
+from .syllabus_pipeline import Extraction
+
+COMPRESSION_LEVEL = 6
+
+
+def compress_text(text: str) -> bytes:
+    return zlib.compress(text.encode("utf-8"), COMPRESSION_LEVEL)
+
+
+def decompress_text(data: bytes) -> str:
+    return zlib.decompress(data).decode("utf-8")
+
+
+def stored_text(syllabus: Syllabus) -> Optional[str]:
+    if syllabus.text_compressed is not None:
+        return decompress_text(syllabus.text_compressed)
+    return syllabus.parsed_text
+
+
+def find_by_hash(db: Session, course_id, document_hash: str) -> Optional[Syllabus]:
+    """The course's latest stored syllabus with these exact bytes, if its text was kept."""
+    return (
+        db.query(Syllabus)
+        .filter(
+            Syllabus.course_id == course_id,
+            Syllabus.document_hash == document_hash,
+            Syllabus.text_compressed.isnot(None),
+        )
+        .order_by(Syllabus.created_at.desc())
+        .first()
+    )
+
+
+def set_text(syllabus: Syllabus, text: str) -> None:
+    syllabus.text_compressed = compress_text(text)
+    syllabus.parsed_text = None
+
+
+def record_extraction(syllabus: Syllabus, extraction: Extraction) -> None:
+    syllabus.raw_llm_output = extraction.raw_output
+    syllabus.prompt_version = extraction.prompt_version
+    syllabus.extracted_at = datetime.now(timezone.utc)
+    syllabus.status = SyllabusStatus.done
+    syllabus.error_message = None
+
+
+def record_failure(syllabus: Syllabus, detail: str) -> None:
+    syllabus.status = SyllabusStatus.error
+    syllabus.error_message = detail
+
+
+def reusable_output(syllabus: Syllabus, prompt_version: str) -> bool:
+    """True when the stored reply came from the current prompt, so the LLM can be skipped."""
+    return (
+        syllabus.status == SyllabusStatus.done
+        and syllabus.prompt_version == prompt_version
+        and syllabus.extracted_at is not None
+    )
@@ -0,0 +1,130 @@
+"""
+Prompt input compaction for syllabus text.
+
+The LLM only sees a fixed character budget, and syllabi usually open with
+course policies, grading rubrics and academic-integrity boilerplate. This
+stage splits the text into segments, scores each one by date density and
+schedule keywords, drops boilerplate and repeated headers/footers, and
+keeps the best segments (in document order) that fit the budget.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List
+
+# ~4 characters per token for English prose; good enough for reporting savings
+CHARS_PER_TOKEN = 4
+SEGMENT_TARGET_CHARS = 400
+
+_MONTHS = (
+    r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|"
+    r"sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?"
+)
+_WEEKDAYS = r"(?:monday|tuesday|wednesday|thursday|friday|mon|tues?|wed|thu(?:rs?)?|fri)\.?"
+DATE_RE = re.compile(
+    rf"\b\d{{1,2}}/\d{{1,2}}(?:/\d{{2,4}})?\b"  # 3/15, 03/15/2025
+    rf"|\b\d{{4}}-\d{{2}}-\d{{2}}\b"  # 2025-03-15
+    rf"|\b{_MONTHS}\s+\d{{1,2}}\b"  # March 15
+    rf"|\b\d{{1,2}}\s+{_MONTHS}"  # 15 March
+    rf"|\bweek\s+\d{{1,2}}\b"  # Week 7
+    rf"|\b{_WEEKDAYS}\b",
+    re.IGNORECASE,
+)
+SCHEDULE_RE = re.compile(
+    r"\b(?:exam|midterm|final|quiz|test|due|deadline|assignment|homework|hw|project|"
+    r"presentation|paper|essay|lab|reading|schedule|calendar|submit|no class|holiday|break)\b",
+    re.IGNORECASE,
+)
+BOILERPLATE_RE = re.compile(
+    r"academic (?:integrity|honesty|misconduct)|plagiari|honor code|disabilit|accommodation|"
+    r"title ix|harassment|discriminat|counseling|mental health|copyright|"
+    r"grading scale|letter grade|attendance policy|late (?:work|submission) policy|"
+    r"electronic devices|cell phones?|netiquette|learning outcomes?|course objectives?",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class CompactionResult:
+    text: str
+    original_tokens: int
+    compacted_tokens: int
+    segments_kept: int
+    segments_dropped: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.original_tokens - self.compacted_tokens
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _segments(text: str) -> List[str]:
+    """Split into lines, then break long lines (a whole PDF page is often one line) at sentence ends."""
+    segments = []
+    for line in text.splitlines():
+        line = " ".join(line.split())
+        while len(line) > SEGMENT_TARGET_CHARS:
+            cut = line.rfind(". ", 0, SEGMENT_TARGET_CHARS)
+            if cut < SEGMENT_TARGET_CHARS // 4:
+                cut = line.find(". ", SEGMENT_TARGET_CHARS)
+            if cut == -1:
+                break
+            segments.append(line[:cut + 1])
+            line = line[cut + 2:]
+        if line:
+            segments.append(line)
+    return segments
+
+
+def score_segment(segment: str) -> float:
+    """Date hits weigh most, schedule keywords next; boilerplate sinks a segment."""
+    dates = len(DATE_RE.findall(segment))
+    keywords = len(SCHEDULE_RE.findall(segment))
+    boilerplate = len(BOILERPLATE_RE.findall(segment))
+    # Normalise by length so one long paragraph can't win on volume alone
+    density = (3 * dates + keywords) / max(len(segment) / 100, 1)
+    if boilerplate and not dates:
+        return -1.0
+    return density - boilerplate
+
+
+def compact_syllabus_text(text: str, budget_chars: int) -> CompactionResult:
+    original_tokens = estimate_tokens(text)
+    if len(text) <= budget_chars:
+        return CompactionResult(text, original_tokens, original_tokens, 0, 0)
+
+    # Collapse repeated headers/footers: keep the first occurrence only
+    seen = set()
+    segments = []
+    for segment in _segments(text):
+        key = segment.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        segments.append(segment)
+
+    scored = [(score_segment(s), i, s) for i, s in enumerate(segments)]
+
+    # Best-scoring segments first; zero-score context only fills leftover room
+    chosen = set()
+    used = 0
+    for score, index, segment in sorted(scored, key=lambda t: (-t[0], t[1])):
+        if score < 0:
+            break
+        cost = len(segment) + 1
+        if used + cost > budget_chars:
+            continue
+        chosen.add(index)
+        used += cost
+
+    compacted = "\n".join(segments[i] for i in sorted(chosen))
+    return CompactionResult(
+        text=compacted,
+        original_tokens=original_tokens,
+        compacted_tokens=estimate_tokens(compacted),
+        segments_kept=len(chosen),
+        segments_dropped=len(segments) - len(chosen),
+    )
@@ -0,0 +1,79 @@
+"""
+Weekly workload analytics backed by the course_event_weekly_counts table.
+Triggers on course_events and events keep it current as part of each
+write (see models/workload.py), so writers have nothing to schedule and
+readers only ever touch the (small) summary table.
+"""
+
+from datetime import date
+from typing import List, Optional, Iterable
+from uuid import UUID
+
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from ..models.course import Enrollment
+from ..models.workload import course_event_weekly_counts as weekly
+
+
+def _date_filters(stmt, start: Optional[date], end: Optional[date]):
+    if start:
+        stmt = stmt.where(weekly.c.week_start >= start)
+    if end:
+        stmt = stmt.where(weekly.c.week_start <= end)
+    return stmt
+
+
+def get_course_workload(
+    db: Session,
+    course_id: UUID,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> List[dict]:
+    """Per-week, per-category event counts for a single course."""
+    stmt = select(
+        weekly.c.week_start,
+        weekly.c.iso_year,
+        weekly.c.iso_week,
+        weekly.c.category,
+        weekly.c.event_count,
+    ).where(weekly.c.course_id == course_id)
+    stmt = _date_filters(stmt, start, end).order_by(weekly.c.week_start, weekly.c.category)
+    return [dict(row._mapping) for row in db.execute(stmt)]
+
+
+def get_courses_workload(
+    db: Session,
+    course_ids: Iterable[UUID],
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> List[dict]:
+    """Per-week, per-category event counts summed across several courses."""
+    course_ids = list(course_ids)
+    if not course_ids:
+        return []
+    stmt = select(
+        weekly.c.week_start,
+        weekly.c.iso_year,
+        weekly.c.iso_week,
+        weekly.c.category,
+        func.sum(weekly.c.event_count).label("event_count"),
+    ).where(weekly.c.course_id.in_(course_ids))
+    stmt = _date_filters(stmt, start, end).group_by(
+        weekly.c.week_start, weekly.c.iso_year, weekly.c.iso_week, weekly.c.category
+    ).order_by(weekly.c.week_start, weekly.c.category)
+    return [dict(row._mapping) for row in db.execute(stmt)]
+
+
+def get_student_workload(
+    db: Session,
+    student_id: UUID,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> List[dict]:
+    """Workload for every course the student is enrolled in."""
+    course_ids = [
+        row.course_id
+        for row in db.query(Enrollment.course_id).filter(Enrollment.user_id == student_id)
+    ]
+    return get_courses_workload(db, course_ids, start, end)
@@ -0,0 +1,114 @@
+"""
+Cheap-endpoint latency while syllabus uploads saturate the server.
+
+    python -m benchmarks.admission [--seconds 10] [--uploaders 100] [--pdf-seconds 0.3]
+
+Runs an in-process app (no network) with the real upload and /auth/me
+paths. Both take a connection from a --pool-size connection pool through
+a sync dependency, as get_db does (SQLAlchemy's default QueuePool allows
+5 + 10 overflow), and hold it for the whole request: the upload while it
+parses the PDF in a thread (--pdf-seconds) and waits on the LLM
+(--llm-seconds), /auth/me for a couple of milliseconds. --uploaders clients
+post uploads back to back (backing off briefly on 503) while a handful of
+clients poll /auth/me; the run is repeated without and with
+AdmissionMiddleware. Reports /auth/me p50/p99, uploads completed and
+uploads shed.
+"""
+
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+
+from app.config import settings
+from app.middleware.admission import AdmissionMiddleware
+
+
+def build_app(pdf_seconds: float, llm_seconds: float, pool_size: int, admission: bool) -> FastAPI:
+    app = FastAPI()
+    pool = threading.BoundedSemaphore(pool_size)
+
+    def get_db():
+        pool.acquire()  # blocks a threadpool thread while the pool is exhausted, like QueuePool
+        try:
+            yield
+        finally:
+            pool.release()
+
+    @app.post("/api/courses/student-syllabus")
+    async def upload(db=Depends(get_db)):
+        await asyncio.to_thread(time.sleep, pdf_seconds)
+        await asyncio.sleep(llm_seconds)
+        return {"ok": True}
+
+    @app.get("/api/auth/me")
+    def me(db=Depends(get_db)):
+        time.sleep(0.002)
+        return {"id": 1}
+
+    if admission:
+        app.add_middleware(AdmissionMiddleware)
+    return app
+
+
+async def run(app: FastAPI, seconds: float, uploaders: int, pollers: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    deadline = time.perf_counter() + seconds
+    latencies, counts = [], {"uploaded": 0, "shed": 0}
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def uploader():
+            while time.perf_counter() < deadline:
+                response = await client.post("/api/courses/student-syllabus")
+                if response.status_code == 503:
+                    counts["shed"] += 1
+                    await asyncio.sleep(0.05)
+                else:
+                    counts["uploaded"] += 1
+
+        async def poller():
+            await asyncio.sleep(0.5)  # let the uploads saturate first
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                await client.get("/api/auth/me")
+                latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*[uploader() for _ in range(uploaders)], *[poller() for _ in range(pollers)])
+
+    latencies.sort()
+    return {
+        **counts,
+        "requests": len(latencies),
+        "p50": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0.0,
+    }
+
+
+def main(seconds: float, uploaders: int, pollers: int, pdf_seconds: float, llm_seconds: float, pool_size: int) -> None:
+    print(
+        f"expensive limit {settings.admission_expensive_limit}, queue {settings.admission_expensive_queue}, "
+        f"timeout {settings.admission_expensive_queue_timeout_seconds}s"
+    )
+    print(f"{'variant':<12} {'/me reqs':>9} {'/me p50 ms':>11} {'/me p99 ms':>11} {'uploaded':>9} {'shed':>6}")
+    for admission in (False, True):
+        app = build_app(pdf_seconds, llm_seconds, pool_size, admission)
+        r = asyncio.run(run(app, seconds, uploaders, pollers))
+        name = "admission" if admission else "none"
+        print(f"{name:<12} {r['requests']:>9} {r['p50']:>11.1f} {r['p99']:>11.1f} {r['uploaded']:>9} {r['shed']:>6}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--uploaders", type=int, default=100)
+    parser.add_argument("--pollers", type=int, default=4)
+    parser.add_argument("--pdf-seconds", type=float, default=0.3)
+    parser.add_argument("--llm-seconds", type=float, default=1.0)
+    parser.add_argument("--pool-size", type=int, default=15)
+    args = parser.parse_args()
+    main(args.seconds, args.uploaders, args.pollers, args.pdf_seconds, args.llm_seconds, args.pool_size)
@@ -0,0 +1,134 @@
+"""
+Course deletion: ORM object-by-object vs ON DELETE CASCADE, plus integrity check.
+
+    python -m benchmarks.course_delete [--events 5000] [--students 500]
+
+Needs a migrated Postgres database (DATABASE_URL, alembic at head). Seeds
+two courses with N course_events, N/10 events and M enrolled students,
+then deletes one the old way (load every child, session.delete each) and
+the other with the single DELETE that delete_course now issues. Reports
+wall time and statement count for each, then checks that no child table
+holds rows pointing at a missing course. Exits non-zero on orphans.
+Everything it creates is removed again.
+"""
+
+import argparse
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, insert, text
+
+from app.database import SessionLocal, track_queries
+from app.models import school, student_course_link  # noqa: F401 (mapper registry)
+from app.models.course import Course, Enrollment
+from app.models.course_event import CourseEvent
+from app.models.event import Event
+from app.models.user import User, UserRole
+
+CHILD_TABLES = ["course_events", "events", "syllabi", "enrollments", "student_course_links"]
+
+
+def _insert_links(db, table: str, user_column: str, course_id, users) -> None:
+    # Migration 001 gave these tables an `id` column the models don't declare
+    has_id = db.execute(text(
+        "SELECT 1 FROM information_schema.columns WHERE table_name = :t AND column_name = 'id'"
+    ), {"t": table}).first()
+    columns = ("id, " if has_id else "") + f"{user_column}, course_id"
+    values = (":id, " if has_id else "") + ":user_id, :course_id"
+    db.execute(text(f"INSERT INTO {table} ({columns}) VALUES ({values})"), [
+        {"id": uuid.uuid4(), "user_id": user_id, "course_id": course_id} for user_id in users
+    ])
+
+
+def seed(db, professor_id, students, n_events: int) -> uuid.UUID:
+    course_id = uuid.uuid4()
+    db.execute(insert(Course).values(
+        id=course_id, code=uuid.uuid4().hex[:8].upper(), title="Bench course", created_by=professor_id,
+    ))
+    start = datetime.now(timezone.utc)
+    db.execute(insert(CourseEvent), [
+        {"id": uuid.uuid4(), "course_id": course_id, "title": f"HW {i}", "category": "HW",
+         "start_ts": start + timedelta(hours=i), "end_ts": start + timedelta(hours=i + 1)}
+        for i in range(n_events)
+    ])
+    db.execute(insert(Event), [
+        {"id": uuid.uuid4(), "course_id": course_id, "title": f"Lecture {i}", "dt_start": start + timedelta(days=i)}
+        for i in range(n_events // 10)
+    ])
+    _insert_links(db, "enrollments", "user_id", course_id, students)
+    _insert_links(db, "student_course_links", "student_id", course_id, students)
+    db.commit()
+    return course_id
+
+
+def orm_delete(db, course_id) -> None:
+    """What `db.delete(course)` amounted to: every child loaded and deleted row by row."""
+    course = db.get(Course, course_id)
+    for collection in (course.course_events, course.events, course.syllabi, course.student_links):
+        for child in list(collection):
+            db.delete(child)
+    for enrollment in db.query(Enrollment).filter(Enrollment.course_id == course_id):
+        db.delete(enrollment)
+    db.flush()
+    db.delete(course)
+    db.commit()
+
+
+def cascade_delete(db, course_id) -> None:
+    db.execute(delete(Course).where(Course.id == course_id))
+    db.commit()
+
+
+def orphan_counts(db) -> dict:
+    return {
+        table: db.execute(text(
+            f"SELECT count(*) FROM {table} t LEFT JOIN courses c ON c.id = t.course_id WHERE c.id IS NULL"
+        )).scalar()
+        for table in CHILD_TABLES
+    }
+
+
+def main(n_events: int, n_students: int) -> int:
+    db = SessionLocal()
+    users = [
+        {"id": uuid.uuid4(), "email": f"bench-{uuid.uuid4().hex}@example.invalid", "role": role,
+         "auth_provider": "bench", "external_id": f"bench-{uuid.uuid4().hex}"}
+        for role in [UserRole.PROFESSOR] + [UserRole.STUDENT] * n_students
+    ]
+    db.execute(insert(User), users)
+    db.commit()
+    professor_id, students = users[0]["id"], [u["id"] for u in users[1:]]
+
+    try:
+        results = {}
+        for name, fn in (("ORM object-by-object", orm_delete), ("ON DELETE CASCADE", cascade_delete)):
+            course_id = seed(db, professor_id, students, n_events)
+            db.expire_all()
+            with track_queries() as stats:
+                start = time.perf_counter()
+                fn(db, course_id)
+                elapsed = time.perf_counter() - start
+            results[name] = (elapsed * 1000, stats.count)
+
+        print(f"Deleting a course with {n_events} course_events, {n_events // 10} events, {n_students} students")
+        for name, (ms, statements) in results.items():
+            print(f"  {name:<22} {ms:9.1f} ms  {statements:6d} statements")
+
+        orphans = orphan_counts(db)
+        print("Orphaned rows:", ", ".join(f"{t}={n}" for t, n in orphans.items()))
+        return 1 if any(orphans.values()) else 0
+    finally:
+        db.rollback()
+        db.execute(delete(User).where(User.id.in_([u["id"] for u in users])))
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--students", type=int, default=500)
+    args = parser.parse_args()
+    sys.exit(main(args.events, args.students))
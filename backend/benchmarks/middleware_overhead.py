@@ -0,0 +1,70 @@
+"""
+Per-request overhead of the error middleware: BaseHTTPMiddleware vs pure ASGI.
+
+    python -m benchmarks.middleware_overhead [--requests 5000]
+
+Runs a trivial endpoint in-process (no network) bare, behind a
+BaseHTTPMiddleware pass-through equivalent to the old ErrorMiddleware,
+and behind the current pure-ASGI ErrorMiddleware, and reports the
+mean time per request and the overhead relative to the bare app.
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.middleware.errors import ErrorMiddleware
+
+
+class LegacyErrorMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        try:
+            return await call_next(request)
+        except Exception:
+            raise
+
+
+def build_app(middleware=None) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    if middleware:
+        app.add_middleware(middleware)
+    return app
+
+
+async def measure(app: FastAPI, requests: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(100):  # warm-up
+            await client.get("/ping")
+        start = time.perf_counter()
+        for _ in range(requests):
+            await client.get("/ping")
+        return (time.perf_counter() - start) / requests * 1e6
+
+
+async def main(requests: int) -> None:
+    results = {
+        "bare": await measure(build_app(), requests),
+        "BaseHTTPMiddleware": await measure(build_app(LegacyErrorMiddleware), requests),
+        "pure ASGI": await measure(build_app(ErrorMiddleware), requests),
+    }
+    bare = results["bare"]
+    print(f"{'variant':<20} {'us/request':>12} {'overhead':>10}")
+    for name, us in results.items():
+        print(f"{name:<20} {us:>12.1f} {us - bare:>+10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
@@ -0,0 +1,104 @@
+"""
+CPU cost of serializing a large event list, old path vs new.
+
+    python -m benchmarks.serialization [--events 10000] [--rounds 5]
+
+Serializes the same N events three ways and reports CPU time per response:
+
+- response_model: ORM objects through FastAPI's serialize_response
+  (validation + jsonable_encoder) and a stdlib JSONResponse, i.e. what
+  `return events` with `response_model=List[EventSchema]` did before;
+- TypeAdapter: the precompiled adapter validating the ORM objects and
+  dumping JSON in pydantic-core;
+- projection + orjson: column-row dicts straight into ORJSONResponse, as
+  the list endpoints now do.
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.models import course, course_event, school, student_course_link, user  # noqa: F401 (mapper registry)
+from app.models.event import Event as EventModel, EventCategory, EventSource
+from app.schemas.event import Event as EventSchema
+from app.serialization import EVENT_LIST, schema_columns
+
+
+def make_events(n: int) -> List[EventModel]:
+    course_id = uuid.uuid4()
+    start = datetime(2025, 1, 13, 9, tzinfo=timezone.utc)
+    categories = list(EventCategory)
+    return [
+        EventModel(
+            id=uuid.uuid4(),
+            course_id=course_id,
+            title=f"Homework {i} due",
+            dt_start=start + timedelta(hours=i),
+            dt_end=start + timedelta(hours=i + 1),
+            category=categories[i % len(categories)],
+            location="Hannah Hall 204" if i % 3 else None,
+            description="Submit via Moodle before class." if i % 2 else None,
+            source=EventSource.parser,
+            created_at=start,
+            updated_at=start,
+        )
+        for i in range(n)
+    ]
+
+
+def as_rows(events: List[EventModel]) -> List[dict]:
+    """What rows_to_dicts() returns for the projected column query."""
+    keys = [column.key for column in schema_columns(EventModel, EventSchema)]
+    return [{key: getattr(event, key) for key in keys} for event in events]
+
+
+def cpu_ms(fn, rounds: int) -> float:
+    fn()  # warm-up
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.process_time()
+        fn()
+        best = min(best, time.process_time() - start)
+    return best * 1000
+
+
+def main(n: int, rounds: int) -> None:
+    events = make_events(n)
+    rows = as_rows(events)
+    field = create_response_field(name="Response_get_course_events", type_=List[EventSchema], mode="serialization")
+
+    def response_model_path():
+        content = asyncio.run(serialize_response(field=field, response_content=events))
+        return JSONResponse(content).body
+
+    def type_adapter_path():
+        return EVENT_LIST.dump_json(EVENT_LIST.validate_python(events, from_attributes=True))
+
+    def projection_path():
+        return ORJSONResponse(rows).body
+
+    results = {
+        "response_model + json": cpu_ms(response_model_path, rounds),
+        "TypeAdapter dump_json": cpu_ms(type_adapter_path, rounds),
+        "projection + orjson": cpu_ms(projection_path, rounds),
+    }
+    baseline = results["response_model + json"]
+    print(f"{n} events, best of {rounds} rounds (CPU time per response)")
+    for name, ms in results.items():
+        print(f"  {name:<24} {ms:8.1f} ms  ({baseline / ms:5.1f}x)")
+    print(f"  payload: {len(projection_path()) / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--events", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    main(args.events, args.rounds)
@@ -0,0 +1,78 @@
+"""
+Batch syllabus ingestion throughput (syllabi/minute) on the replayed corpus.
+
+    python -m benchmarks.syllabus_batch [--copies 10] [--concurrency 1,4,8] [--llm-latency 1.5]
+
+Builds an in-memory ZIP with every corpus document `--copies` times, each
+copy under its own CRN (the way a department upload repeats shared
+syllabi across sections), and runs services.syllabus_batch on it exactly
+as POST /admin/syllabi/batch does, minus the database writes. LLM calls
+are replayed from benchmarks/fixtures/llm (record them first with
+`python -m benchmarks.syllabus_pipeline --mode record`); --llm-latency
+adds a fixed delay per replayed call so the worker pool's effect is
+visible offline. Reports wall time, syllabi/minute and LLM calls made for
+each concurrency level.
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import zipfile
+
+from app.config import settings
+from app.services import syllabus_batch
+from benchmarks.syllabus_pipeline import CORPUS_DIR, load_corpus
+
+
+def build_archive(copies: int):
+    buffer = io.BytesIO()
+    courses_by_crn = {}
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        crn = 10000
+        for document in load_corpus(CORPUS_DIR):
+            with open(document.path, "rb") as f:
+                data = f.read()
+            extension = os.path.splitext(document.path)[1]
+            for _ in range(copies):
+                crn += 1
+                archive.writestr(f"{document.name}_{crn}{extension}", data)
+                courses_by_crn[str(crn)] = f"course-{crn}"
+    return buffer, courses_by_crn
+
+
+async def run(concurrency: int, copies: int) -> dict:
+    buffer, courses_by_crn = build_archive(copies)
+    documents = syllabus_batch.list_documents([("batch.zip", buffer)])
+    summary = {}
+    failures = set()
+    async for event, data in syllabus_batch.run_batch(documents, courses_by_crn, concurrency=concurrency):
+        if event == "summary":
+            summary = data
+        elif data["status"] == "error":
+            failures.add(data["detail"])
+    summary["failures"] = sorted(failures)
+    return summary
+
+
+def main(copies: int, levels, latency: float) -> None:
+    settings.llm_replay_mode = "replay"
+    settings.llm_replay_latency_seconds = latency
+    print(f"{'concurrency':>11} {'files':>6} {'seconds':>8} {'syllabi/min':>12} {'llm calls':>10} {'errors':>7}")
+    for concurrency in levels:
+        s = asyncio.run(run(concurrency, copies))
+        print(
+            f"{concurrency:>11} {s['files']:>6} {s['seconds']:>8.2f} {s['syllabi_per_minute']:>12.1f} "
+            f"{s['llm_calls']:>10} {s['errors']:>7}"
+        )
+        for detail in s["failures"]:
+            print(f"{'':>11} error: {detail}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--copies", type=int, default=10)
+    parser.add_argument("--concurrency", default="1,4,8")
+    parser.add_argument("--llm-latency", type=float, default=1.5)
+    args = parser.parse_args()
+    main(args.copies, [int(n) for n in args.concurrency.split(",")], args.llm_latency)
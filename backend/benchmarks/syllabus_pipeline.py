@@ -0,0 +1,211 @@
+"""
+Offline benchmark of the syllabus extraction pipeline.
+
+    python -m benchmarks.syllabus_pipeline [--mode replay|record] [--repeat 3] [--json]
+
+For every <name>.gold.json in benchmarks/corpus, runs the same code path
+as /courses/student-syllabus (PDF text, date pre-check, compaction, LLM,
+event conversion) and reports per-stage latency, peak traced memory and
+precision/recall of the extracted events against the gold events.
+
+LLM calls go through app.services.llm_replay. "replay" (the default)
+makes no network calls and reports a document as failed if its fixture
+is missing; "record" calls the API once (needs OPENAI_API_KEY) and
+writes the fixtures that later replays use. Fixtures are keyed by the
+exact prompt, so changing the prompt or compaction means re-recording.
+"""
+
+import argparse
+import asyncio
+import glob
+import json
+import os
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from app import metrics
+from app.config import settings
+from app.services import syllabus_pipeline
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), "corpus")
+
+
+@dataclass
+class Document:
+    name: str
+    path: str
+    gold: List[Dict[str, str]]
+
+    @property
+    def is_pdf(self) -> bool:
+        return self.path.lower().endswith(".pdf")
+
+
+@dataclass
+class Result:
+    name: str
+    stages: Dict[str, List[float]] = field(default_factory=dict)
+    total_seconds: List[float] = field(default_factory=list)
+    peak_bytes: int = 0
+    extracted: List[Dict[str, str]] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def load_corpus(corpus_dir: str) -> List[Document]:
+    documents = []
+    for gold_path in sorted(glob.glob(os.path.join(corpus_dir, "*.gold.json"))):
+        with open(gold_path, encoding="utf-8") as f:
+            gold = json.load(f)
+        name = os.path.basename(gold_path)[:-len(".gold.json")]
+        path = os.path.normpath(os.path.join(corpus_dir, gold["source"]))
+        documents.append(Document(name, path, gold["events"]))
+    return documents
+
+
+async def run_once(document: Document) -> List[Dict[str, str]]:
+    with open(document.path, "rb") as f:
+        contents = f.read()
+    if document.is_pdf:
+        events = await syllabus_pipeline.extract_syllabus_events(contents)
+    else:
+        events = await syllabus_pipeline.events_from_text(contents.decode("utf-8"))
+    return [
+        {"title": e.title, "date": e.start_ts.date().isoformat(), "category": e.category}
+        for e in events
+    ]
+
+
+async def run_document(document: Document, repeat: int) -> Result:
+    result = Result(document.name)
+    try:
+        for _ in range(repeat):
+            with metrics.collect_stages() as stages:
+                start = time.perf_counter()
+                result.extracted = await run_once(document)
+                result.total_seconds.append(time.perf_counter() - start)
+            for name, seconds in stages.items():
+                result.stages.setdefault(name, []).append(sum(seconds))
+
+        # Separate traced run: tracemalloc slows allocation-heavy code, so it
+        # must not overlap the timed runs above
+        tracemalloc.start()
+        try:
+            await run_once(document)
+            result.peak_bytes = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    return result
+
+
+def match_counts(extracted: List[Dict[str, str]], gold: List[Dict[str, str]], keys) -> int:
+    """One-to-one matches where every field in `keys` agrees."""
+    remaining = [tuple(g[k] for k in keys) for g in gold]
+    matched = 0
+    for event in extracted:
+        key = tuple(event[k] for k in keys)
+        if key in remaining:
+            remaining.remove(key)
+            matched += 1
+    return matched
+
+
+def score(extracted, gold, keys) -> Dict[str, float]:
+    matched = match_counts(extracted, gold, keys)
+    precision = matched / len(extracted) if extracted else 0.0
+    recall = matched / len(gold) if gold else 0.0
+    return {"matched": matched, "precision": precision, "recall": recall}
+
+
+def summarize(documents: List[Document], results: List[Result]) -> Dict:
+    report = {"documents": [], "stages": {}, "overall": {}}
+    all_stages: Dict[str, List[float]] = {}
+    totals = {"extracted": 0, "gold": 0, "strict": 0, "date_only": 0}
+
+    for document, result in zip(documents, results):
+        entry = {"name": result.name, "error": result.error}
+        if result.error is None:
+            strict = score(result.extracted, document.gold, ("date", "category"))
+            date_only = score(result.extracted, document.gold, ("date",))
+            entry.update(
+                p50_ms=statistics.median(result.total_seconds) * 1000,
+                peak_kib=result.peak_bytes / 1024,
+                extracted=len(result.extracted),
+                gold=len(document.gold),
+                precision=strict["precision"],
+                recall=strict["recall"],
+                date_precision=date_only["precision"],
+                date_recall=date_only["recall"],
+            )
+            totals["extracted"] += len(result.extracted)
+            totals["gold"] += len(document.gold)
+            totals["strict"] += strict["matched"]
+            totals["date_only"] += date_only["matched"]
+            for name, seconds in result.stages.items():
+                all_stages.setdefault(name, []).extend(seconds)
+        report["documents"].append(entry)
+
+    for name, seconds in all_stages.items():
+        report["stages"][name] = {
+            "p50_ms": statistics.median(seconds) * 1000,
+            "max_ms": max(seconds) * 1000,
+            "runs": len(seconds),
+        }
+
+    # Micro-averaged over every document that ran
+    extracted, gold = totals["extracted"], totals["gold"]
+    report["overall"] = {
+        "precision": totals["strict"] / extracted if extracted else 0.0,
+        "recall": totals["strict"] / gold if gold else 0.0,
+        "date_precision": totals["date_only"] / extracted if extracted else 0.0,
+        "date_recall": totals["date_only"] / gold if gold else 0.0,
+        "failed": sum(1 for r in results if r.error),
+    }
+    return report
+
+
+def print_report(report: Dict) -> None:
+    print(f"{'document':<22} {'p50 ms':>9} {'peak KiB':>9} {'events':>7} {'P':>6} {'R':>6} {'P(date)':>8} {'R(date)':>8}")
+    for d in report["documents"]:
+        if d["error"]:
+            print(f"{d['name']:<22} FAILED  {d['error']}")
+            continue
+        print(
+            f"{d['name']:<22} {d['p50_ms']:>9.1f} {d['peak_kib']:>9.0f} {d['extracted']:>3}/{d['gold']:<3} "
+            f"{d['precision']:>6.2f} {d['recall']:>6.2f} {d['date_precision']:>8.2f} {d['date_recall']:>8.2f}"
+        )
+    print()
+    print(f"{'stage':<22} {'p50 ms':>9} {'max ms':>9} {'runs':>6}")
+    for name, s in sorted(report["stages"].items()):
+        print(f"{name:<22} {s['p50_ms']:>9.2f} {s['max_ms']:>9.2f} {s['runs']:>6}")
+    o = report["overall"]
+    print()
+    print(
+        f"overall: precision {o['precision']:.2f} recall {o['recall']:.2f} "
+        f"(date only: {o['date_precision']:.2f} / {o['date_recall']:.2f}), {o['failed']} failed"
+    )
+
+
+async def main(mode: str, repeat: int, corpus_dir: str, as_json: bool) -> None:
+    settings.llm_replay_mode = mode
+    documents = load_corpus(corpus_dir)
+    results = [await run_document(document, repeat) for document in documents]
+    report = summarize(documents, results)
+    if as_json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--mode", choices=("replay", "record"), default="replay")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--corpus", default=CORPUS_DIR)
+    parser.add_argument("--json", action="store_true", help="machine-readable report")
+    args = parser.parse_args()
+    asyncio.run(main(args.mode, args.repeat, args.corpus, args.json))
@@ -0,0 +1,113 @@
+"""
+Deterministic synthetic syllabi with known (gold) events.
+
+    python -m benchmarks.synthetic_syllabi [--count 4] [--out benchmarks/corpus]
+
+Each syllabus mixes policy boilerplate with a schedule written in the
+date formats real syllabi use (3/15, March 15, 2025-03-15, "Week 7 Mon"),
+so the same file exercises compaction, the date pre-check and the LLM.
+Writes <name>.txt plus <name>.gold.json into the corpus directory.
+"""
+
+import argparse
+import json
+import os
+import random
+from datetime import date, timedelta
+from typing import Dict, List, Tuple
+
+BOILERPLATE = [
+    "ACADEMIC INTEGRITY: Plagiarism and cheating of any kind will be reported under the university honor code.",
+    "DISABILITY ACCOMMODATIONS: Students needing accommodations should contact the Office of Disability Services.",
+    "ATTENDANCE POLICY: Attendance is expected at every session and is recorded at the start of class.",
+    "GRADING SCALE: A 93-100, A- 90-92, B+ 87-89, B 83-86, B- 80-82, C+ 77-79, C 70-76, D 60-69, F below 60.",
+    "ELECTRONIC DEVICES: Cell phones must be silenced. Laptops are for note taking only.",
+    "MENTAL HEALTH: Counseling services are available to all students free of charge.",
+    "COURSE OBJECTIVES: Students will learn to apply core concepts to real-world problems and communicate results.",
+]
+
+SUBJECTS = [
+    ("BIO 2100", "Cell Biology"),
+    ("CSC 3410", "Data Structures"),
+    ("HIS 1020", "World History Since 1500"),
+    ("MTH 2554", "Calculus II"),
+    ("PSY 3300", "Cognitive Psychology"),
+]
+
+# (title template, category, weight)
+EVENT_KINDS = [
+    ("Homework {n} due", "HW", 5),
+    ("Quiz {n}", "Quiz", 3),
+    ("Exam {n}", "Exam", 2),
+    ("Project milestone {n}", "Project", 2),
+    ("Presentation {n}", "Presentation", 1),
+]
+
+TERMS = [("Spring", date(2025, 1, 13)), ("Fall", date(2025, 8, 25))]
+
+
+def _format_date(d: date, style: int, term_start: date) -> str:
+    if style == 0:
+        return f"{d.month}/{d.day}"
+    if style == 1:
+        return d.strftime("%B ") + str(d.day)
+    if style == 2:
+        return d.isoformat()
+    week = (d - term_start).days // 7 + 1
+    return f"Week {week} {d.strftime('%a')} ({d.month}/{d.day})"
+
+
+def generate(seed: int) -> Tuple[str, List[Dict[str, str]]]:
+    rng = random.Random(seed)
+    code, title = rng.choice(SUBJECTS)
+    term, term_start = rng.choice(TERMS)
+    room = f"{rng.choice(['Hannah Hall', 'Elliott Hall', 'Science Complex'])} {rng.randint(100, 450)}"
+
+    lines = [
+        f"{code} {title} - {term} {term_start.year}",
+        f"Meets Mon/Wed 10:00-11:15 AM in {room}. Office hours by appointment.",
+    ]
+    lines += rng.sample(BOILERPLATE, k=4)
+
+    counters = {category: 0 for _, category, _ in EVENT_KINDS}
+    kinds = [k for k in EVENT_KINDS for _ in range(k[2])]
+    style = seed % 4
+    gold = []
+    lines.append("SCHEDULE")
+    day = term_start
+    for _ in range(rng.randint(8, 14)):
+        day += timedelta(days=rng.randint(5, 12))
+        template, category, _ = rng.choice(kinds)
+        counters[category] += 1
+        event_title = template.format(n=counters[category])
+        where = f" in {room}" if category in ("Exam", "Presentation") else ""
+        lines.append(f"{_format_date(day, style, term_start)}: {event_title}{where}")
+        gold.append({"title": event_title, "date": day.isoformat(), "category": category})
+        if rng.random() < 0.3:
+            lines.append(rng.choice(BOILERPLATE))
+
+    lines.append("Schedule is tentative; changes will be announced in class.")
+    lines += rng.sample(BOILERPLATE, k=2)
+    return "\n".join(lines) + "\n", gold
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--count", type=int, default=4)
+    parser.add_argument("--out", default=os.path.join(os.path.dirname(__file__), "corpus"))
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    for seed in range(1, args.count + 1):
+        name = f"synthetic-{seed:02d}"
+        text, gold = generate(seed)
+        with open(os.path.join(args.out, f"{name}.txt"), "w", encoding="utf-8") as f:
+            f.write(text)
+        with open(os.path.join(args.out, f"{name}.gold.json"), "w", encoding="utf-8") as f:
+            json.dump({"source": f"{name}.txt", "events": gold}, f, indent=2)
+            f.write("\n")
+        print(f"wrote {name} ({len(gold)} events)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Shared fixtures.
+
+Tests that need the database run against a scratch Postgres named by
+TEST_DATABASE_URL (its public schema is dropped and recreated) and are
+skipped when it is unset. Read-replica tests also need a second scratch
+database, TEST_REPLICA_DATABASE_URL, standing in for the replica:
+
+    TEST_DATABASE_URL=postgresql://postgres@localhost/syllaai_test \
+    TEST_REPLICA_DATABASE_URL=postgresql://postgres@localhost/syllaai_test_replica \
+    python -m pytest -q
+
+Redis is always fakeredis, so no test talks to a real server.
+"""
+
+import os
+import sys
+
+import pytest
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+TEST_REPLICA_DATABASE_URL = os.getenv("TEST_REPLICA_DATABASE_URL")
+
+# Settings are read from the environment at import time
+os.environ["DATABASE_URL"] = TEST_DATABASE_URL or "sqlite://"
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("GOOGLE_CLIENT_ID", "test")
+os.environ.setdefault("GOOGLE_CLIENT_SECRET", "test")
+os.environ.setdefault("LOG_JSON", "false")
+
+import fakeredis  # noqa: E402
+from fakeredis import aioredis as fake_aioredis  # noqa: E402
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.services import redis_client  # noqa: E402
+
+
+def _reset_schema(engine) -> None:
+    with engine.begin() as conn:
+        conn.execute(text("DROP SCHEMA IF EXISTS archive CASCADE"))
+        conn.execute(text("DROP SCHEMA public CASCADE"))
+        conn.execute(text("CREATE SCHEMA public"))
+
+
+def _truncate_all(engine) -> None:
+    from app.database import Base
+    tables = ", ".join(table.name for table in Base.metadata.sorted_tables)
+    with engine.begin() as conn:
+        conn.execute(text(f"TRUNCATE {tables} CASCADE"))
+
+
+@pytest.fixture(autouse=True)
+def fake_redis(monkeypatch):
+    """One in-memory Redis per test, shared by the sync and asyncio clients."""
+    server = fakeredis.FakeServer()
+    client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    async_client = fake_aioredis.FakeRedis(server=server, decode_responses=True)
+    monkeypatch.setattr(redis_client, "get_redis", lambda: client)
+    monkeypatch.setattr(redis_client, "get_async_redis", lambda: async_client)
+    # Long-lived services cache their client on first use
+    from app.services import rate_limit
+    monkeypatch.setattr(rate_limit, "limiter", rate_limit.RateLimiter())
+    courses = sys.modules.get("app.routers.courses")
+    if courses is not None:
+        monkeypatch.setattr(courses.syllabus_flight, "_client", None)
+    return client
+
+
+@pytest.fixture(autouse=True)
+def store(tmp_path, monkeypatch):
+    """Uploads are spooled and stored under the test's tmp_path."""
+    from app.services import file_store
+    local = file_store.LocalFileStore(str(tmp_path / "files"))
+    monkeypatch.setattr(file_store, "get_file_store", lambda: local)
+    return local
+
+
+@pytest.fixture(scope="session")
+def app():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    from app.database import engine
+    _reset_schema(engine)
+    from app.main import app as fastapi_app  # runs create_all
+    return fastapi_app
+
+
+@pytest.fixture
+def db(app):
+    from app.database import SessionLocal, engine
+    session = SessionLocal()
+    yield session
+    session.close()
+    _truncate_all(engine)
+
+
+@pytest.fixture(scope="session")
+def replica_engine(app):
+    if not TEST_REPLICA_DATABASE_URL:
+        pytest.skip("TEST_REPLICA_DATABASE_URL is not set")
+    from app.database import Base, instrument_engine
+    engine = instrument_engine(create_engine(TEST_REPLICA_DATABASE_URL))
+    _reset_schema(engine)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def replica_db(replica_engine, db, monkeypatch):
+    """Point the app's replica at the second database (nothing replicates to it)."""
+    from app import database
+    monkeypatch.setattr(database, "replica_engine", replica_engine)
+    monkeypatch.setattr(database, "ReplicaSessionLocal", sessionmaker(bind=replica_engine))
+    monkeypatch.setattr(database, "_recent_writes", database.OrderedDict())
+    session = database.ReplicaSessionLocal()
+    yield session
+    session.close()
+    _truncate_all(replica_engine)
+
+
+@pytest.fixture
+def client(app, db):
+    from fastapi.testclient import TestClient
+    with TestClient(app) as test_client:  # one event loop for the whole test
+        yield test_client
+
@@ -0,0 +1,81 @@
+"""Factories shared by the tests."""
+
+import random
+import string
+import uuid
+from contextlib import contextmanager
+
+from app.database import track_queries
+from app.dependencies import create_access_token
+from app.models.course import Course
+from app.models.user import User, UserRole
+
+
+def make_user(db, role: str = "professor", email: str = None):
+    user_id = uuid.uuid4()
+    user = User(
+        id=user_id,
+        email=email or f"{user_id.hex[:8]}@uni.edu",
+        name="Test",
+        role=UserRole(role),
+        auth_provider="google",
+        external_id=user_id.hex,
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+def auth_headers(user) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+
+
+def make_course(db, professor, semester: str = "2025FA", **fields):
+    course = Course(
+        title=fields.pop("title", "Intro"),
+        crn=fields.pop("crn", "12345"),
+        semester=semester,
+        code="".join(random.choices(string.ascii_uppercase + string.digits, k=8)),
+        created_by=professor.id,
+        **fields,
+    )
+    db.add(course)
+    db.commit()
+    return course
+
+
+@contextmanager
+def assert_query_budget(max_queries: int):
+    """Fail if the block issues more than `max_queries` statements (requests made
+    in the same task count too, e.g. through httpx.ASGITransport)."""
+    with track_queries() as stats:
+        yield stats
+    assert stats.count <= max_queries, (
+        f"Query budget exceeded: {stats.count} queries (budget {max_queries})"
+    )
+
+
+def make_pdf(*lines: str) -> bytes:
+    """A minimal one-page PDF with `lines` of Helvetica text (enough for PyPDF2)."""
+    def escape(line: str) -> str:
+        return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    content = "BT /F1 12 Tf 72 720 Td 14 TL " + " ".join(f"({escape(line)}) '" for line in lines) + " ET"
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        "/Resources << /Font << /F1 5 0 R >> >> >>",
+        f"<< /Length {len(content)} >>\nstream\n{content}\nendstream",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return out
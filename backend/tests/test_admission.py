@@ -0,0 +1,81 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi.responses import PlainTextResponse
+
+from app.config import settings
+from app.middleware.admission import AdmissionMiddleware
+
+
+class SlowApp:
+    """POSTs and requests to a "slow" path are held until release() is called."""
+
+    def __init__(self):
+        self.released = asyncio.Event()
+        self.holding = 0
+
+    def release(self):
+        self.released.set()
+
+    async def __call__(self, scope, receive, send):
+        if scope["method"] == "POST" or "slow" in scope["path"]:
+            self.holding += 1
+            await self.released.wait()
+        await PlainTextResponse("ok")(scope, receive, send)
+
+
+@pytest.fixture
+def admission(monkeypatch):
+    monkeypatch.setattr(settings, "admission_enabled", True)
+    monkeypatch.setattr(settings, "admission_expensive_limit", 1)
+    monkeypatch.setattr(settings, "admission_expensive_queue", 1)
+    monkeypatch.setattr(settings, "admission_expensive_queue_timeout_seconds", 2.0)
+    monkeypatch.setattr(settings, "admission_cheap_limit", 1)
+    monkeypatch.setattr(settings, "admission_cheap_queue", 0)
+    inner = SlowApp()
+    middleware = AdmissionMiddleware(inner)
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=middleware), base_url="http://test")
+    return inner, middleware, client
+
+
+async def wait_until(condition):
+    while not condition():
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_expensive_routes_are_shed_while_cheap_ones_are_served(admission):
+    inner, middleware, client = admission
+    upload = "/api/courses/1/syllabus"
+
+    async with client:
+        running = asyncio.create_task(client.post(upload))
+        await wait_until(lambda: inner.holding == 1)
+        queued = asyncio.create_task(client.post(upload))
+        await wait_until(lambda: middleware.limiters["expensive"].waiting == 1)
+
+        shed = await client.post(upload)
+        assert shed.status_code == 503
+        assert shed.headers["Retry-After"] == "2"
+        assert (await client.get("/api/auth/me")).status_code == 200
+        assert (await client.get(upload)).status_code == 200  # reads are not expensive
+
+        inner.release()
+        assert [(await task).status_code for task in (running, queued)] == [200, 200]
+
+
+@pytest.mark.asyncio
+async def test_probes_metrics_and_streams_are_exempt(admission):
+    inner, middleware, client = admission
+
+    async with client:
+        held = [asyncio.create_task(client.get("/api/slow")), asyncio.create_task(client.post("/api/courses/1/syllabus"))]
+        await wait_until(lambda: inner.holding == 2)
+        assert (await client.get("/api/auth/me")).status_code == 503  # both classes are saturated
+
+        for path in ("/health", "/metrics", "/api/stream/courses/1"):
+            assert (await client.get(path)).status_code == 200, path
+
+        inner.release()
+        await asyncio.gather(*held)
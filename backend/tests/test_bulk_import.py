@@ -0,0 +1,136 @@
+import pytest
+from sqlalchemy import select
+
+from app.models.course import Course, Enrollment
+from app.models.school import School
+from app.models.student_course_link import StudentCourseLink
+
+from helpers import auth_headers, make_user
+
+COURSES_CSV = """school,crn,semester,title,professor_email
+state u,10001,2025fa,Calculus I,{professor}
+State U,10002,2025FA,Physics I,
+State U,10003,2025FALL,Chemistry,
+Nowhere College,10004,2025FA,Biology,
+State U,10001,2025FA,Calculus I again,
+State U,10005,2025FA,,
+"""
+
+
+@pytest.fixture
+def school(db):
+    school = School(name="State U")
+    db.add(school)
+    db.commit()
+    return school
+
+
+@pytest.fixture
+def admin(db):
+    return make_user(db, role="admin")
+
+
+@pytest.fixture
+def published(monkeypatch):
+    from app.services import notification_service
+    calls = []
+
+    async def publish_change(course_id, kind, action, user_id=None):
+        calls.append((course_id, kind, action))
+
+    monkeypatch.setattr(notification_service, "publish_change", publish_change)
+    return calls
+
+
+def upload(client, admin, kind: str, body: str, **params):
+    return client.post(
+        f"/api/admin/import/{kind}",
+        params=params,
+        headers=auth_headers(admin),
+        files={"file": (f"{kind}.csv", body.encode(), "text/csv")},
+    )
+
+
+def courses_by_crn(db) -> dict:
+    db.rollback()
+    return {course.crn: course for course in db.scalars(select(Course))}
+
+
+def test_course_import_applies_clean_rows_and_reports_the_rest(client, db, school, admin):
+    professor = make_user(db, email="Prof@State.edu")
+    body = COURSES_CSV.format(professor="prof@state.edu")
+
+    response = upload(client, admin, "courses", body)
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert (report["rows"], report["inserted"], report["updated"], report["skipped"]) == (6, 2, 0, 4)
+    assert report["errors"] == [
+        {"row": 3, "error": "invalid semester: 2025FALL"},
+        {"row": 4, "error": "unknown school: Nowhere College"},
+        {"row": 5, "error": "duplicate of row 1"},
+        {"row": 6, "error": "missing title"},
+    ]
+
+    courses = courses_by_crn(db)
+    assert sorted(courses) == ["10001", "10002"]
+    assert courses["10001"].created_by == professor.id
+    assert courses["10002"].created_by == admin.id  # no professor_email: the importing admin
+    assert courses["10001"].semester == "2025FA"
+    assert len({course.code for course in courses.values()}) == 2
+
+    # Same key again: the course is updated in place, keeping its code
+    again = upload(client, admin, "courses", "school,crn,semester,title\nState U,10001,2025FA,Calculus I (new)\n")
+    assert (again.json()["inserted"], again.json()["updated"]) == (0, 1)
+    updated = courses_by_crn(db)["10001"]
+    assert (updated.title, updated.code) == ("Calculus I (new)", courses["10001"].code)
+
+
+def test_dry_run_writes_nothing(client, db, school, admin):
+    response = upload(client, admin, "courses", "school,crn,semester,title\nState U,1,2025FA,Intro\n", dry_run="true")
+    assert response.status_code == 200, response.text
+    assert (response.json()["inserted"], response.json()["dry_run"]) == (1, True)
+    assert courses_by_crn(db) == {}
+
+
+def test_malformed_csv_is_a_400(client, db, school, admin):
+    response = upload(client, admin, "courses", 'school,crn,semester,title\nState U,1,2025FA,"unterminated\n')
+    assert response.status_code == 400, response.text
+    assert "Could not read CSV" in response.json()["detail"]
+
+    response = upload(client, admin, "courses", "school,crn,term,title\n")
+    assert response.status_code == 400
+    assert "Unknown CSV column(s): term" in response.json()["detail"]
+
+
+def test_roster_import_enrolls_and_links_students(client, db, school, admin, published):
+    upload(client, admin, "courses", "school,crn,semester,title\nState U,10001,2025FA,Calculus I\n")
+    alice = make_user(db, role="student", email="alice@state.edu")
+    bob = make_user(db, role="student", email="bob@state.edu")
+    make_user(db, email="prof@state.edu")
+    roster = (
+        "school,crn,semester,student_email\n"
+        "State U,10001,2025FA,alice@state.edu\n"
+        "State U,10001,2025FA,BOB@state.edu\n"
+        "State U,10001,2025FA,prof@state.edu\n"
+        "State U,99999,2025FA,alice@state.edu\n"
+    )
+
+    report = upload(client, admin, "rosters", roster).json()
+    assert (report["rows"], report["inserted"], report["updated"], report["skipped"]) == (4, 2, 0, 2)
+    assert [error["row"] for error in report["errors"]] == [3, 4]
+
+    course_id = courses_by_crn(db)["10001"].id
+    assert {row.user_id for row in db.scalars(select(Enrollment))} == {alice.id, bob.id}
+    assert {row.student_id for row in db.scalars(select(StudentCourseLink))} == {alice.id, bob.id}
+    assert published == [(course_id, "enrollment", "imported")]
+
+    # Importing the same roster again enrolls nobody twice
+    report = upload(client, admin, "rosters", roster).json()
+    assert (report["inserted"], report["updated"]) == (0, 2)
+    db.rollback()
+    assert len(db.scalars(select(Enrollment)).all()) == 2
+
+
+def test_imports_are_admin_only(client, db, school):
+    response = upload(client, make_user(db), "courses", "school,crn,semester,title\n")
+    assert response.status_code == 403
@@ -0,0 +1,84 @@
+import asyncio
+
+import httpx
+import openai
+import pytest
+
+from app.services import openai_service
+from app.services.openai_service import CircuitBreaker, CircuitOpenError
+
+
+class FailingCompletions:
+    def __init__(self, hang: bool = False):
+        self.calls = 0
+        self.hang = hang
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        if self.hang:
+            await asyncio.sleep(3600)
+        raise openai.APIConnectionError(request=httpx.Request("POST", "http://llm.test/v1/chat/completions"))
+
+
+@pytest.fixture
+def completions(monkeypatch):
+    fake = FailingCompletions()
+    client = type("Client", (), {"chat": type("Chat", (), {"completions": fake})()})()
+    monkeypatch.setattr(openai_service, "get_client", lambda: client)
+    monkeypatch.setattr(openai_service, "_backoff_seconds", lambda attempt, exc: 0.0)
+    monkeypatch.setattr(openai_service, "breaker", CircuitBreaker(failure_threshold=2, reset_seconds=60))
+    return fake
+
+
+@pytest.mark.asyncio
+async def test_retries_count_as_one_failure(completions):
+    with pytest.raises(openai.APIConnectionError):
+        await openai_service.chat_completion([{"role": "user", "content": "hi"}])
+
+    assert completions.calls == openai_service.settings.openai_max_retries + 1
+    assert openai_service.breaker.failures == 1
+    assert openai_service.breaker.state == "closed"
+
+    with pytest.raises(openai.APIConnectionError):
+        await openai_service.chat_completion([{"role": "user", "content": "hi"}])
+    assert openai_service.breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        await openai_service.chat_completion([{"role": "user", "content": "hi"}])
+
+
+@pytest.mark.asyncio
+async def test_cancelled_trial_releases_half_open(completions):
+    breaker = openai_service.breaker
+    breaker.failures, breaker.opened_at = 2, 0.0  # opened long enough ago: half-open
+    completions.hang = True
+
+    trial = asyncio.create_task(openai_service.chat_completion([{"role": "user", "content": "hi"}]))
+    await asyncio.sleep(0.01)
+    with pytest.raises(CircuitOpenError):  # only one trial at a time
+        await openai_service.chat_completion([{"role": "user", "content": "hi"}])
+
+    trial.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await trial
+    assert breaker.state == "half-open"
+
+    completions.hang = False
+    with pytest.raises(openai.APIConnectionError):  # the next call gets to be the trial
+        await openai_service.chat_completion([{"role": "user", "content": "hi"}])
+    assert breaker.state == "open"
+
+
+@pytest.mark.asyncio
+async def test_closed_stream_releases_trial(completions):
+    breaker = openai_service.breaker
+    breaker.failures, breaker.opened_at = 2, 0.0
+    completions.hang = True
+
+    stream = openai_service.stream_chat_completion([{"role": "user", "content": "hi"}])
+    pending = asyncio.create_task(stream.__anext__())
+    await asyncio.sleep(0.01)
+    pending.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await pending
+    await stream.aclose()
+    assert breaker._trial_in_flight is False
@@ -0,0 +1,107 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from sqlalchemy import text
+
+from app.models.course import Enrollment
+from app.models.course_event import CourseEvent
+from app.models.event import Event, Syllabus
+from app.models.student_course_link import StudentCourseLink
+
+from helpers import assert_query_budget, auth_headers, make_course, make_user
+
+CHILD_TABLES = ["course_events", "events", "syllabi", "enrollments", "student_course_links"]
+
+
+async def list_courses(app, headers):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/api/courses/", headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("role", ["professor", "student"])
+async def test_course_list_query_budget_is_flat(app, db, role):
+    professor = make_user(db)
+    student = make_user(db, role="student")
+    for n in range(5):
+        course = make_course(db, professor, crn=str(10000 + n))
+        db.add(Enrollment(user_id=student.id, course_id=course.id))
+    db.commit()
+    headers = auth_headers(professor if role == "professor" else student)
+
+    # The user, then one query for the courses with their school and student count
+    with assert_query_budget(2):
+        courses = await list_courses(app, headers)
+    assert len(courses) == 5
+    assert all(course["student_count"] == 1 for course in courses)
+
+
+def add_children(db, course, student) -> None:
+    start = datetime(2025, 10, 1, tzinfo=timezone.utc)
+    db.add_all([
+        CourseEvent(course_id=course.id, title="Midterm", category="Exam",
+                    start_ts=start, end_ts=start + timedelta(hours=1)),
+        Event(course_id=course.id, title="Lecture", dt_start=start),
+        Syllabus(course_id=course.id, filename="syllabus.pdf"),
+        Enrollment(user_id=student.id, course_id=course.id),
+        StudentCourseLink(student_id=student.id, course_id=course.id),
+    ])
+    db.commit()
+
+
+def child_rows(db, course_id) -> dict:
+    return {
+        table: db.execute(text(f"SELECT count(*) FROM {table} WHERE course_id = :id"), {"id": course_id}).scalar()
+        for table in CHILD_TABLES
+    }
+
+
+def test_delete_course_removes_every_child_row(client, db):
+    professor = make_user(db)
+    student = make_user(db, role="student")
+    doomed, kept = make_course(db, professor, crn="1"), make_course(db, professor, crn="2")
+    doomed_id, kept_id = doomed.id, kept.id
+    add_children(db, doomed, student)
+    add_children(db, kept, student)
+
+    response = client.delete(f"/api/courses/{doomed_id}", headers=auth_headers(professor))
+    assert response.status_code == 200, response.text
+
+    db.rollback()
+    assert child_rows(db, doomed_id) == dict.fromkeys(CHILD_TABLES, 0)
+    assert child_rows(db, kept_id) == dict.fromkeys(CHILD_TABLES, 1)
+    orphans = {
+        table: db.execute(text(
+            f"SELECT count(*) FROM {table} t LEFT JOIN courses c ON c.id = t.course_id WHERE c.id IS NULL"
+        )).scalar()
+        for table in CHILD_TABLES
+    }
+    assert orphans == dict.fromkeys(CHILD_TABLES, 0)
+
+
+def test_clone_validates_the_semester_and_publishes(client, db, monkeypatch):
+    from app.services import notification_service
+    published = []
+
+    async def publish_change(course_id, kind, action, user_id=None):
+        published.append((course_id, kind, action))
+
+    monkeypatch.setattr(notification_service, "publish_change", publish_change)
+    professor = make_user(db)
+    course = make_course(db, professor, semester="2025FA")
+    headers = auth_headers(professor)
+
+    for bad in ("2026FALL", "Fall26", "1999FA"):
+        response = client.post(f"/api/courses/{course.id}/clone", headers=headers, json={"semester": bad})
+        assert response.status_code == 422, (bad, response.text)
+
+    response = client.post(f"/api/courses/{course.id}/clone", headers=headers, json={"semester": "2026wi"})
+    assert response.status_code == 200, response.text
+    clone = response.json()["course"]
+    assert clone["semester"] == "2026WI"
+    assert published == [(uuid.UUID(clone["id"]), "course", "created")]
@@ -0,0 +1,108 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from psycopg2.errors import ForeignKeyViolation, UniqueViolation
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.exc import IntegrityError
+
+from app.exceptions import TooManyRequests
+from app.middleware.errors import ErrorMiddleware
+
+
+class Payload(BaseModel):
+    title: str
+    count: int
+
+
+def validation_error() -> ValidationError:
+    try:
+        Payload.model_validate({"count": "many"})
+    except ValidationError as exc:
+        return exc
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ErrorMiddleware)
+
+    @app.get("/app-exception")
+    def app_exception():
+        raise TooManyRequests("Slow down", headers={"Retry-After": "7"})
+
+    @app.get("/validation")
+    def validation():
+        raise validation_error()
+
+    @app.get("/unique")
+    def unique():
+        raise IntegrityError("INSERT INTO courses ...", {}, UniqueViolation("duplicate key"))
+
+    @app.get("/foreign-key")
+    def foreign_key():
+        raise IntegrityError("INSERT INTO events ...", {}, ForeignKeyViolation("no such course"))
+
+    @app.get("/boom")
+    def boom():
+        raise RuntimeError("boom")
+
+    @app.get("/late")
+    def late():
+        def body():
+            yield b"first chunk"
+            raise RuntimeError("failed mid-stream")
+        return StreamingResponse(body())
+
+    return app
+
+
+@pytest.fixture
+def error_client():
+    return TestClient(make_app(), raise_server_exceptions=False)
+
+
+def test_app_exception_keeps_status_and_headers(error_client):
+    response = error_client.get("/app-exception")
+
+    assert response.status_code == 429
+    assert response.json() == {"detail": "Slow down"}
+    assert response.headers["Retry-After"] == "7"
+
+
+def test_validation_error_is_a_422(error_client):
+    response = error_client.get("/validation")
+
+    assert response.status_code == 422
+    assert [(error["loc"], error["type"]) for error in response.json()["detail"]] == [
+        (["title"], "missing"), (["count"], "int_parsing"),
+    ]
+    assert all("url" not in error for error in response.json()["detail"])
+
+
+def test_integrity_errors(error_client):
+    assert error_client.get("/unique").status_code == 409
+    response = error_client.get("/foreign-key")
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Database constraint violation"}
+
+
+def test_anything_else_is_a_500(error_client):
+    response = error_client.get("/boom")
+
+    assert response.status_code == 500
+    assert response.json() == {"detail": "Internal Server Error"}
+
+
+def test_error_after_response_start_is_reraised():
+    app = make_app()
+    sent = []
+
+    async def recording_app(scope, receive, send):
+        async def record(message):
+            sent.append(message["type"])
+            await send(message)
+        await app(scope, receive, record)
+
+    with pytest.raises(RuntimeError, match="failed mid-stream"):
+        TestClient(recording_app).get("/late")
+    assert sent.count("http.response.start") == 1
@@ -0,0 +1,80 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from helpers import auth_headers, make_course, make_user
+
+
+@pytest.fixture
+def hooks(monkeypatch):
+    """Record the post-commit hooks instead of running them."""
+    from app.services import notification_service, reminder_service
+    calls = []
+
+    async def schedule_reminders(kind, items):
+        calls.append(("schedule", kind, len(items)))
+
+    async def cancel_reminders(kind, ids):
+        calls.append(("cancel", kind, len(ids)))
+
+    async def publish_change(course_id, kind, action, user_id=None):
+        calls.append(("publish", kind, action))
+
+    monkeypatch.setattr(reminder_service, "schedule_reminders", schedule_reminders)
+    monkeypatch.setattr(reminder_service, "cancel_reminders", cancel_reminders)
+    monkeypatch.setattr(notification_service, "publish_change", publish_change)
+    return calls
+
+
+def test_event_routes_are_served_and_fire_hooks(client, db, hooks):
+    professor = make_user(db)
+    course = make_course(db, professor)
+    headers = auth_headers(professor)
+
+    created = client.post("/api/events/", headers=headers, json={
+        "course_id": str(course.id),
+        "title": "Midterm",
+        "dt_start": datetime(2025, 10, 15, 9, tzinfo=timezone.utc).isoformat(),
+        "category": "exam",
+    })
+    assert created.status_code == 200, created.text
+    event_id = created.json()["id"]
+    assert hooks == [("schedule", "event", 1), ("publish", "event", "created")]
+
+    hooks.clear()
+    updated = client.put(f"/api/events/{event_id}", headers=headers, json={"title": "Midterm 1"})
+    assert updated.status_code == 200, updated.text
+    assert hooks == [("schedule", "event", 1), ("publish", "event", "updated")]
+
+    listed = client.get(f"/api/events/course/{course.id}", headers=headers)
+    assert [event["title"] for event in listed.json()] == ["Midterm 1"]
+
+    hooks.clear()
+    deleted = client.delete(f"/api/events/{event_id}", headers=headers)
+    assert deleted.status_code == 200, deleted.text
+    assert hooks == [("cancel", "event", 1), ("publish", "event", "deleted")]
+
+
+def test_course_writes_are_served_and_publish(client, db, hooks):
+    professor = make_user(db)
+    headers = auth_headers(professor)
+
+    created = client.post("/api/courses/", headers=headers, json={"title": "Intro"})
+    assert created.status_code == 200, created.text
+    assert hooks == [("publish", "course", "created")]
+    course_id = created.json()["id"]
+
+    updated = client.put(f"/api/courses/{course_id}", headers=headers, json={"title": "Intro II"})
+    assert updated.status_code == 200, updated.text
+    assert updated.json()["title"] == "Intro II"
+    assert hooks[-1] == ("publish", "course", "updated")
+
+    deleted = client.delete(f"/api/courses/{course_id}", headers=headers)
+    assert deleted.status_code == 200, deleted.text
+    assert ("publish", "course", "deleted") in hooks
+    assert client.get("/api/courses/", headers=headers).json() == []
+
+
+def test_no_routes_mounted_twice(app):
+    paths = [route.path for route in app.routes]
+    assert not [path for path in paths if path.startswith("/api/api/")]
@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+from app.services import file_store
+from helpers import auth_headers, make_user
+
+
+def test_file_store_is_abstract():
+    with pytest.raises(TypeError):
+        file_store.FileStore()
+
+    class Incomplete(file_store.FileStore):
+        name = "incomplete"
+
+        def save(self, path, sha256):
+            return self.url_for(sha256)
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+@pytest.mark.parametrize("filename, header", [
+    ("syllabus.pdf", 'attachment; filename="syllabus.pdf"'),
+    ('a"b.pdf', "attachment; filename*=utf-8''a%22b.pdf"),
+    ("Sílabo\r\nX-Injected: 1.pdf", "attachment; filename*=utf-8''S%C3%ADlabo%0D%0AX-Injected%3A%201.pdf"),
+])
+def test_content_disposition_quotes_like_starlette(filename, header):
+    assert file_store.content_disposition(filename) == header
+
+
+def test_partial_download_quotes_filename(tmp_path):
+    store = file_store.LocalFileStore(str(tmp_path))
+    url = store.save_bytes(b"0123456789")
+    sha256 = file_store.parse_file_url(url)[1]
+
+    response = store.response(sha256, 'week "1".pdf', "application/pdf", "bytes=2-5")
+
+    assert response.status_code == 206
+    assert response.headers["content-range"] == "bytes 2-5/10"
+    assert response.headers["content-disposition"] == "attachment; filename*=utf-8''week%20%221%22.pdf"
+
+
+def test_student_upload_is_capped_while_streaming(client, db, store, monkeypatch):
+    from app.config import settings
+    monkeypatch.setattr(settings, "max_file_size_mb", 1)
+    student = make_user(db, role="student")
+
+    response = client.post(
+        "/api/courses/student-syllabus",
+        headers=auth_headers(student),
+        files={"file": ("big.pdf", b"x" * (1024 * 1024 + 1), "application/pdf")},
+    )
+
+    assert response.status_code == 413
+    assert os.listdir(store.spool_dir) == []  # the partial spool file is removed
@@ -0,0 +1,56 @@
+import json
+
+from app.services.json_stream import JSONArrayStreamParser
+
+EVENTS = [
+    {"title": "Midterm {part 1} [room change]", "date": "2025-10-15", "category": "Exam", "location": None},
+    {"title": 'Essay "Why \\ matters"', "date": "2025-11-02", "category": "HW", "location": "C:\\Rooms\\101"},
+    {"title": "Project", "date": "2025-12-01", "category": "Project", "location": {"building": "Lab}", "room": "2"}},
+]
+REPLY = "Here are the events:\n```json\n" + json.dumps(EVENTS, indent=2) + "\n```\nLet me know if [anything] is missing."
+
+
+def parse(*chunks):
+    parser = JSONArrayStreamParser()
+    objects = [obj for chunk in chunks for obj in parser.feed(chunk)]
+    return objects, parser.done
+
+
+def test_whole_reply_with_prose_and_fences():
+    assert parse(REPLY) == (EVENTS, True)
+
+
+def test_objects_split_at_every_offset():
+    for offset in range(len(REPLY) + 1):
+        assert parse(REPLY[:offset], REPLY[offset:]) == (EVENTS, True), offset
+
+
+def test_one_character_at_a_time():
+    assert parse(*REPLY) == (EVENTS, True)
+
+
+def test_objects_arrive_as_soon_as_they_close():
+    parser = JSONArrayStreamParser()
+    first = json.dumps(EVENTS[0])
+
+    assert parser.feed("[" + first[:-1]) == []
+    assert parser.feed("}, {") == [EVENTS[0]]
+    assert not parser.done
+
+
+def test_malformed_object_is_skipped_without_losing_the_rest():
+    reply = '[{"title": "A", "date": "2025-09-01"}, {"title": "B", "date": 2025-09-08}, {"title": "C", "date": null}]'
+
+    objects, done = parse(reply)
+
+    assert [obj["title"] for obj in objects] == ["A", "C"]
+    assert done
+
+
+def test_truncated_final_object_is_dropped():
+    reply = '[{"title": "A", "date": "2025-09-01"}, {"title": "B", "date": "2025-'
+
+    objects, done = parse(reply)
+
+    assert objects == [{"title": "A", "date": "2025-09-01"}]
+    assert not done
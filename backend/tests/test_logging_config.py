@@ -0,0 +1,23 @@
+import json
+import logging
+import queue
+
+from app.logging_config import JsonFormatter, _InProcessQueueHandler
+
+
+def test_arguments_are_captured_at_call_time():
+    log_queue = queue.SimpleQueue()
+    logger = logging.getLogger("test.logging_config")
+    logger.propagate = False
+    logger.addHandler(_InProcessQueueHandler(log_queue))
+    events = ["midterm"]
+    try:
+        logger.warning("Parsed %s for %s", events, "CS 101", extra={"course": "CS 101"})
+        events.append("final")  # changed before the listener gets to the record
+    finally:
+        logger.handlers.clear()
+        logger.propagate = True
+
+    entry = json.loads(JsonFormatter().format(log_queue.get_nowait()))
+    assert entry["message"] == "Parsed ['midterm'] for CS 101"
+    assert entry["course"] == "CS 101"
@@ -0,0 +1,30 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.middleware.metrics import MetricsMiddleware
+
+
+def latency_count(**labels):
+    return REGISTRY.get_sample_value("http_request_duration_seconds_count", labels) or 0
+
+
+def test_latency_is_labelled_with_the_route_template():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/metrics-test/courses/{course_id}/events")
+    def course_events(course_id: str):
+        return []
+
+    template = {"method": "GET", "route": "/metrics-test/courses/{course_id}/events", "status": "200"}
+    before = latency_count(**template)
+
+    client = TestClient(app)
+    for course_id in ("c1", "c2", "c3"):
+        assert client.get(f"/metrics-test/courses/{course_id}/events").status_code == 200
+    assert client.get("/metrics-test/nowhere").status_code == 404
+
+    assert latency_count(**template) - before == 3
+    assert latency_count(method="GET", route="/metrics-test/courses/c1/events", status="200") == 0
+    assert latency_count(method="GET", route="<unmatched>", status="404") >= 1
@@ -0,0 +1,127 @@
+import time
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+
+from app import metrics
+from app.services import openai_service
+from app.services.openai_service import CircuitBreaker
+
+COMPLETION = {
+    "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": "gpt-test",
+    "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "[]"}}],
+    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+}
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """A fake OpenAI server answering with the queued responses, in order."""
+    replies, requests, delays = [], [], []
+
+    def handler(request):
+        requests.append(request)
+        return replies.pop(0) if replies else httpx.Response(200, json=COMPLETION)
+
+    client = openai.AsyncOpenAI(
+        api_key="test", base_url="http://llm.test/v1", max_retries=0,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    backoff = openai_service._backoff_seconds
+
+    def recorded_backoff(attempt, exc):
+        delays.append(backoff(attempt, exc))
+        return delays[-1]
+
+    monkeypatch.setattr(openai_service, "get_client", lambda: client)
+    monkeypatch.setattr(openai_service, "_backoff_seconds", recorded_backoff)
+    # Jitter scaled down to milliseconds, keeping the exponential shape
+    monkeypatch.setattr(openai_service, "random", SimpleNamespace(uniform=lambda low, high: high / 100))
+    monkeypatch.setattr(openai_service, "breaker", CircuitBreaker(failure_threshold=5, reset_seconds=60))
+    return SimpleNamespace(replies=replies, requests=requests, delays=delays)
+
+
+async def complete():
+    return await openai_service.chat_completion([{"role": "user", "content": "hi"}], model="gpt-test")
+
+
+@pytest.mark.asyncio
+async def test_rate_limits_and_server_errors_are_retried_with_backoff(upstream):
+    upstream.replies.extend([httpx.Response(429, json={}), httpx.Response(503, json={}), httpx.Response(503, json={})])
+
+    response = await complete()
+
+    assert response.choices[0].message.content == "[]"
+    assert len(upstream.requests) == 4
+    assert upstream.delays == [0.005, 0.01, 0.02]
+    assert openai_service.breaker.failures == 0
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried(upstream):
+    openai_service.breaker.failures = 1  # an earlier upstream failure
+    upstream.replies.append(httpx.Response(400, json={"error": {"message": "bad request"}}))
+
+    with pytest.raises(openai.BadRequestError):
+        await complete()
+
+    assert len(upstream.requests) == 1
+    assert upstream.delays == []
+    assert openai_service.breaker.failures == 1  # our mistake says nothing about upstream health
+
+
+@pytest.mark.asyncio
+async def test_retry_after_is_honoured(upstream):
+    upstream.replies.append(httpx.Response(429, headers={"Retry-After": "0.2"}, json={}))
+
+    started = time.monotonic()
+    await complete()
+
+    assert upstream.delays == [0.2]
+    assert time.monotonic() - started >= 0.2
+    assert len(upstream.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_deadline_stops_retries(upstream, monkeypatch):
+    monkeypatch.setattr(openai_service.settings, "openai_deadline_seconds", 1.0)
+    upstream.replies.extend([httpx.Response(503, headers={"Retry-After": "5"}, json={})] * 2)
+
+    started = time.monotonic()
+    with pytest.raises(openai.InternalServerError):
+        await complete()
+
+    assert time.monotonic() - started < 1.0  # gave up instead of sleeping past the deadline
+    assert len(upstream.requests) == 1
+    assert openai_service.breaker.failures == 1
+
+
+class StreamingCompletions:
+    def __init__(self):
+        self.kwargs = None
+
+    async def create(self, **kwargs):
+        self.kwargs = kwargs
+
+        async def chunks():
+            for text in ("[", "]"):
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))], usage=None)
+            yield SimpleNamespace(choices=[], usage={"prompt_tokens": 120, "completion_tokens": 7, "total_tokens": 127})
+        return chunks()
+
+
+@pytest.mark.asyncio
+async def test_streamed_calls_record_token_usage(monkeypatch):
+    completions = StreamingCompletions()
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    monkeypatch.setattr(openai_service, "get_client", lambda: client)
+    prompt = metrics.OPENAI_TOKENS.labels(model="stream-test", kind="prompt")
+    before = prompt._value.get()
+
+    deltas = [d async for d in openai_service.stream_chat_completion([{"role": "user", "content": "hi"}], model="stream-test")]
+
+    assert deltas == ["[", "]"]
+    assert completions.kwargs["extra_body"] == {"stream_options": {"include_usage": True}}
+    assert prompt._value.get() - before == 120
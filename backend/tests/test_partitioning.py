@@ -0,0 +1,78 @@
+import json
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from app.models.course_event import CourseEvent
+from app.models.school import School
+from app.services import event_export, partitioning
+
+from helpers import auth_headers, make_course, make_user
+
+
+def test_winter_intersession_is_a_term():
+    assert partitioning.term_for(date(2026, 1, 10)) == "2026WI"
+    assert partitioning.term_for(date(2026, 1, 15)) == "2026SP"
+    assert partitioning.term_bounds("2026wi") == (
+        datetime(2026, 1, 1, tzinfo=timezone.utc), datetime(2026, 1, 15, tzinfo=timezone.utc),
+    )
+    assert partitioning.shift_term("2025FA", 1) == "2026WI"
+    assert partitioning.shift_term("2026WI", -1) == "2025FA"
+
+
+def add_event(db, course, start: datetime, title: str = "Exam") -> None:
+    db.add(CourseEvent(course_id=course.id, start_ts=start, end_ts=start + timedelta(hours=1),
+                       title=title, category="Exam"))
+    db.commit()
+
+
+def count(db, sql: str) -> int:
+    with db.bind.connect() as conn:
+        return conn.execute(text(sql)).scalar()
+
+
+def test_late_rows_for_an_archived_term_join_its_archive_table(db):
+    course = make_course(db, make_user(db), semester="2020FA")
+    today = date(2026, 10, 19)
+    try:
+        for title in ("first", "late"):
+            add_event(db, course, datetime(2020, 10, 1, tzinfo=timezone.utc), title)
+            with db.bind.begin() as conn:
+                partitioning.ensure_partitions(conn, today=today)
+                archived = partitioning.archive_partitions(conn, keep_terms=6, today=today)
+            assert "course_events_2020fa" in archived
+
+        assert count(db, "SELECT count(*) FROM archive.course_events_2020fa") == 2
+        assert count(db, "SELECT count(*) FROM course_events") == 0
+    finally:
+        with db.bind.begin() as conn:
+            conn.execute(text("DROP SCHEMA IF EXISTS archive CASCADE"))
+
+
+def test_export_scans_one_partition(db):
+    with db.bind.begin() as conn:
+        partitioning.ensure_partitions(conn, today=date(2025, 9, 1))
+    compiled = event_export.export_query(1, "2025FA").compile(dialect=db.bind.dialect)
+    with db.bind.connect() as conn:
+        plan = "\n".join(row[0] for row in conn.exec_driver_sql("EXPLAIN " + compiled.string, compiled.params))
+
+    assert "course_events_2025fa" in plan
+    assert "course_events_default" not in plan
+    assert "course_events_2026wi" not in plan
+
+
+def test_export_is_bounded_to_the_term(client, db):
+    school = School(name="State")
+    db.add(school)
+    db.commit()
+    course = make_course(db, make_user(db), semester="2025FA", school_id=school.id)
+    add_event(db, course, datetime(2025, 10, 1, tzinfo=timezone.utc), "Midterm")
+    add_event(db, course, datetime(2026, 2, 1, tzinfo=timezone.utc), "Stray")
+
+    response = client.get(
+        "/api/admin/export/events",
+        params={"school_id": school.id, "semester": "2025FA", "format": "ndjson"},
+        headers=auth_headers(make_user(db, role="admin")),
+    )
+    assert response.status_code == 200, response.text
+    assert [json.loads(line)["title"] for line in response.text.splitlines()] == ["Midterm"]
@@ -0,0 +1,90 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import llm_replay, openai_service, rate_limit
+from app.services.openai_service import CircuitBreaker, CircuitOpenError
+from app.services.rate_limit import LLMOwner, Limit, LocalLimiter, RateLimiter
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    settings = rate_limit.settings
+    monkeypatch.setattr(settings, "rate_limit_syllabus_per_minute", 600)  # one token per 100 ms
+    monkeypatch.setattr(settings, "rate_limit_syllabus_burst", 2)
+    monkeypatch.setattr(settings, "llm_daily_quota_per_user", 2)
+    monkeypatch.setattr(settings, "llm_daily_quota_per_school", 3)
+    return settings
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_script(fake_redis, limits):
+    limiter = RateLimiter()
+
+    first, second, third = [await limiter.take("syllabus", "u1") for _ in range(3)]
+
+    assert (first.allowed, first.remaining) == (True, 1)
+    assert (second.allowed, second.remaining) == (True, 0)
+    assert not third.allowed
+    assert third.headers()["Retry-After"] == "1"
+    assert (await limiter.take("syllabus", "u2")).allowed  # buckets are per user
+    assert 0 < fake_redis.pttl("ratelimit:syllabus:u1") <= 1000 + 200  # expires once full again
+    assert limiter.local.buckets == {}  # Redis answered; no fallback state
+
+    await asyncio.sleep(0.15)
+    assert (await limiter.take("syllabus", "u1")).allowed
+
+
+@pytest.mark.asyncio
+async def test_llm_quota_script_checks_user_and_school(fake_redis, limits):
+    limiter = RateLimiter()
+    alice, bob = LLMOwner("alice", "uni.edu"), LLMOwner("bob", "uni.edu")
+
+    assert [(await limiter.charge_llm_call(alice)).allowed for _ in range(3)] == [True, True, False]
+    usage = await limiter.charge_llm_call(bob)
+    assert (usage.allowed, usage.user_used, usage.school_used) == (True, 1, 3)
+    denied = await limiter.charge_llm_call(bob)  # bob has quota left, the school does not
+    assert (denied.allowed, denied.user_used, denied.school_used) == (False, 1, 3)
+
+    user_key, school_key = rate_limit._quota_keys(bob)
+    assert fake_redis.mget(user_key, school_key) == ["1", "3"]  # denied calls are not counted
+    assert fake_redis.ttl(school_key) > 0
+    assert (await limiter.llm_usage(alice)).user_used == 2
+
+
+@pytest.mark.asyncio
+async def test_replays_and_open_circuit_are_not_charged(fake_redis, limits, monkeypatch, tmp_path):
+    owner = rate_limit.bind_llm_owner(SimpleNamespace(id="alice", email="alice@uni.edu"))
+    messages = [{"role": "user", "content": "hi"}]
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=60)
+    breaker.failures, breaker.opened_at = 1, time.monotonic()
+    monkeypatch.setattr(openai_service, "breaker", breaker)
+
+    with pytest.raises(CircuitOpenError):
+        await openai_service.chat_completion(messages)
+    with pytest.raises(CircuitOpenError):
+        [delta async for delta in openai_service.stream_chat_completion(messages)]
+
+    monkeypatch.setattr(limits, "llm_replay_mode", "replay")
+    monkeypatch.setattr(limits, "llm_fixtures_dir", str(tmp_path))
+    llm_replay.save(llm_replay.fixture_key(limits.openai_model, messages, {}), limits.openai_model, "[]")
+    assert (await openai_service.chat_completion(messages)).choices[0].message.content == "[]"
+    assert [delta async for delta in openai_service.stream_chat_completion(messages)] == ["[]"]
+
+    assert fake_redis.mget(*rate_limit._quota_keys(owner)) == [None, None]
+
+
+def test_local_limiter_drops_refilled_buckets():
+    local = LocalLimiter()
+    limit = Limit(per_minute=60, burst=5)  # full again 5 s after the last take
+    start = local._pruned_at
+
+    for user in range(100):
+        local.take(f"ratelimit:syllabus:{user}", limit, now=start + 1)
+    local.take("ratelimit:syllabus:busy", limit, now=start + rate_limit.LOCAL_PRUNE_SECONDS)
+    local.take("ratelimit:syllabus:busy", limit, now=start + rate_limit.LOCAL_PRUNE_SECONDS + 1)
+
+    assert list(local.buckets) == ["ratelimit:syllabus:busy"]
+    assert local.take("ratelimit:syllabus:0", limit, now=start + 70) == (True, 4)  # starts full again
@@ -0,0 +1,60 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.services import reminder_service
+from app.services.reminder_service import (
+    ATTEMPTS_KEY, DEAD_KEY, REMINDER_KEY, LeaderElection, ReminderScheduler, ReminderWorker,
+)
+
+
+def failing_delivery(reminders):
+    raise ConnectionError("webhook down")
+
+
+@pytest.mark.asyncio
+async def test_hooks_do_nothing_when_disabled(fake_redis, monkeypatch):
+    monkeypatch.setattr(reminder_service.settings, "reminders_enabled", False)
+    start = datetime.now(timezone.utc) + timedelta(days=3)
+    await reminder_service.schedule_reminders("event", [(uuid.uuid4(), start)])
+    assert fake_redis.zcard(REMINDER_KEY) == 0
+
+
+@pytest.mark.asyncio
+async def test_hooks_index_and_cancel_when_enabled(fake_redis, monkeypatch):
+    monkeypatch.setattr(reminder_service.settings, "reminders_enabled", True)
+    event_id = uuid.uuid4()
+    start = datetime.now(timezone.utc) + timedelta(days=3)
+    await reminder_service.schedule_reminders("event", [(event_id, start)])
+    assert fake_redis.zcard(REMINDER_KEY) == len(reminder_service.settings.reminder_offsets_minutes)
+    await reminder_service.cancel_reminders("event", [event_id])
+    assert fake_redis.zcard(REMINDER_KEY) == 0
+
+
+def test_failing_delivery_is_dead_lettered_after_max_attempts(fake_redis):
+    scheduler = ReminderScheduler(fake_redis, offsets_minutes=[60])
+    scheduler.schedule("event", "e1", datetime.fromtimestamp(2000 + 3600, timezone.utc), now=1000)
+    worker = ReminderWorker(scheduler, LeaderElection(fake_redis), delivery=failing_delivery, max_attempts=3)
+
+    for _ in range(2):
+        assert worker.run_once(now=3000) == 0
+        assert fake_redis.zcard(REMINDER_KEY) == 1  # requeued for the next tick
+    worker.run_once(now=3000)
+
+    assert fake_redis.zcard(REMINDER_KEY) == 0
+    assert fake_redis.zrange(DEAD_KEY, 0, -1) == ["event:e1:60"]
+    assert not fake_redis.exists(ATTEMPTS_KEY)
+
+
+def test_successful_retry_clears_attempts(fake_redis):
+    scheduler = ReminderScheduler(fake_redis, offsets_minutes=[60])
+    scheduler.schedule("event", "e1", datetime.fromtimestamp(2000 + 3600, timezone.utc), now=1000)
+    delivered = []
+    worker = ReminderWorker(scheduler, LeaderElection(fake_redis), delivery=failing_delivery, max_attempts=3)
+    worker.run_once(now=3000)
+
+    worker.delivery = delivered.extend
+    assert worker.run_once(now=3000) == 1
+    assert [r.member for r in delivered] == ["event:e1:60"]
+    assert not fake_redis.exists(ATTEMPTS_KEY)
@@ -0,0 +1,81 @@
+import time
+import uuid
+
+from sqlalchemy import event
+
+from app import database
+from app.models.course import Course
+from helpers import auth_headers, make_course, make_user
+
+
+def replicate(replica_db, *rows):
+    """Copy rows from the primary to the stand-in replica."""
+    for row in rows:
+        replica_db.add(type(row)(**{column.key: getattr(row, column.key) for column in row.__table__.columns}))
+    replica_db.commit()
+
+
+class PrimaryQueries:
+    """Counts statements sent to the primary while active."""
+
+    def __init__(self):
+        self.count = 0
+
+    def _count(self, *args):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(database.engine, "before_cursor_execute", self._count)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(database.engine, "before_cursor_execute", self._count)
+
+
+def test_reads_and_auth_go_to_the_replica(client, db, replica_db):
+    professor = make_user(db)
+    course = make_course(db, professor, title="Primary")
+    replicate(replica_db, professor)
+    replica_db.add(Course(id=course.id, code=course.code, title="Replica", created_by=professor.id))
+    replica_db.commit()
+
+    with PrimaryQueries() as primary:
+        response = client.get("/api/courses/", headers=auth_headers(professor))
+
+    assert response.status_code == 200, response.text
+    assert [c["title"] for c in response.json()] == ["Replica"]
+    assert primary.count == 0
+
+
+def test_writer_reads_own_write_from_the_primary(client, db, replica_db, fake_redis):
+    professor, other = make_user(db), make_user(db)
+    replicate(replica_db, professor, other)
+
+    created = client.post("/api/courses/", headers=auth_headers(professor), json={"title": "New"})
+    assert created.status_code == 200, created.text
+
+    # The writer is sticky to the primary, here and (via Redis) on other workers
+    assert [c["title"] for c in client.get("/api/courses/", headers=auth_headers(professor)).json()] == ["New"]
+    for _ in range(50):
+        if fake_redis.exists(database._sticky_key(professor.id)):
+            break
+        time.sleep(0.01)
+    assert fake_redis.exists(database._sticky_key(professor.id))
+    assert not database.recently_wrote(other.id)
+
+
+def test_new_user_missing_on_replica_falls_back_to_primary(client, db, replica_db):
+    user = make_user(db)
+    response = client.get("/api/auth/me", headers=auth_headers(user))
+    assert response.status_code == 200, response.text
+    assert response.json()["id"] == str(user.id)
+
+
+def test_recent_writes_are_pruned(monkeypatch):
+    monkeypatch.setattr(database, "_recent_writes", database.OrderedDict())
+    monkeypatch.setattr(database.settings, "replica_sticky_seconds", 0.005)
+    for _ in range(50):
+        database.mark_recent_write(uuid.uuid4())
+    time.sleep(0.01)
+    database.mark_recent_write(uuid.uuid4())
+    assert len(database._recent_writes) == 1
@@ -0,0 +1,57 @@
+from datetime import datetime, timezone
+
+from app.models.event import Event
+from app.models.school import School
+
+from helpers import auth_headers, make_course, make_user
+
+
+def test_course_list_projection(client, db):
+    professor = make_user(db)
+    school = School(name="State U")
+    db.add(school)
+    db.commit()
+    course = make_course(db, professor, title="Calculus I", school_id=school.id)
+    headers = auth_headers(professor)
+
+    full = client.get("/api/courses/", headers=headers)
+    assert full.status_code == 200, full.text
+    assert full.json()[0]["school"] == {"id": school.id, "name": "State U"}
+
+    projected = client.get("/api/courses/", headers=headers, params={"fields": "title,school"})
+    assert projected.status_code == 200, projected.text
+    assert projected.json() == [{"id": str(course.id), "title": "Calculus I", "school": {"id": school.id, "name": "State U"}}]
+
+    compact = client.get("/api/courses/", headers=headers, params={"fields": "semester,title", "format": "compact"})
+    assert compact.json() == {"fields": ["title", "id", "semester"], "rows": [["Calculus I", str(course.id), "2025FA"]]}
+
+
+def test_event_list_projection(client, db):
+    professor = make_user(db)
+    course = make_course(db, professor)
+    starts = [datetime(2025, 10, day, 9, tzinfo=timezone.utc) for day in (1, 8)]
+    db.add_all(Event(course_id=course.id, title=f"Quiz {i}", dt_start=start) for i, start in enumerate(starts, 1))
+    db.commit()
+    headers = auth_headers(professor)
+    url = f"/api/events/course/{course.id}"
+
+    projected = client.get(url, headers=headers, params={"fields": "title, dt_start"})
+    assert projected.status_code == 200, projected.text
+    assert sorted(projected.json()[0]) == ["dt_start", "id", "title"]
+    assert sorted(event["title"] for event in projected.json()) == ["Quiz 1", "Quiz 2"]
+
+    compact = client.get(url, headers=headers, params={"fields": "title", "format": "compact"}).json()
+    assert compact["fields"] == ["title", "id"]
+    assert sorted(row[0] for row in compact["rows"]) == ["Quiz 1", "Quiz 2"]
+    assert all(len(row) == 2 for row in compact["rows"])
+
+
+def test_unknown_field_is_a_400(client, db):
+    professor = make_user(db)
+    course = make_course(db, professor)
+    headers = auth_headers(professor)
+
+    for url in ("/api/courses/", f"/api/events/course/{course.id}"):
+        response = client.get(url, headers=headers, params={"fields": "title,password"})
+        assert response.status_code == 400, url
+        assert response.json()["detail"].startswith("Unknown field(s): password.")
@@ -0,0 +1,134 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.services import openai_service
+from app.services.singleflight import RedisSingleFlight
+from helpers import auth_headers, make_pdf, make_user
+
+REPLY = json.dumps([{"title": "Midterm", "date": "2025-10-15", "category": "Exam", "location": None}])
+
+
+class CountingLLM:
+    """Stands in for chat_completion and stream_chat_completion: counts upstream calls."""
+
+    def __init__(self, delay: float = 0.2):
+        self.calls = 0
+        self.delay = delay
+
+    async def __call__(self, messages, model=None, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=REPLY))])
+
+    async def stream(self, messages, model=None, **kwargs):
+        self.calls += 1
+        for i in range(0, len(REPLY), 8):
+            await asyncio.sleep(self.delay / 10)
+            yield REPLY[i:i + 8]
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    fake = CountingLLM()
+    monkeypatch.setattr(openai_service, "chat_completion", fake)
+    monkeypatch.setattr(openai_service, "stream_chat_completion", fake.stream)
+    return fake
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_uploads_make_one_llm_call(app, db, llm, monkeypatch):
+    from app.config import settings
+    monkeypatch.setattr(settings, "rate_limit_enabled", False)
+    monkeypatch.setattr(settings, "admission_enabled", False)
+    student = make_user(db, role="student")
+    pdf = make_pdf("CS 101 2025FA", "Midterm exam 10/15")
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        responses = await asyncio.gather(*[
+            client.post(
+                "/api/courses/student-syllabus",
+                headers=auth_headers(student),
+                files={"file": ("syllabus.pdf", pdf, "application/pdf")},
+            )
+            for _ in range(50)
+        ])
+
+    assert [r.status_code for r in responses] == [200] * 50, responses[0].text
+    assert llm.calls == 1
+    assert {r.json()["extracted_events"][0]["title"] for r in responses} == {"Midterm"}
+
+
+@pytest.mark.asyncio
+async def test_streamed_and_plain_uploads_share_one_llm_call(app, db, llm, monkeypatch):
+    from app.config import settings
+    monkeypatch.setattr(settings, "rate_limit_enabled", False)
+    monkeypatch.setattr(settings, "admission_enabled", False)
+    student = make_user(db, role="student")
+    pdf = make_pdf("CS 101 2025FA", "Midterm exam 10/15")
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        responses = await asyncio.gather(*[
+            client.post(
+                "/api/courses/student-syllabus/stream" if i % 2 else "/api/courses/student-syllabus",
+                headers=auth_headers(student),
+                files={"file": ("syllabus.pdf", pdf, "application/pdf")},
+            )
+            for i in range(20)
+        ])
+
+    assert [r.status_code for r in responses] == [200] * 20
+    assert llm.calls == 1
+    for streamed in responses[1::2]:
+        assert streamed.text.count("event: event") == 1
+        assert 'event: done\ndata: {"events": 1}' in streamed.text
+
+
+@pytest.mark.asyncio
+async def test_stream_followers_get_the_result_when_the_leader_leaves(fake_redis):
+    flight = RedisSingleFlight("test", json.dumps, json.loads)
+
+    async def produce():
+        for item in range(5):
+            await asyncio.sleep(0.01)
+            yield item
+
+    leader = flight.stream("key", produce)
+    assert await leader.__anext__() == 0  # leading: items arrive as they are produced
+    follower = asyncio.ensure_future(_collect(flight.stream("key", produce)))
+    await asyncio.sleep(0)
+    await leader.aclose()
+
+    assert await follower == [0, 1, 2, 3, 4]
+
+
+async def _collect(stream):
+    return [item async for item in stream]
+
+
+@pytest.mark.asyncio
+async def test_workers_share_one_call_through_redis(fake_redis, monkeypatch):
+    from fakeredis import aioredis as fake_aioredis
+    from app.config import settings
+    monkeypatch.setattr(settings, "singleflight_poll_seconds", 0.01)
+    server = fake_redis.connection_pool.connection_kwargs["server"]
+    # Two "workers": separate in-process layers and clients on one Redis
+    workers = [
+        RedisSingleFlight("test", json.dumps, json.loads, client=fake_aioredis.FakeRedis(server=server, decode_responses=True))
+        for _ in range(2)
+    ]
+    llm = CountingLLM(delay=0.1)
+
+    async def parse():
+        response = await llm([])
+        return json.loads(response.choices[0].message.content)
+
+    results = await asyncio.gather(*[workers[i % 2].do("same-bytes", parse) for i in range(50)])
+
+    assert llm.calls == 1
+    assert all(result == results[0] for result in results)
@@ -0,0 +1,66 @@
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app.routers import stream
+from helpers import auth_headers, make_user
+
+
+def test_stream_token_is_short_lived_and_not_a_jwt(client, db, fake_redis):
+    user = make_user(db)
+    response = client.post("/api/stream/token", headers=auth_headers(user))
+    assert response.status_code == 200, response.text
+    token = response.json()["token"]
+
+    key = stream.STREAM_TOKEN_PREFIX + token
+    assert fake_redis.get(key) == str(user.id)
+    assert 0 < fake_redis.ttl(key) <= stream.settings.sse_token_ttl_seconds
+    # The token is not a credential anywhere else
+    assert client.get("/api/courses/", headers={"Authorization": f"Bearer {token}"}).status_code == 401
+
+
+def test_stream_rejects_jwt_in_query_string(client, db):
+    user = make_user(db)
+    jwt = auth_headers(user)["Authorization"].split()[1]
+    assert client.get(f"/api/stream/events?access_token={jwt}").status_code == 401
+    assert client.get("/api/stream/events?token=bogus").status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_stream_token_redeems_once(fake_redis):
+    user_id = uuid.uuid4()
+    fake_redis.set(stream.STREAM_TOKEN_PREFIX + "t1", str(user_id), ex=60)
+
+    assert await stream._redeem_stream_token("t1") == user_id
+    with pytest.raises(HTTPException) as exc:
+        await stream._redeem_stream_token("t1")
+    assert exc.value.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_publish_change_uses_async_client(fake_redis):
+    from app.services import notification_service
+    pubsub = fake_redis.pubsub()
+    pubsub.subscribe(notification_service.CHANNEL)
+    pubsub.get_message(timeout=1)  # subscribe confirmation
+
+    await notification_service.publish_change("c1", "course", "created", user_id="u1")
+    message = pubsub.get_message(timeout=1)
+    assert message["data"] == '{"course_id": "c1", "kind": "course", "action": "created", "user_id": "u1"}'
+
+
+@pytest.mark.asyncio
+async def test_dispatch_routes_by_user_without_forwarding_the_id():
+    from app.services.notification_service import ChangeBroker
+    broker = ChangeBroker(max_connections=10, queue_size=10)
+    member = broker.register("u1", ["c1"])
+    creator = broker.register("u2", [])
+    broker._listener.cancel()  # dispatched by hand below
+
+    broker.dispatch({"course_id": "c1", "kind": "course", "action": "created", "user_id": "u2"})
+
+    expected = {"course_id": "c1", "kind": "course", "action": "created"}
+    assert member.queue.get_nowait() == expected
+    assert creator.queue.get_nowait() == expected
+    assert creator.course_ids == {"c1"}  # follows the new course from now on
@@ -0,0 +1,95 @@
+import asyncio
+import io
+import uuid
+
+import pytest
+
+from app.services import openai_service, syllabus_batch
+
+REPLY = '[{"title": "Midterm", "date": "2025-10-15", "category": "Exam", "location": null}]'
+SCHEDULE = b"Midterm exam on 10/15 in class"
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    calls = []
+
+    async def complete_syllabus(text):
+        calls.append(text)
+        return REPLY
+
+    monkeypatch.setattr(openai_service, "complete_syllabus", complete_syllabus)
+    return calls
+
+
+def plain(name: str, data: bytes):
+    return name, io.BytesIO(data)
+
+
+async def drain(documents, courses_by_crn, **kwargs):
+    return [item async for item in syllabus_batch.run_batch(documents, courses_by_crn, **kwargs)]
+
+
+@pytest.mark.asyncio
+async def test_llm_calls_count_only_upstream_calls(llm):
+    documents = syllabus_batch.list_documents([
+        plain("10001.txt", SCHEDULE),
+        plain("10002.txt", SCHEDULE),  # same bytes: shares the first extraction
+        plain("10003.txt", b"No dates in here at all"),  # skipped by the date pre-check
+    ])
+    courses = {crn: uuid.uuid4() for crn in ("10001", "10002", "10003")}
+
+    items = await drain(documents, courses)
+
+    summary = items[-1][1]
+    assert (summary["stored"], summary["duplicates"], summary["events"]) == (3, 1, 2)
+    assert summary["llm_calls"] == len(llm) == 1
+
+
+@pytest.mark.asyncio
+async def test_plain_files_are_capped_while_reading(llm, monkeypatch):
+    monkeypatch.setattr(syllabus_batch.settings, "max_file_size_mb", 1)
+    documents = syllabus_batch.list_documents([
+        plain("10001.txt", SCHEDULE + b" " * (1024 * 1024)),
+        plain("10002.txt", SCHEDULE),
+    ])
+
+    items = await drain(documents, {"10001": uuid.uuid4(), "10002": uuid.uuid4()})
+
+    reports = {data["file"]: data for event, data in items if event == "file"}
+    assert reports["10001.txt"] == {
+        "file": "10001.txt", "crn": "10001", "status": "error", "detail": "File larger than 1 MB",
+    }
+    assert reports["10002.txt"]["status"] == "stored"
+    assert len(llm) == 1
+
+
+@pytest.mark.asyncio
+async def test_disconnect_cancels_pending_stores(llm):
+    started, cancelled = [], []
+
+    async def slow_store(course_id, document, digest, text, extraction):
+        started.append(document.name)
+        try:
+            await asyncio.sleep(3600)
+        except asyncio.CancelledError:
+            cancelled.append(document.name)
+            raise
+
+    documents = syllabus_batch.list_documents([
+        plain("10001.txt", b"Quiz 9/1"), plain("10002.txt", b"Quiz 9/2"), plain("10003.txt", b"HW 1/1"),
+    ])
+    courses = {crn: uuid.uuid4() for crn in ("10001", "10002", "10003")}
+    # Two documents in flight at concurrency 1, so the third is still waiting to be unpacked
+    stream = syllabus_batch.run_batch(documents, courses, store=slow_store, concurrency=1)
+
+    pending = asyncio.ensure_future(stream.__anext__())  # nothing finishes: every store hangs
+    while len(started) < 2:
+        await asyncio.sleep(0.01)
+    pending.cancel()  # what the server does when the client goes away
+    with pytest.raises(asyncio.CancelledError):
+        await pending
+    await stream.aclose()
+    await asyncio.sleep(0)
+
+    assert sorted(cancelled) == sorted(started)
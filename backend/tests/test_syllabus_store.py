@@ -0,0 +1,83 @@
+import os
+
+import pytest
+
+from app.services import openai_service, syllabus_pipeline
+
+from helpers import auth_headers, make_course, make_pdf, make_user
+
+REPLY = '[{"title": "Midterm", "date": "2025-10-15", "category": "Exam", "location": null}]'
+
+
+@pytest.fixture
+def stages(monkeypatch):
+    """Count PDF extractions and LLM calls, answering the latter with REPLY."""
+    calls = {"pdf_extract": 0, "llm_call": []}
+    extract_pdf_text = syllabus_pipeline.extract_pdf_text
+
+    def counting_extract(contents):
+        calls["pdf_extract"] += 1
+        return extract_pdf_text(contents)
+
+    async def complete_syllabus(text):
+        calls["llm_call"].append(text)
+        return REPLY
+
+    monkeypatch.setattr(syllabus_pipeline, "extract_pdf_text", counting_extract)
+    monkeypatch.setattr(openai_service, "complete_syllabus", complete_syllabus)
+    return calls
+
+
+def upload(client, course, headers, pdf):
+    response = client.post(f"/api/courses/{course.id}/syllabus", headers=headers,
+                           files={"file": ("syllabus.pdf", pdf, "application/pdf")})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_reupload_reuses_the_stored_text_and_reply(client, db, stages, monkeypatch):
+    professor = make_user(db)
+    course = make_course(db, professor)
+    headers = auth_headers(professor)
+    pdf = make_pdf("CS 101 2025FA", "Midterm exam 10/15")
+
+    first = upload(client, course, headers, pdf)
+    assert first["stages_skipped"] == []
+    assert (stages["pdf_extract"], len(stages["llm_call"])) == (1, 1)
+
+    again = upload(client, course, headers, pdf)
+    assert again["syllabus_id"] == first["syllabus_id"]
+    assert again["stages_skipped"] == ["pdf_extract", "llm_call"]
+    assert again["extracted_events"] == first["extracted_events"]
+    assert (stages["pdf_extract"], len(stages["llm_call"])) == (1, 1)
+
+    # A new prompt version invalidates the stored reply, not the stored text
+    monkeypatch.setattr(openai_service.settings, "openai_model", "gpt-next")
+    bumped = upload(client, course, headers, pdf)
+    assert bumped["stages_skipped"] == ["pdf_extract"]
+    assert (stages["pdf_extract"], len(stages["llm_call"])) == (1, 2)
+    assert stages["llm_call"][1] == stages["llm_call"][0]
+
+
+def test_reextract_needs_no_original_file(client, db, stages, store):
+    professor = make_user(db)
+    course = make_course(db, professor)
+    headers = auth_headers(professor)
+    syllabus_id = upload(client, course, headers, make_pdf("Midterm exam 10/15"))["syllabus_id"]
+    for directory, _, files in os.walk(store.root):
+        for name in files:
+            os.remove(os.path.join(directory, name))
+    url = f"/api/courses/{course.id}/syllabus/{syllabus_id}/reextract"
+
+    reused = client.post(url, headers=headers, json={})
+    assert reused.status_code == 200, reused.text
+    assert reused.json()["stages_skipped"] == ["upload_read", "pdf_extract", "llm_call"]
+
+    forced = client.post(url, headers=headers, json={"force": True})
+    assert forced.json()["stages_skipped"] == ["upload_read", "pdf_extract"]
+    corrected = client.post(url, headers=headers, json={"text": "Final exam 12/12"})
+    assert corrected.json()["stages_skipped"] == ["upload_read", "pdf_extract"]
+
+    assert stages["pdf_extract"] == 1
+    assert len(stages["llm_call"]) == 3
+    assert "Final exam 12/12" in stages["llm_call"][-1]
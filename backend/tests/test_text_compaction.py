@@ -0,0 +1,67 @@
+from app.services.text_compaction import compact_syllabus_text, estimate_tokens
+
+HEADER = "CS 101   Introduction to Computing      Fall 2025"
+POLICY = (
+    "Academic integrity: plagiarism and any other academic misconduct will be reported under the honor code. "
+    "Students needing a disability accommodation should contact the office early in the term."
+)
+GRADING = "Grading scale: letter grade cutoffs are 90, 80, 70 and 60, and the attendance policy is strict."
+SCHEDULE = (
+    "Week 3: Quiz 1 on 9/15. Homework 2 due Friday 9/19. "
+    "Midterm exam October 8 in class. Project proposal due 10/20."
+)
+FINAL = "Final exam: 2025-12-12, 9am in Hall B."
+
+
+def syllabus() -> str:
+    return "\n".join([
+        HEADER, POLICY, GRADING, "",
+        HEADER, "   ".join(SCHEDULE.split(" ")), "",
+        HEADER, FINAL, "\t",
+    ])
+
+
+def test_schedule_outranks_boilerplate_under_a_tight_budget():
+    result = compact_syllabus_text(syllabus(), budget_chars=len(SCHEDULE) + len(FINAL) + 2)
+
+    assert result.text == f"{SCHEDULE}\n{FINAL}"
+
+
+def test_boilerplate_is_dropped_even_with_room_to_spare():
+    text = syllabus()
+
+    result = compact_syllabus_text(text, budget_chars=len(text) - 1)
+
+    assert "integrity" not in result.text.lower()
+    assert "grading scale" not in result.text.lower()
+    assert result.text == "\n".join(["CS 101 Introduction to Computing Fall 2025", SCHEDULE, FINAL])
+    assert (result.segments_kept, result.segments_dropped) == (3, 2)
+
+
+def test_repeated_headers_and_whitespace_are_collapsed():
+    text = syllabus()
+
+    result = compact_syllabus_text(text, budget_chars=len(text) - 1)
+
+    assert result.text.count("CS 101 Introduction to Computing Fall 2025") == 1
+    assert "  " not in result.text
+    assert "\t" not in result.text
+
+
+def test_tokens_saved_is_input_minus_output():
+    text = syllabus()
+
+    result = compact_syllabus_text(text, budget_chars=200)
+
+    assert result.original_tokens == estimate_tokens(text)
+    assert result.compacted_tokens == estimate_tokens(result.text)
+    assert result.tokens_saved == result.original_tokens - result.compacted_tokens > 0
+
+
+def test_text_within_budget_passes_through():
+    text = syllabus()
+
+    result = compact_syllabus_text(text, budget_chars=len(text))
+
+    assert result.text == text
+    assert result.tokens_saved == 0
@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select
+
+from app.models.workload import course_event_weekly_counts as weekly
+
+from helpers import auth_headers, make_course, make_user
+
+
+def course_event(title: str, start: datetime, category: str = "Exam") -> dict:
+    return {
+        "title": title,
+        "category": category,
+        "start_ts": start.isoformat(),
+        "end_ts": (start + timedelta(hours=1)).isoformat(),
+    }
+
+
+def weeks(client, course, headers):
+    response = client.get(f"/api/analytics/courses/{course.id}/workload", headers=headers)
+    assert response.status_code == 200, response.text
+    return [(week["week_start"], week["category"], week["event_count"]) for week in response.json()["weeks"]]
+
+
+def test_counts_follow_every_write(client, db):
+    professor = make_user(db)
+    course = make_course(db, professor)
+    headers = auth_headers(professor)
+    monday = datetime(2025, 9, 29, 9, tzinfo=timezone.utc)
+
+    published = client.post(f"/api/courses/{course.id}/events/publish", headers=headers, json=[
+        course_event("Midterm", monday),
+        course_event("Quiz", monday + timedelta(days=2), category="exam"),
+        course_event("HW 1", monday + timedelta(days=7), category="HW"),
+    ])
+    assert published.status_code == 200, published.text
+    # Read straight after the write: nothing is pending a refresh
+    assert weeks(client, course, headers) == [("2025-09-29", "exam", 2), ("2025-10-06", "hw", 1)]
+
+    created = client.post("/api/events/", headers=headers, json={
+        "course_id": str(course.id), "title": "Lab", "dt_start": monday.isoformat(), "category": "project",
+    })
+    assert created.status_code == 200, created.text
+    # Moves to another week (and, in January, another partition)
+    moved = client.put(f"/api/events/{created.json()['id']}", headers=headers,
+                       json={"dt_start": datetime(2026, 1, 20, tzinfo=timezone.utc).isoformat()})
+    assert moved.status_code == 200, moved.text
+    assert weeks(client, course, headers) == [
+        ("2025-09-29", "exam", 2), ("2025-10-06", "hw", 1), ("2026-01-19", "project", 1),
+    ]
+
+    republished = client.post(f"/api/courses/{course.id}/events/publish", headers=headers,
+                              json=[course_event("Final", monday + timedelta(days=7))])
+    assert republished.status_code == 200, republished.text
+    assert weeks(client, course, headers) == [("2025-10-06", "exam", 1), ("2026-01-19", "project", 1)]
+
+
+def test_course_delete_clears_its_counts(client, db):
+    professor = make_user(db)
+    course = make_course(db, professor)
+    headers = auth_headers(professor)
+    client.post(f"/api/courses/{course.id}/events/publish", headers=headers,
+                json=[course_event("Midterm", datetime(2025, 10, 1, tzinfo=timezone.utc))])
+
+    assert client.delete(f"/api/courses/{course.id}", headers=headers).status_code == 200
+    db.rollback()
+    assert db.execute(select(func.count()).select_from(weekly)).scalar() == 0